@@ -4,11 +4,16 @@
 import json
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from ...models.schemas import PersonalizeRequest, PersonalizedArticle
 from ...api.dependencies import get_news_processor, verify_internal_key, log_request_info
 from ...services.news_processor import NewsProcessor
+from ...services.concurrency import PRECOMPUTE, llm_priority
+from ...services.fair_queue import tenant_key
+from ...services.reading_budget import READING_MODES
+from ...core.config import settings
+from ...core.security import get_client_ip, get_verified_api_key
 from ...core.logging import get_logger
 from ...utils.helpers import make_etag, apply_cache_headers
 
@@ -58,6 +63,27 @@ async def refresh_news(
     }
 
 
+@router.post("/precompute/{article_id}")
+async def precompute_personas(
+    article_id: str,
+    reading_mode: str = "insight",
+    _: bool = Depends(verify_internal_key),
+    processor: NewsProcessor = Depends(get_news_processor),
+    request_info: Dict[str, str] = Depends(log_request_info)
+):
+    """기사의 페르소나(직업)별 개인화 변형을 LLM 1회 호출로 미리 생성"""
+    if reading_mode not in READING_MODES:
+        raise HTTPException(status_code=400, detail=f"reading_mode는 {', '.join(READING_MODES)} 중 하나")
+    
+    logger.info("페르소나 사전 생성 요청", article_id=article_id, reading_mode=reading_mode, **request_info)
+    try:
+        with llm_priority(PRECOMPUTE):
+            generated = await processor.generate_persona_variants(article_id, reading_mode)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"article_id": article_id, "reading_mode": reading_mode, "generated": generated}
+
+
 @router.post("/test")
 async def test_endpoint():
     """테스트용 단순 엔드포인트"""
@@ -78,23 +104,23 @@ async def personalize_article(
                **request_info)
     
     try:
-        logger.info("개인화 시작: processor.generate_personalized 호출")
-        personalized = await processor.generate_personalized(
+        progressive = personalize_request.progressive
+        if progressive is None:
+            progressive = settings.personalize_progressive
+        
+        # 점진 모드: brief를 먼저 응답하고 insight는 GET /personalize/{article_id}로 조회
+        generate = processor.generate_progressive if progressive else processor.generate_personalized
+        logger.info("개인화 시작: processor.generate_personalized 호출", progressive=progressive)
+        personalized = await generate(
             personalize_request.article_id, 
-            personalize_request.user_id
+            personalize_request.user_id,
+            tenant=tenant_key(get_verified_api_key(request), personalize_request.user_id, get_client_ip(request)),
+            sla_seconds=settings.personalize_sla_seconds
         )
         logger.info("개인화 성공: 응답 데이터 생성 완료")
         
         # 성공 시 정상 응답
-        return {
-            "ok": True,
-            "provider": personalized.get("provider", "unknown"),
-            "personalized_article": personalized.get("personalized_article") or personalized.get("content", ""),
-            "title": personalized.get("title", ""),
-            "key_points": personalized.get("key_points", []),
-            "reading_time": personalized.get("reading_time", "2분"),
-            "is_fallback": False
-        }
+        return _personalize_response(personalized)
         
     except Exception as e:
         logger.error("개인화 처리 실패", 
@@ -104,15 +130,113 @@ async def personalize_article(
         
         # 도훈님 방어 패턴: 500 대신 200 + 스텁 응답
         print(f"[personalize] failed: {type(e).__name__} {e}")
-        return {
-            "ok": False,
-            "provider": "stub",
-            "personalized_article": f"개인화 처리 중 오류가 발생했습니다: {str(e)[:200]}",
-            "title": "뉴스 기사",
-            "key_points": ["처리 중 오류 발생"],
-            "reading_time": "2분",
-            "is_fallback": True
-        }
+        return _personalize_error_response(e)
+
+
+@router.post("/personalize/stream")
+async def personalize_article_stream(
+    personalize_request: PersonalizeRequest,
+    request: Request,
+    processor: NewsProcessor = Depends(get_news_processor),
+    request_info: Dict[str, str] = Depends(log_request_info)
+):
+    """기사 개인화 스트리밍 (Server-Sent Events)
+    
+    - event: token → {"text": "..."} (생성 중인 본문 조각)
+    - event: done  → /personalize와 동일한 응답 본문
+    - event: error → /personalize 실패 시와 동일한 스텁 응답
+    """
+    
+    logger.info("개인화 스트리밍 요청", 
+               article_id=personalize_request.article_id, 
+               user_id=personalize_request.user_id[:10],
+               **request_info)
+    
+    async def event_stream():
+        try:
+            async for event in processor.stream_personalized(
+                personalize_request.article_id,
+                personalize_request.user_id,
+                tenant=tenant_key(get_verified_api_key(request), personalize_request.user_id,
+                                  get_client_ip(request))
+            ):
+                if event["type"] == "done":
+                    yield _sse("done", _personalize_response(event["result"]))
+                else:
+                    yield _sse("token", {"text": event["text"]})
+        except Exception as e:
+            logger.error("개인화 스트리밍 실패", 
+                        error=str(e),
+                        article_id=personalize_request.article_id,
+                        user_id=personalize_request.user_id[:10])
+            yield _sse("error", _personalize_error_response(e))
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """SSE 이벤트 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/personalize/{article_id}")
+async def get_personalized_result(
+    article_id: str,
+    user_id: str,
+    request: Request,
+    processor: NewsProcessor = Depends(get_news_processor)
+):
+    """캐시된 개인화 결과 조회 (점진 모드의 insight 후속 조회, LLM 호출 없음)
+    
+    - 200: 결과 있음 (ETag 포함, If-None-Match 일치 시 304)
+    - 202: 백그라운드 생성 중
+    - 404: 결과 없음
+    """
+    personalized, pending = await processor.get_personalized_result(article_id, user_id)
+    if personalized is None:
+        return JSONResponse(status_code=202 if pending else 404,
+                            content={"ok": False, "pending": pending})
+    
+    body = _personalize_response(personalized)
+    etag = f'W/"{make_etag(json.dumps(body, sort_keys=True, ensure_ascii=False).encode())}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=body, headers=headers)
+
+
+def _personalize_response(personalized: Dict[str, Any]) -> Dict[str, Any]:
+    """개인화 성공 응답 본문"""
+    return {
+        "ok": True,
+        "provider": personalized.get("provider", "unknown"),
+        "personalized_article": personalized.get("personalized_article") or personalized.get("content", ""),
+        "title": personalized.get("title", ""),
+        "key_points": personalized.get("key_points", []),
+        "reading_time": personalized.get("reading_time", "2분"),
+        "cached": personalized.get("cached", False),
+        "stale": personalized.get("stale", False),
+        "is_fallback": personalized.get("is_fallback", False),
+        "pending": personalized.get("pending", False),
+        "reading_mode": personalized.get("reading_mode", "insight")
+    }
+
+
+def _personalize_error_response(e: Exception) -> Dict[str, Any]:
+    """개인화 실패 시 스텁 응답 본문 (500 대신 200)"""
+    return {
+        "ok": False,
+        "provider": "stub",
+        "personalized_article": f"개인화 처리 중 오류가 발생했습니다: {str(e)[:200]}",
+        "title": "뉴스 기사",
+        "key_points": ["처리 중 오류 발생"],
+        "reading_time": "2분",
+        "is_fallback": True
+    }
 
 
 @router.get("/articles")
@@ -9,8 +9,12 @@ from ...models.schemas import HealthCheck
 from ...api.dependencies import get_news_processor, get_database, log_request_info
 from ...services.news_processor import NewsProcessor
 from ...models.database import Database
+from ...services import llm_clients, hedging, concurrency, rate_limits, reading_budget
+from ...services.circuit_breaker import breakers
+from ...services.fair_queue import fair_queue
 from ...core.config import settings
 from ...core.logging import get_logger
+from ...utils.helpers import retry_budget
 
 logger = get_logger("api.system")
 
@@ -99,9 +103,30 @@ async def system_info(
     }
 
 
+@router.get("/llm")
+async def llm_stats(
+    request_info: Dict[str, str] = Depends(log_request_info)
+):
+    """LLM 호출 계층 상태 (커넥션 풀 재사용 등)"""
+    
+    logger.debug("LLM 상태 요청", **request_info)
+    
+    return {
+        "connections": llm_clients.stats(),
+        "hedging": hedging.stats(),
+        "breakers": breakers.stats(),
+        "concurrency": concurrency.stats(),
+        "rate_limits": rate_limits.stats(),
+        "fair_queue": fair_queue.stats(),
+        "retry_budget": retry_budget.stats(),
+        "reading_modes": reading_budget.stats()
+    }
+
+
 @router.get("/stats")
 async def system_stats(
     db: Database = Depends(get_database),
+    processor: NewsProcessor = Depends(get_news_processor),
     request_info: Dict[str, str] = Depends(log_request_info)
 ):
     """시스템 통계"""
@@ -148,8 +173,17 @@ async def system_stats(
             "users": {
                 "total": total_users
             },
+            "facts_cache": processor.facts_cache_stats,
             "personalized_content": {
-                "total": personalized_content
+                "total": personalized_content,
+                "cache": processor.pc_cache.stats(),
+                "coalescing": processor.personalize_flight.stats(),
+                "revalidation": processor.revalidate_stats,
+                "sla": processor.sla_stats,
+                "progressive": processor.progressive_stats,
+                "personas": processor.persona_stats,
+                "warmup": processor.warmup_stats,
+                "batch_api": processor.batch_pipeline.stats()
             },
             "activities": {
                 "recent_24h": recent_activities
@@ -2,7 +2,8 @@
 애플리케이션 설정 관리
 """
 import os
-from typing import Optional, List
+from typing import Dict, Optional, List
+from pydantic import PositiveFloat
 from pydantic_settings import BaseSettings
 
 
@@ -20,7 +21,26 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4o-mini"
     openai_timeout: int = 60
     openai_retries: int = 2
-    openai_concurrency_limit: int = 25
+    openai_concurrency_limit: int = 25  # 적응형 동시성 제한기 초기 한도
+    
+    # 적응형(AIMD) 동시성 제한 (제공자별)
+    llm_concurrency_min: int = 2
+    llm_concurrency_max: int = 100
+    llm_concurrency_backoff: float = 0.5  # 429/타임아웃 시 곱셈 감소 비율
+    llm_concurrency_latency_threshold: float = 15.0  # 이 지연(초) 이하 성공만 증가에 반영
+    llm_concurrency_decrease_interval: float = 1.0  # 연속 감소 최소 간격(초)
+    llm_precompute_max_share: float = 0.7  # 사전 생성 작업이 쓸 수 있는 한도 비율
+    llm_backfill_max_share: float = 0.5  # 수집 배치 팩트 추출이 쓸 수 있는 한도 비율 (나머지는 사용자 요청용)
+    
+    # 테넌트별 공정 큐잉 (개인화 생성 슬롯, DRR)
+    fair_queue_concurrency: int = 20  # 동시 개인화 생성 수
+    fair_queue_quantum: PositiveFloat = 1.0  # 라운드당 적립량 (요청 1건 = 1, 0 이하면 기동 시 검증 오류)
+    fair_queue_weights: Dict[str, PositiveFloat] = {}  # 테넌트별 가중치 (0 이하면 기동 시 검증 오류) (예: {"key:ab12cd34": 3, "ip:10.0.0.5": 2})
+    
+    # LLM 커넥션 풀 (Groq/OpenAI 공유 클라이언트)
+    llm_pool_max_connections: int = 100
+    llm_pool_max_keepalive: int = 20
+    llm_pool_keepalive_expiry: float = 30.0
     
     # Groq API 설정
     groq_api_key: Optional[str] = None
@@ -29,6 +49,31 @@ class Settings(BaseSettings):
     # AI 제공자 선택
     ai_provider: str = "openai"  # openai 또는 groq
     
+    # 헤지 요청 (Groq 지연 시 OpenAI 동시 호출)
+    llm_hedge_enabled: bool = False
+    llm_hedge_percentile: float = 0.95  # 이 백분위수 지연을 넘기면 헤지
+    llm_hedge_default_delay: float = 4.0  # 표본 부족 시 헤지 시점(초)
+    llm_hedge_min_delay: float = 1.0
+    llm_hedge_max_ratio: float = 0.1  # 전체 요청 중 헤지 허용 비율
+    
+    # 서킷 브레이커 (제공자/모델별)
+    breaker_failure_threshold: int = 3  # 연속 실패 시 open
+    breaker_cooldown_seconds: float = 30.0  # open → half_open 대기
+    breaker_ewma_alpha: float = 0.2  # 지연/성공률 EWMA 가중치
+    
+    # 요청 데드라인 (재시도/LLM 호출 타임아웃이 이 예산을 공유)
+    request_deadline_seconds: float = 30.0
+    deadline_low_seconds: float = 8.0  # 남은 시간이 이보다 적으면 더 짧은 출력으로 축소
+    deadline_min_attempt_seconds: float = 2.0  # 재시도 1회에 필요한 최소 남은 시간
+    personalize_progressive: bool = False  # /personalize 기본 점진 모드 (brief 즉시 + insight 백그라운드)
+    personalize_sla_seconds: float = 3.0  # /personalize 응답 SLA (초과 시 템플릿 응답 + 백그라운드 완료, 0이면 비활성)
+    personalize_background_deadline_seconds: float = 60.0  # SLA 초과 후 백그라운드로 이어지는 생성의 데드라인
+    
+    # 전역 재시도 예산 (재시도 폭주 방지)
+    retry_budget_ratio: float = 0.2  # 첫 시도 대비 허용 재시도 비율
+    retry_budget_min_per_second: float = 0.5  # 저트래픽에서도 허용되는 초당 재시도
+    retry_budget_max_balance: float = 20.0  # 최대 적립량 (버스트 재시도 상한)
+    
     # 보안 설정
     internal_api_key: Optional[str] = None
     jwt_secret: Optional[str] = None  # JWT 시크릿 키 추가
@@ -45,19 +90,34 @@ class Settings(BaseSettings):
     
     # 성능 설정
     articles_per_batch: int = 5
+    extract_concurrency: int = 5  # 배치 내 동시 팩트 추출 수
+    extract_batch_size: int = 1  # LLM 호출 1회당 팩트 추출 기사 수 (1이면 기사별 호출)
+    warmup_top_personas: int = 3  # 수집 후 사전 개인화할 상위 세그먼트(직업 × 읽기 모드) 수 (사용자 수 기준, 0이면 비활성)
+    warmup_concurrency: int = 2  # 워밍업 동시 기사 수
+    llm_batch_enabled: bool = False  # 페르소나 사전 생성을 제공자 Batch API로 처리 (신규 기사 팩트 추출은 항상 실시간)
+    llm_batch_provider: str = "openai"  # Batch API 제공자 (openai, groq)
+    llm_batch_dir: str = "batch_jobs"  # 제출한 JSONL 작업 파일 보관 경로
+    llm_batch_poll_interval: int = 300  # 배치 상태 폴링 주기(초)
     collect_timeout: int = 30
     summary_max: int = 10000
     min_content_len: int = 80  # 품질 향상을 위해 80자로 증가
-    rate_limit_per_minute: int = 100
+    rate_limit_per_minute: int = 100  # 제공자/모델별 분당 요청 한도 초기값 (응답 헤더로 동기화)
+    llm_tokens_per_minute: int = 200000  # 제공자/모델별 분당 토큰 한도 초기값 (응답 헤더로 동기화)
     
     # 캐시 설정
     pc_ttl_days: int = 30
     activity_ttl_days: int = 90
     collect_lock_ttl: int = 30
+    pc_cache_max_entries: int = 2048  # 개인화 L1(인프로세스 LRU) 최대 엔트리 수
+    pc_cache_ttl_seconds: int = 3600  # 개인화 L1 TTL
+    pc_stale_while_revalidate: bool = True  # 프로필/팩트 변경 시 이전 결과 즉시 응답 + 백그라운드 재생성
     
     # Structured Outputs 설정
     use_structured_outputs: bool = False
     
+    # 개인화 설정
+    personalize_single_call: bool = True  # False면 레거시 2회 호출(스키마 호출 + run_personalize)
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,101 @@
+"""
+요청 단위 데드라인 (contextvar)
+HTTP 요청마다 남은 시간 예산을 만들고, 재시도/LLM 호출이 이 예산 안에서 타임아웃을 잘라 쓴다.
+"""
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from time import monotonic
+from typing import Optional
+
+from .config import settings
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """요청 데드라인 소진"""
+
+
+class Deadline:
+    """절대 만료 시각 (monotonic 기준) - 바깥 데드라인보다 늦을 수 없다
+
+    컨텍스트를 복사해 만든 태스크도 같은 객체를 보므로, 응답과 분리되는 작업은
+    detach()로 바깥 데드라인을 끊고 자체 만료 시각을 다시 잡을 수 있다.
+    """
+    __slots__ = ("at", "parent")
+
+    def __init__(self, at: float, parent: Optional["Deadline"] = None):
+        self.at = at
+        self.parent = parent
+
+    def expires_at(self) -> float:
+        if self.parent is None:
+            return self.at
+        return min(self.at, self.parent.expires_at())
+
+    def detach(self, seconds: float) -> None:
+        """바깥(요청) 데드라인과 분리하고 지금부터 seconds 후를 만료 시각으로"""
+        self.parent = None
+        self.at = monotonic() + seconds
+
+
+# 현재 데드라인 (None이면 무제한)
+_deadline_ctx = contextvars.ContextVar("deadline", default=None)
+
+
+def set_deadline(seconds: Optional[float]) -> contextvars.Token:
+    """현재 컨텍스트에 데드라인 설정 (기존 데드라인보다 늦출 수 없음, None은 해제)"""
+    if seconds is None:
+        return _deadline_ctx.set(None)
+    return _deadline_ctx.set(Deadline(monotonic() + seconds, _deadline_ctx.get()))
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    """데드라인 컨텍스트 복원"""
+    _deadline_ctx.reset(token)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """구간 내 데드라인 적용 (None이면 데드라인 해제 - 백그라운드 작업용), 적용된 Deadline을 yield"""
+    token = set_deadline(seconds)
+    try:
+        yield _deadline_ctx.get()
+    finally:
+        reset_deadline(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초), 데드라인이 없으면 None"""
+    deadline = _deadline_ctx.get()
+    if deadline is None:
+        return None
+    return deadline.expires_at() - monotonic()
+
+
+def expired() -> bool:
+    """데드라인 소진 여부"""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def is_short(threshold: float = None) -> bool:
+    """남은 시간이 임계치보다 적은지 (더 싼 경로 선택 기준)"""
+    left = remaining()
+    if threshold is None:
+        threshold = settings.deadline_low_seconds
+    return left is not None and left < threshold
+
+
+def clamp_timeout(timeout: float) -> float:
+    """호출 타임아웃을 남은 시간으로 제한 (이미 소진됐으면 DeadlineExceeded)"""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    return min(timeout, left)
+
+
+def can_wait(delay: float) -> bool:
+    """delay만큼 대기한 뒤에도 최소 1회 시도할 시간이 남는지"""
+    left = remaining()
+    return left is None or left - delay >= settings.deadline_min_attempt_seconds
@@ -2,6 +2,7 @@
 보안 관련 유틸리티
 """
 import hashlib
+import hmac
 import uuid
 import ipaddress
 from typing import Optional, List
@@ -34,6 +35,21 @@ def require_api_key(request: Request) -> None:
     raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+def get_verified_api_key(request: Request) -> Optional[str]:
+    """요청에 실린 API 키 (X-API-Key / X-Internal-API-Key / Bearer) 중 설정된 키와 일치하는 것만 반환"""
+    if not settings.internal_api_key:
+        return None
+    candidates = [request.headers.get("X-API-Key"), request.headers.get("X-Internal-API-Key")]
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.lower().startswith("bearer "):
+        candidates.append(auth_header.split(" ", 1)[1])
+    expected = settings.internal_api_key.encode()
+    for api_key in candidates:
+        if api_key and hmac.compare_digest(api_key.strip().encode(), expected):
+            return settings.internal_api_key
+    return None
+
+
 def _parse_trusted_proxies(items: List[str]):
     """신뢰 프록시 CIDR 파싱 (2025년 보안 강화)"""
     networks = []
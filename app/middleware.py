@@ -11,6 +11,7 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .core.config import settings
+from .core.deadline import set_deadline, reset_deadline
 from .core.security import get_client_ip, generate_request_id
 from .core.logging import get_logger, set_request_id, reset_request_id
 
@@ -188,6 +189,25 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             reset_request_id(token)
 
 
+class DeadlineMiddleware(BaseHTTPMiddleware):
+    """요청 단위 데드라인 설정 (X-Request-Timeout 헤더로 더 짧게만 지정 가능)"""
+    
+    async def dispatch(self, request: Request, call_next):
+        seconds = settings.request_deadline_seconds
+        header = request.headers.get("X-Request-Timeout")
+        if header:
+            try:
+                seconds = min(seconds, max(0.1, float(header)))
+            except ValueError:
+                pass
+        
+        token = set_deadline(seconds)
+        try:
+            return await call_next(request)
+        finally:
+            reset_deadline(token)
+
+
 class CORSMiddleware:
     """CORS 처리 미들웨어 (정적 설정)"""
     
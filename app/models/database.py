@@ -6,7 +6,7 @@ import aiosqlite
 import json
 import asyncio
 from contextlib import contextmanager, asynccontextmanager
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import asdict
 
 from .schemas import UserProfile, ExtractedFacts
@@ -105,10 +105,15 @@ class Database:
                     article_id TEXT PRIMARY KEY,
                     facts_json TEXT,
                     extracted_at TEXT,
+                    content_hash TEXT,
                     FOREIGN KEY (article_id) REFERENCES original_articles(id) ON DELETE CASCADE
                 )
             ''')
             
+            self._ensure_columns(cursor, 'extracted_facts', {
+                'content_hash': 'TEXT'
+            })
+            
             # 개인화 콘텐츠 테이블
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS personalized_content (
@@ -120,11 +125,23 @@ class Database:
                     content TEXT,
                     key_points TEXT,
                     reading_time TEXT,
+                    provider TEXT,
+                    model TEXT,
+                    facts_version TEXT,
+                    reading_mode TEXT,
                     created_at TEXT,
                     FOREIGN KEY (article_id) REFERENCES original_articles(id) ON DELETE CASCADE
                 )
             ''')
             
+            # 기존 DB 마이그레이션 (컬럼 추가)
+            self._ensure_columns(cursor, 'personalized_content', {
+                'provider': 'TEXT',
+                'model': 'TEXT',
+                'facts_version': 'TEXT',
+                'reading_mode': 'TEXT'
+            })
+            
             # 사용자 활동 테이블
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS user_activity (
@@ -138,6 +155,32 @@ class Database:
                 )
             ''')
             
+            # LLM 모델 상태 테이블 (폐기 모델 영속화)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_model_health (
+                    provider TEXT,
+                    model TEXT,
+                    decommissioned_at TEXT,
+                    reason TEXT,
+                    PRIMARY KEY (provider, model)
+                )
+            ''')
+            
+            # 제공자 Batch API 작업 (오프라인 팩트 추출/페르소나 사전 생성)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_batches (
+                    id TEXT PRIMARY KEY,
+                    provider TEXT,
+                    kind TEXT,
+                    status TEXT,
+                    input_path TEXT,
+                    request_count INTEGER,
+                    output_file_id TEXT,
+                    created_at TEXT,
+                    completed_at TEXT
+                )
+            ''')
+            
             # 인덱스 생성
             indexes = [
                 'CREATE INDEX IF NOT EXISTS idx_facts_article ON extracted_facts(article_id)',
@@ -145,6 +188,7 @@ class Database:
                 'CREATE INDEX IF NOT EXISTS idx_activity_user ON user_activity(user_id, created_at)',
                 'CREATE INDEX IF NOT EXISTS idx_articles_collected ON original_articles(collected_at DESC)',
                 'CREATE INDEX IF NOT EXISTS idx_facts_extracted ON extracted_facts(extracted_at DESC)',
+                'CREATE INDEX IF NOT EXISTS idx_facts_content_hash ON extracted_facts(content_hash)',
                 'CREATE INDEX IF NOT EXISTS idx_pc_created ON personalized_content(created_at)',
                 'CREATE INDEX IF NOT EXISTS idx_activity_created ON user_activity(created_at)'
             ]
@@ -154,6 +198,15 @@ class Database:
         
         logger.info("데이터베이스 초기화 완료")
     
+    @staticmethod
+    def _ensure_columns(cursor, table: str, columns: Dict[str, str]) -> None:
+        """누락된 컬럼 추가 (CREATE TABLE IF NOT EXISTS 이전에 생성된 DB 대응)"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, decl in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {decl}')
+    
     def save_user_profile(self, profile: UserProfile) -> None:
         """사용자 프로필 저장 (created_at 보존 UPSERT)"""
         with self.get_connection() as conn:
@@ -228,6 +281,26 @@ class Database:
                     )
                 return None
     
+    def count_users_by_segment(self) -> List[Tuple[str, str, int]]:
+        """(주 직업, reading_mode)별 사용자 수 (많은 순) - 페르소나 워밍업 대상 선정용
+        
+        주 직업은 job_categories 첫 항목, reading_mode는 프로필에 저장된 값 그대로 (빈 값은 standard)
+        """
+        counts: Dict[Tuple[str, str], int] = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT job_categories, reading_mode FROM user_profiles')
+            for row in cursor.fetchall():
+                try:
+                    jobs = json.loads(row['job_categories'] or "[]")
+                except (TypeError, ValueError):
+                    continue
+                if jobs:
+                    key = (jobs[0], row['reading_mode'] or "standard")
+                    counts[key] = counts.get(key, 0) + 1
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        return [(job, mode, users) for (job, mode), users in ranked]
+    
     def save_article(self, article: Dict[str, Any]) -> bool:
         """기사 저장"""
         with self.get_connection() as conn:
@@ -251,20 +324,57 @@ class Database:
                 logger.error("기사 저장 실패", error=str(e), article_id=article.get('id'))
                 return False
     
-    def save_facts(self, article_id: str, facts: ExtractedFacts) -> None:
-        """팩트 저장"""
+    def save_facts(self, article_id: str, facts: ExtractedFacts, content_hash: Optional[str] = None) -> None:
+        """팩트 저장 (content_hash: 정규화 본문 다이제스트, 재발행 기사 재사용용)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO extracted_facts
-                (article_id, facts_json, extracted_at)
-                VALUES (?, ?, ?)
+                (article_id, facts_json, extracted_at, content_hash)
+                VALUES (?, ?, ?, ?)
             ''', (
                 article_id,
                 json.dumps(asdict(facts), ensure_ascii=False),
-                now_kst()
+                now_kst(),
+                content_hash
             ))
     
+    def get_facts_by_content_hash(self, content_hash: str) -> Optional[ExtractedFacts]:
+        """본문 다이제스트로 기존 팩트 조회 (동일 본문의 다른 기사 ID)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT facts_json FROM extracted_facts WHERE content_hash = ? ORDER BY extracted_at DESC LIMIT 1',
+                (content_hash,)
+            )
+            row = cursor.fetchone()
+            if row:
+                return ExtractedFacts(**json.loads(row['facts_json']))
+            return None
+    
+    def get_facts_version(self, article_id: str) -> Optional[str]:
+        """팩트 버전 (추출 시각) - 재추출 시 개인화 캐시가 오래된 것인지 판별용"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT extracted_at FROM extracted_facts WHERE article_id = ?', (article_id,))
+            row = cursor.fetchone()
+            return row['extracted_at'] if row else None
+
+    def get_articles_without_facts(self, limit: int, exclude: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+        """팩트가 없는 기사 (저장 후 추출이 중단된 기사 재처리용, 오래된 순)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT a.id, a.title, a.content, a.source, a.url, a.published
+                FROM original_articles a
+                LEFT JOIN extracted_facts f ON f.article_id = a.id
+                WHERE f.article_id IS NULL
+                ORDER BY a.collected_at
+            ''')
+            excluded = set(exclude)
+            rows = [dict(row) for row in cursor.fetchall()]
+            return [row for row in rows if row['id'] not in excluded][:max(0, limit)]
+
     async def get_facts(self, article_id: str) -> Optional[ExtractedFacts]:
         """팩트 조회 (비동기)"""
         async with aiosqlite.connect(self.db_path) as conn:
@@ -284,14 +394,17 @@ class Database:
     
     def save_personalized_content(self, content_id: str, article_id: str, 
                                  user_id: str, profile_hash: str, 
-                                 personalized: Dict[str, Any]) -> None:
+                                 personalized: Dict[str, Any],
+                                 facts_version: Optional[str] = None,
+                                 reading_mode: str = "insight") -> None:
         """개인화 콘텐츠 저장 (created_at 보존 UPSERT)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO personalized_content
-                (id, article_id, user_id, profile_hash, title, content, key_points, reading_time, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (id, article_id, user_id, profile_hash, title, content, key_points, reading_time,
+                 provider, model, facts_version, reading_mode, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(id) DO UPDATE SET
                     article_id=excluded.article_id,
                     user_id=excluded.user_id,
@@ -299,7 +412,11 @@ class Database:
                     title=excluded.title,
                     content=excluded.content,
                     key_points=excluded.key_points,
-                    reading_time=excluded.reading_time
+                    reading_time=excluded.reading_time,
+                    provider=excluded.provider,
+                    model=excluded.model,
+                    facts_version=excluded.facts_version,
+                    reading_mode=excluded.reading_mode
                 -- created_at은 기존 값을 유지 (업데이트하지 않음)
             ''', (
                 content_id,
@@ -310,6 +427,10 @@ class Database:
                 personalized['content'],
                 json.dumps(personalized['key_points'], ensure_ascii=False),
                 personalized['reading_time'],
+                personalized.get('provider'),
+                personalized.get('model'),
+                facts_version,
+                reading_mode,
                 now_kst()
             ))
     
@@ -322,10 +443,93 @@ class Database:
                 (content_id,)
             )
             row = cursor.fetchone()
-            
-            if row:
-                return None  # 캐시 완전 비활성화
-            return None
+            return self._personalized_row(row) if row else None
+    
+    def get_latest_personalized_content(self, article_id: str, user_id: str,
+                                        reading_mode: str = "insight") -> Optional[Dict[str, Any]]:
+        """기사/사용자의 가장 최근 개인화 콘텐츠 (프로필/팩트 버전 무관, stale-while-revalidate용)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT * FROM personalized_content WHERE article_id = ? AND user_id = ? '
+                "AND COALESCE(reading_mode, 'insight') = ? ORDER BY created_at DESC LIMIT 1",
+                (article_id, user_id, reading_mode)
+            )
+            row = cursor.fetchone()
+            return self._personalized_row(row) if row else None
+    
+    @staticmethod
+    def _personalized_row(row) -> Dict[str, Any]:
+        """personalized_content 행 → 응답 dict"""
+        return {
+            "title": row['title'],
+            "content": row['content'],
+            "personalized_article": row['content'],
+            "key_points": json.loads(row['key_points'] or "[]"),
+            "reading_time": row['reading_time'],
+            "provider": row['provider'],
+            "model": row['model'],
+            "profile_hash": row['profile_hash'],
+            "facts_version": row['facts_version'],
+            "reading_mode": row['reading_mode'] or "insight",
+            "created_at": row['created_at']
+        }
+    
+    def mark_model_decommissioned(self, provider: str, model: str, reason: str = "") -> None:
+        """폐기된 LLM 모델 기록"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO llm_model_health (provider, model, decommissioned_at, reason)
+                VALUES (?, ?, ?, ?)
+            ''', (provider, model, now_kst(), reason))
+    
+    def get_decommissioned_models(self) -> list:
+        """폐기된 LLM 모델 목록 [(provider, model)]"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT provider, model FROM llm_model_health WHERE decommissioned_at IS NOT NULL')
+            return [(row['provider'], row['model']) for row in cursor.fetchall()]
+    
+    def save_llm_batch(self, batch_id: str, provider: str, kind: str, input_path: str,
+                       request_count: int, status: str = "validating") -> None:
+        """제출한 Batch API 작업 기록"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO llm_batches
+                (id, provider, kind, status, input_path, request_count, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (batch_id, provider, kind, status, input_path, request_count, now_kst()))
+    
+    def update_llm_batch(self, batch_id: str, status: str, output_file_id: Optional[str] = None,
+                         completed: bool = False) -> None:
+        """Batch API 작업 상태 갱신 (completed=True면 완료 시각 기록)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE llm_batches
+                SET status = ?, output_file_id = COALESCE(?, output_file_id),
+                    completed_at = CASE WHEN ? THEN ? ELSE completed_at END
+                WHERE id = ?
+            ''', (status, output_file_id, completed, now_kst(), batch_id))
+    
+    def get_open_llm_batches(self) -> List[Dict[str, Any]]:
+        """결과 반영 전인 Batch API 작업 목록 (오래된 순)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT * FROM llm_batches WHERE completed_at IS NULL ORDER BY created_at'
+            )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_article_text(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """기사 제목/본문 조회 (동기, Batch 결과 반영용)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, title, content FROM original_articles WHERE id = ?', (article_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     def log_activity(self, user_id: str, article_id: str, action: str, duration: Optional[int] = None) -> None:
         """사용자 활동 로깅"""
@@ -108,6 +108,7 @@ class PersonalizeRequest(BaseModel):
     
     article_id: str = Field(max_length=50, alias="article")
     user_id: str = Field(max_length=64, alias="role")
+    progressive: Optional[bool] = None  # brief 먼저, insight는 후속 조회 (None이면 서버 설정)
     
     @model_validator(mode="before")
     @classmethod
@@ -186,12 +187,48 @@ FACTS_SCHEMA = {
     "required": ["who", "what", "when", "where", "why", "how", "numbers", "quotes", "verified_facts"]
 }
 
+FACTS_BATCH_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                **FACTS_SCHEMA,
+                "properties": {"index": {"type": "integer"}, **FACTS_SCHEMA["properties"]},
+                "required": ["index"] + FACTS_SCHEMA["required"]
+            }
+        }
+    },
+    "required": ["results"]
+}
+
+REWRITE_BATCH_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "properties": {
+                    "persona": {"type": "string"},
+                    "content": {"type": "string"}
+                },
+                "required": ["persona", "content"]
+            }
+        }
+    },
+    "required": ["results"]
+}
+
 REWRITE_SCHEMA = {
     "type": "object",
     "additionalProperties": False,
     "properties": {
         "title": {"type": "string", "maxLength": 200},
-        "content": {"type": "string", "minLength": 2000, "maxLength": 8000},
+        "content": {"type": "string", "minLength": 2000, "maxLength": 8000},  # 호출 시 reading_budget.rewrite_schema()가 모드별로 덮어씀
         "key_points": {
             "type": "array",
             "items": {"type": "string", "maxLength": 100},
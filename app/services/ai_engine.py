@@ -4,19 +4,47 @@
 import json
 import asyncio
 from time import monotonic
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
-from openai import AsyncOpenAI
-from groq import AsyncGroq
-
-from ..models.schemas import ExtractedFacts, UserProfile, FACTS_SCHEMA, REWRITE_SCHEMA
+from ..models.schemas import (ExtractedFacts, UserProfile, FACTS_SCHEMA, FACTS_BATCH_SCHEMA,
+                              REWRITE_BATCH_SCHEMA)
+from ..core import deadline
 from ..core.config import settings
 from ..core.logging import get_logger
 from ..utils.helpers import with_retry, coerce_json
+from . import rate_limits
+from .concurrency import limiter_for
+from .hedging import HedgePolicy
+from .template_renderer import render_personalized
+from .llm_clients import get_groq_client, get_openai_client
+from .reading_budget import budget_for, resolve_mode, rewrite_schema
 # from ..utils.cache import cache_manager  # 캐시 완전 제거
 
 logger = get_logger("ai_engine")
 
+# 직업별 관점 (고정 페르소나 집합 - 다중 페르소나 일괄 생성 단위)
+JOB_FOCUS = {
+    "투자자": "이 뉴스가 시장/주가/섹터에 미칠 영향과 투자 기회를 중심으로",
+    "사업가": "이 뉴스가 비즈니스 환경과 사업 기회에 미칠 변화를 중심으로", 
+    "직장인": "이 뉴스가 일자리와 업무 환경에 미칠 영향을 중심으로"
+}
+PERSONAS = tuple(JOB_FOCUS)
+
+
+def primary_job_of(profile: UserProfile) -> str:
+    """개인화 기준 직업 (job_categories 첫 항목)"""
+    return profile.job_categories[0] if profile.job_categories else "일반"
+
+
+def prompt_segment(primary_job: str, reading_mode: str = "insight") -> Dict[str, str]:
+    """개인화 결과를 결정하는 프롬프트 입력 필드 (캐시/병합 세그먼트 키 원천)
+    
+    응답 본문은 run_personalize/stream_personalize가 만들고, 그 프롬프트에는 직업(role)과
+    읽기 모드만 들어간다. 나이/관심사는 레거시 2회 호출 모드의 스키마 호출에만 쓰이고
+    그 결과는 버려지므로 세그먼트에 넣지 않는다. 프롬프트 입력이 바뀌면 여기도 함께 바꿔야 한다.
+    """
+    return {"job": primary_job, "reading_mode": reading_mode}
+
 
 class AIEngine:
     """최적화된 AI 기반 콘텐츠 처리 엔진"""
@@ -25,60 +53,56 @@ class AIEngine:
         if settings.ai_provider == "groq":
             if not settings.groq_api_key:
                 raise RuntimeError("GROQ_API_KEY가 설정되어 있지 않습니다.")
-            self.client = AsyncGroq(api_key=settings.groq_api_key)
+            self.client = get_groq_client()
             self.model = settings.groq_model
             self.provider = "groq"
         elif settings.ai_provider == "dual":
             # Dual 모드: Groq와 OpenAI 둘 다 초기화
             if not settings.groq_api_key or not api_key:
                 raise RuntimeError("Dual 모드에서는 GROQ_API_KEY와 OPENAI_API_KEY가 모두 필요합니다.")
-            self.groq_client = AsyncGroq(api_key=settings.groq_api_key)
-            self.openai_client = AsyncOpenAI(api_key=api_key, timeout=float(settings.openai_timeout), max_retries=0)
+            self.groq_client = get_groq_client()
+            self.openai_client = get_openai_client()
             self.client = self.groq_client  # 기본은 Groq
             self.model = settings.groq_model
             self.provider = "dual"
         else:
             if not api_key or api_key == "test-key":
                 raise RuntimeError("OPENAI_API_KEY가 설정되어 있지 않습니다.")
-            self.client = AsyncOpenAI(
-                api_key=api_key,
-                timeout=float(settings.openai_timeout),
-                max_retries=0
-            )
+            self.client = get_openai_client()
             self.model = settings.openai_model
             self.provider = "openai"
         self._structured_outputs_tested = False
+        # dual 모드 헤지 정책 (Groq 지연 추적)
+        self._hedge = HedgePolicy("ai_engine_dual")
         self._supports_structured = None
-        
-        # 2025년 최적화: 동적 세마포어 조정
-        self._concurrent_limit = asyncio.Semaphore(settings.openai_concurrency_limit)
-        
-        # 레이트 리미터
-        from ..utils.helpers import RateLimiter
-        self._rate_limiter = RateLimiter(
-            max_calls=settings.rate_limit_per_minute,
-            time_window=60
-        )
+
     
     async def _call_with_schema(self, messages: list, schema: dict, 
-                               temperature: float = 0.1, max_tokens: int = 8000):
-        """AI API 호출 (OpenAI/Groq 지원)"""
+                               temperature: float = 0.1, max_tokens: int = 8000,
+                               target: tuple = None):
+        """AI API 호출 (OpenAI/Groq 지원)
         
+        target: (client, model, provider) - 지정 시 인스턴스 기본값 대신 사용 (dual/헤지 호출용)
+        """
+        client, model, provider = target or (self.client, self.model, self.provider)
         start = monotonic()
         
         try:
-            if self.provider == "groq":
+            if provider == "groq":
                 # Groq API 호출 (JSON 모드)
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    response_format={"type": "json_object"}
-                )
+                await rate_limits.acquire(provider, model, messages, max_tokens)
+                async with limiter_for(provider).slot():
+                    response = await client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        timeout=deadline.clamp_timeout(float(settings.openai_timeout)),
+                        response_format={"type": "json_object"}
+                    )
                 
                 logger.debug("Groq API 호출 완료",
-                           model=self.model,
+                           model=model,
                            latency_ms=int((monotonic() - start) * 1000),
                            prompt_tokens=getattr(response.usage, "prompt_tokens", None),
                            completion_tokens=getattr(response.usage, "completion_tokens", None),
@@ -89,9 +113,9 @@ class AIEngine:
                 if not self._structured_outputs_tested:
                     self._structured_outputs_tested = True
                     try:
-                        async with self._concurrent_limit:
-                            test_response = await self.client.chat.completions.create(
-                                model=self.model,
+                        async with limiter_for(provider).slot():
+                            test_response = await client.chat.completions.create(
+                                model=model,
                                 messages=[{"role": "user", "content": "test"}],
                                 temperature=0,
                                 max_tokens=10,
@@ -110,23 +134,23 @@ class AIEngine:
                                 }
                             )
                         self._supports_structured = True
-                        logger.info("Structured Outputs 지원 확인됨", model=self.model)
+                        logger.info("Structured Outputs 지원 확인됨", model=model)
                     except Exception as e:
                         self._supports_structured = False
                         logger.info("Structured Outputs 미지원, JSON 모드 사용", 
-                                   model=self.model, error=str(e)[:100])
+                                   model=model, error=str(e)[:100])
                 
-                # 레이트 리미팅 적용
-                await self._rate_limiter.acquire()
+                # 제공자 레이트 리미팅 적용
+                await rate_limits.acquire(provider, model, messages, max_tokens)
                 
-                async with self._concurrent_limit:
+                async with limiter_for(provider).slot():
                     if settings.use_structured_outputs and self._supports_structured:
-                        response = await self.client.chat.completions.create(
-                            model=self.model,
+                        response = await client.chat.completions.create(
+                            model=model,
                             messages=messages,
                             temperature=temperature,
                             max_tokens=max_tokens,
-                            timeout=float(settings.openai_timeout),
+                            timeout=deadline.clamp_timeout(float(settings.openai_timeout)),
                             response_format={
                                 "type": "json_schema",
                                 "json_schema": {
@@ -137,12 +161,12 @@ class AIEngine:
                             }
                         )
                     else:
-                        response = await self.client.chat.completions.create(
-                            model=self.model,
+                        response = await client.chat.completions.create(
+                            model=model,
                             messages=messages,
                             temperature=temperature,
                             max_tokens=max_tokens,
-                            timeout=float(settings.openai_timeout),
+                            timeout=deadline.clamp_timeout(float(settings.openai_timeout)),
                             response_format={"type": "json_object"}
                         )
                     
@@ -156,15 +180,76 @@ class AIEngine:
             return response
             
         except Exception as e:
-            if self.provider == "openai" and "schema" in str(e).lower() and self._supports_structured:
+            if provider == "openai" and "schema" in str(e).lower() and self._supports_structured:
                 logger.warning("Structured Outputs 실패, JSON 모드로 폴백", error=str(e)[:100])
                 self._supports_structured = False
-                return await self._call_with_schema(messages, schema, temperature, max_tokens)
+                return await self._call_with_schema(messages, schema, temperature, max_tokens, target)
             raise
     
+    async def _dual_call(self, messages: list, schema: dict, temperature: float, max_tokens: int,
+                         answered: list = None):
+        """dual 모드 호출: Groq 우선, 실패 시 OpenAI (헤지 활성화 시 지연되면 OpenAI 동시 호출)
+        
+        answered: 지정 시 실제로 응답한 제공자 이름을 추가 (결과 provider 표기용)
+        """
+        groq_target = (self.groq_client, settings.groq_model, "groq")
+        openai_target = (self.openai_client, settings.openai_model, "openai")
+        
+        hedged_openai = []
+        
+        async def _call(target):
+            response = await self._call_with_schema(messages, schema, temperature, max_tokens, target=target)
+            if answered is not None:
+                answered.append(target[2])
+            return response
+        
+        def _hedge_openai():
+            hedged_openai.append(True)
+            return _call(openai_target)
+        
+        try:
+            if settings.llm_hedge_enabled:
+                return await self._hedge.run(lambda: _call(groq_target), _hedge_openai)
+            logger.info("개인화 시도: Groq 우선")
+            return await _call(groq_target)
+        except Exception as e:
+            if deadline.expired() or hedged_openai:
+                raise  # 남은 시간이 없거나 헤지로 OpenAI까지 이미 실패했으면 폴백 호출 생략
+            # OpenAI로 fallback
+            logger.warning(f"Groq 실패, OpenAI 대체: {e}")
+            return await _call(openai_target)
+    
     # @cache_manager.cache_result(ttl=3600, key_prefix="facts:")  # 캐시 완전 비활성화
     async def extract_facts(self, article: Dict[str, Any]) -> ExtractedFacts:
         """팩트 추출 (캐시 적용)"""
+        messages = self.build_facts_messages(article)
+        
+        async def _call():
+            return await self._call_with_schema(
+                messages=messages,
+                schema={"name": "ExtractedFacts", "schema": FACTS_SCHEMA},
+                temperature=0.1,
+                max_tokens=8000
+            )
+        
+        try:
+            response = await with_retry(_call, retries=settings.openai_retries, base_delay=1.0)
+            
+            if not getattr(response, "choices", None) or not response.choices:
+                logger.error("OpenAI 응답이 비어있음", model=self.model, op="extract_facts")
+                raise RuntimeError("Empty OpenAI choices")
+            
+            raw_content = getattr(response.choices[0].message, "content", None) or "{}"
+            return self._facts_from_data(self.parse_json_content(raw_content))
+            
+        except Exception as e:
+            logger.error("팩트 추출 실패", error=str(e), article_id=article.get('id'))
+            # fallback 데이터 반환
+            return self._fallback_facts(article)
+    
+    @staticmethod
+    def build_facts_messages(article: Dict[str, Any]) -> list:
+        """팩트 추출 프롬프트 메시지 (실시간 호출/Batch API 공용)"""
         system = "너는 팩트 추출기다. 반드시 JSON만 출력한다. 의견/추측/전망은 제외하라."
         user = f"""
 기사 제목: {article['title']}
@@ -182,6 +267,55 @@ class AIEngine:
   "quotes": [{{"speaker":"string","content":"string"}}],
   "verified_facts": ["string"]
 }}
+"""
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ]
+    
+    @staticmethod
+    def parse_json_content(raw_content: str) -> Dict[str, Any]:
+        """LLM JSON 응답 파싱 (깨진 JSON은 복구 시도)"""
+        try:
+            return json.loads(raw_content)
+        except json.JSONDecodeError:
+            logger.warning("JSON 파싱 실패, 복구 시도", content_preview=raw_content[:100])
+            return coerce_json(raw_content)
+    
+    async def extract_facts_batch(self, articles: List[Dict[str, Any]]) -> List[ExtractedFacts]:
+        """여러 기사를 한 번의 호출로 팩트 추출 (시스템 프롬프트/스키마 1회 전송)
+        
+        응답이 깨졌거나 일부 기사가 빠지면 해당 기사만 개별 extract_facts로 폴백한다.
+        반환 순서는 입력 순서와 같다.
+        """
+        if len(articles) <= 1:
+            return [await self.extract_facts(article) for article in articles]
+        
+        system = "너는 팩트 추출기다. 반드시 JSON만 출력한다. 의견/추측/전망은 제외하라. 기사마다 독립적으로 추출하라."
+        article_blocks = "\n\n".join(
+            f"[기사 {idx}]\n기사 제목: {article['title']}\n기사 내용: {article['content']}"
+            for idx, article in enumerate(articles)
+        )
+        user = f"""
+{article_blocks}
+
+위 {len(articles)}개 기사 각각에 대해 이 JSON 스키마로만 응답 (index는 기사 번호):
+{{
+  "results": [
+    {{
+      "index": 0,
+      "who": ["string"],
+      "what": "string",
+      "when": "string",
+      "where": "string",
+      "why": "string",
+      "how": "string",
+      "numbers": {{"항목":"수치"}},
+      "quotes": [{{"speaker":"string","content":"string"}}],
+      "verified_facts": ["string"]
+    }}
+  ]
+}}
 """
         
         async def _call():
@@ -190,16 +324,16 @@ class AIEngine:
                     {"role": "system", "content": system},
                     {"role": "user", "content": user}
                 ],
-                schema={"name": "ExtractedFacts", "schema": FACTS_SCHEMA},
+                schema={"name": "ExtractedFactsBatch", "schema": FACTS_BATCH_SCHEMA},
                 temperature=0.1,
-                max_tokens=8000
+                max_tokens=min(16000, 2000 * len(articles))
             )
         
+        by_index: Dict[int, ExtractedFacts] = {}
         try:
             response = await with_retry(_call, retries=settings.openai_retries, base_delay=1.0)
             
             if not getattr(response, "choices", None) or not response.choices:
-                logger.error("OpenAI 응답이 비어있음", model=self.model, op="extract_facts")
                 raise RuntimeError("Empty OpenAI choices")
             
             raw_content = getattr(response.choices[0].message, "content", None) or "{}"
@@ -209,37 +343,62 @@ class AIEngine:
                 logger.warning("JSON 파싱 실패, 복구 시도", content_preview=raw_content[:100])
                 data = coerce_json(raw_content)
             
-            return ExtractedFacts(
-                who=(data.get("who", []) or [])[:10],
-                what=(data.get("what", "") or "")[:200],
-                when=(data.get("when", "") or "")[:100],
-                where=(data.get("where", "") or "")[:100],
-                why=(data.get("why", "") or "")[:200],
-                how=(data.get("how", "") or "")[:200],
-                numbers=data.get("numbers", {}) or {},
-                quotes=(data.get("quotes", []) or [])[:5],
-                verified_facts=(data.get("verified_facts", []) or [])[:10]
-            )
-            
+            for item in data.get("results") or []:
+                idx = item.get("index") if isinstance(item, dict) else None
+                if isinstance(idx, int) and 0 <= idx < len(articles) and idx not in by_index:
+                    by_index[idx] = self._facts_from_data(item)
+                    
         except Exception as e:
-            logger.error("팩트 추출 실패", error=str(e), article_id=article.get('id'))
-            # fallback 데이터 반환
-            return ExtractedFacts(
-                who=[],
-                what=article.get('title', '')[:200],
-                when="",
-                where="",
-                why="",
-                how="",
-                numbers={},
-                quotes=[],
-                verified_facts=[]
-            )
+            logger.warning("배치 팩트 추출 실패, 개별 추출로 폴백", error=str(e)[:200], batch_size=len(articles))
+        
+        missing = [idx for idx in range(len(articles)) if idx not in by_index]
+        if missing:
+            logger.info("배치 응답 누락 기사 개별 추출", missing=len(missing), batch_size=len(articles))
+            fallback = await asyncio.gather(*[self.extract_facts(articles[idx]) for idx in missing])
+            by_index.update(zip(missing, fallback))
+        
+        return [by_index[idx] for idx in range(len(articles))]
     
-    async def rewrite_for_user(self, facts: ExtractedFacts, profile: UserProfile, original_title: str = None) -> Dict[str, Any]:
-        """사용자 맞춤 콘텐츠 분석 (제목은 절대 변경하지 않음)"""
-        # 읽기 모드 완전 제거, 800자 기본
-        guide = {"time": "2분", "style": "상세한 뉴스 분석"}
+    @staticmethod
+    def _facts_from_data(data: Dict[str, Any]) -> ExtractedFacts:
+        """모델 응답 dict → ExtractedFacts (필드 길이 제한)"""
+        return ExtractedFacts(
+            who=(data.get("who", []) or [])[:10],
+            what=(data.get("what", "") or "")[:200],
+            when=(data.get("when", "") or "")[:100],
+            where=(data.get("where", "") or "")[:100],
+            why=(data.get("why", "") or "")[:200],
+            how=(data.get("how", "") or "")[:200],
+            numbers=data.get("numbers", {}) or {},
+            quotes=(data.get("quotes", []) or [])[:5],
+            verified_facts=(data.get("verified_facts", []) or [])[:10]
+        )
+    
+    @staticmethod
+    def _fallback_facts(article: Dict[str, Any]) -> ExtractedFacts:
+        """추출 실패 시 제목만 담은 팩트"""
+        return ExtractedFacts(
+            who=[],
+            what=article.get('title', '')[:200],
+            when="",
+            where="",
+            why="",
+            how="",
+            numbers={},
+            quotes=[],
+            verified_facts=[]
+        )
+    
+    async def rewrite_for_user(self, facts: ExtractedFacts, profile: UserProfile, original_title: str = None,
+                               reading_mode: str = "insight") -> Dict[str, Any]:
+        """사용자 맞춤 콘텐츠 분석 (제목은 절대 변경하지 않음)
+        
+        reading_mode: brief/quick/insight(standard)/deep/detailed - 분량 지시, max_tokens,
+        스키마 본문 길이가 모두 reading_budget 표를 따른다
+        """
+        guide = self._reading_guide(reading_mode)
+        budget = budget_for(reading_mode)
+        schema = rewrite_schema(reading_mode)
         
         # 관심사 통합
         all_interests = (
@@ -247,7 +406,7 @@ class AIEngine:
             profile.interests_hobby + profile.interests_tech
         )[:10]  # MAX_INTERESTS
         
-        primary_job = profile.job_categories[0] if profile.job_categories else "일반"
+        primary_job = primary_job_of(profile)
         primary_interest = all_interests[0] if all_interests else "일반"
         
         # 디버깅: 프로필 정보 로깅
@@ -263,12 +422,7 @@ class AIEngine:
             numbers_instruction = f"\n- 첫 단락에 다음 수치 중 하나를 반드시 포함: {list(facts.numbers.values())[:3]}"
         
         # 진짜 개인화: 자연스럽고 의미있는 관점 변화
-        job_focus = {
-            "투자자": "이 뉴스가 시장/주가/섹터에 미칠 영향과 투자 기회를 중심으로",
-            "사업가": "이 뉴스가 비즈니스 환경과 사업 기회에 미칠 변화를 중심으로", 
-            "직장인": "이 뉴스가 일자리와 업무 환경에 미칠 영향을 중심으로"
-        }
-        focus_instruction = job_focus.get(primary_job, "일반적인 관점으로")
+        focus_instruction = JOB_FOCUS.get(primary_job, "일반적인 관점으로")
         
         system = f"""너는 전문 기자다. {primary_job} 독자에게 맞춰 뉴스를 재작성한다.
 
@@ -279,7 +433,7 @@ class AIEngine:
 - 관련 없으면 일반적인 보도로 작성
 - 기자 문체: "~라고 전했다", "~로 나타났다"
 
-출력: {primary_job}에게 의미있는 기사 (1500자 내외)"""
+출력: {primary_job}에게 의미있는 {budget.style} ({budget.length_instruction})"""
         original_news_title = original_title or facts.what
         
         user = f"""
@@ -299,12 +453,11 @@ class AIEngine:
 독자: {primary_job} ({profile.age}세)
 관심사: {', '.join(all_interests[:3])}
 
-🚨 무조건 2000자 이상 작성하라! 🚨
-- 1999자 이하는 실패작으로 간주
-- 뉴스 배경, 맥락, 의미를 모두 포함
-- {primary_job} 관점 상세 분석
-- 반복해서라도 2000자 채우기
-- 짧은 답변은 거부됨
+분량: content는 {budget.length_instruction}
+- {budget.min_chars}자 미만이나 {budget.max_chars}자 초과는 실패작으로 간주
+- 뉴스 배경, 맥락, 의미를 분량 안에서 우선순위대로 포함
+- {primary_job} 관점 분석
+- 분량을 채우려고 같은 내용 반복 금지
 
 JSON:
 {{
@@ -318,103 +471,263 @@ JSON:
         async def _call():
             # dual 모드에서는 Groq 먼저 시도, 실패하면 OpenAI
             if self.provider == "dual":
-                try:
-                    # Groq 시도
-                    self.client = self.groq_client
-                    self.model = settings.groq_model
-                    logger.info("개인화 시도: Groq 우선")
-                    return await self._call_with_schema(
-                        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-                        schema={"name": "PersonalizedArticle", "schema": REWRITE_SCHEMA},
-                        temperature=0.6,
-                        max_tokens=8000
-                    )
-                except Exception as e:
-                    # OpenAI로 fallback
-                    logger.warning(f"Groq 실패, OpenAI 대체: {e}")
-                    self.client = self.openai_client
-                    self.model = settings.openai_model
-                    return await self._call_with_schema(
-                        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-                        schema={"name": "PersonalizedArticle", "schema": REWRITE_SCHEMA},
-                        temperature=0.6,
-                        max_tokens=8000
-                    )
+                return await self._dual_call(
+                    messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+                    schema={"name": "PersonalizedArticle", "schema": schema},
+                    temperature=0.6,
+                    max_tokens=budget.max_tokens
+                )
             else:
                 # 단일 모드
                 return await self._call_with_schema(
                     messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-                    schema={"name": "PersonalizedArticle", "schema": REWRITE_SCHEMA},
+                    schema={"name": "PersonalizedArticle", "schema": schema},
                     temperature=0.6,
-                    max_tokens=8000
+                    max_tokens=budget.max_tokens
                 )
         
         try:
-            response = await with_retry(_call, retries=settings.openai_retries, base_delay=1.0)
-            
-            if not getattr(response, "choices", None) or not response.choices:
-                logger.error("OpenAI 응답이 비어있음", model=self.model, op="rewrite_for_user")
-                return self._create_fallback_content(facts, guide)
-            
-            raw_content = getattr(response.choices[0].message, "content", None) or "{}"
-            try:
-                obj = json.loads(raw_content)
-            except json.JSONDecodeError:
-                logger.warning("JSON 파싱 실패, 복구 시도", content_preview=raw_content[:100])
-                obj = coerce_json(raw_content)
+            if not settings.personalize_single_call:
+                # 레거시 2회 호출 모드: 스키마 호출 결과는 로깅에만 쓰이고 버려진다 (벤치마크 비교용)
+                response = await with_retry(_call, retries=settings.openai_retries, base_delay=1.0)
+                
+                if not getattr(response, "choices", None) or not response.choices:
+                    logger.error("OpenAI 응답이 비어있음", model=self.model, op="rewrite_for_user")
+                    return self._create_fallback_content(facts, guide, original_news_title, primary_job)
+                
+                raw_content = getattr(response.choices[0].message, "content", None) or "{}"
+                try:
+                    obj = json.loads(raw_content)
+                except json.JSONDecodeError:
+                    logger.warning("JSON 파싱 실패, 복구 시도", content_preview=raw_content[:100])
+                    obj = coerce_json(raw_content)
+                
+                # 디버그: AI 실제 응답 확인
+                logger.info("AI 실제 응답 확인",
+                           ai_title=obj.get("title", "없음"),
+                           ai_content_length=len(obj.get("content", "")),
+                           original_title=original_news_title,
+                           user_id=profile.user_id[:10])
             
-            # 디버그: AI 실제 응답 확인
-            logger.info("AI 실제 응답 확인",
-                       ai_title=obj.get("title", "없음"),
-                       ai_content_length=len(obj.get("content", "")),
-                       original_title=original_news_title,
-                       user_id=profile.user_id[:10])
+            # 요청 데드라인을 이미 놓쳤으면 LLM 호출 없이 로컬 템플릿으로 응답
+            if not deadline.can_wait(0):
+                logger.warning("데드라인 부족, 템플릿 개인화로 대체", remaining=deadline.remaining())
+                return self._create_fallback_content(facts, guide, original_news_title, primary_job)
             
             # 새로운 폴백 시스템 사용
             from .groq_fallback import run_personalize
             
-            # 팩트 정보를 텍스트로 변환
-            facts_text = f"""
-제목: {original_news_title}
-내용: {facts.what}
-인물: {', '.join(facts.who[:3])}
-시점: {facts.when}
-배경: {facts.why}
-"""
-            
-            # 프로필 정보를 dict로 변환
-            profile_dict = {
-                "role": primary_job,
-                "interests": all_interests,
-                "reading_mode": "insight"
-            }
+            facts_text, profile_dict = self._build_personalize_input(
+                facts, original_news_title, primary_job, all_interests, reading_mode
+            )
             
             # 폴백 시스템으로 개인화 실행
             result = await run_personalize(facts_text, profile_dict)
+            if result.get("provider") == "stub":
+                # 모든 LLM 실패 → 원문 잘라 붙인 스텁 대신 템플릿 기사
+                return self._create_fallback_content(facts, guide, original_news_title, primary_job)
             
-            return {
-                "title": original_news_title,
-                "content": result["personalized_article"],
-                "personalized_article": result["personalized_article"],
-                "key_points": [f"{primary_job} 관점 분석", "AI 기반 맞춤형 재구성", "실시간 뉴스 처리"],
-                "reading_time": guide["time"],
-                "disclaimer": f"본 분석은 {primary_job} 관점에서의 참고용 정보입니다.",
-                "provider": result["provider"],
-                "model": result.get("model", "unknown")
-            }
+            return self._format_personalized(result, original_news_title, primary_job, guide)
             
         except Exception as e:
             logger.error("재작성 실패", error=str(e), user_id=profile.user_id[:10])
-            return self._create_fallback_content(facts, guide, original_news_title)
+            return self._create_fallback_content(facts, guide, original_news_title, primary_job)
     
-    def _create_fallback_content(self, facts: ExtractedFacts, guide: Dict[str, Any], original_title: str = None) -> Dict[str, Any]:
-        """재작성 실패 시 fallback 콘텐츠 생성"""
-        return {
-            "title": original_title or facts.what or "뉴스",
-            "content": f"{facts.what}. {facts.when}에 발생한 사건입니다.",
-            "key_points": facts.verified_facts[:3] or ["정보 처리 중입니다"],
-            "reading_time": guide["time"]
+    async def stream_rewrite_for_user(self, facts: ExtractedFacts, profile: UserProfile, original_title: str = None,
+                                      reading_mode: str = "insight"):
+        """사용자 맞춤 콘텐츠 스트리밍 (rewrite_for_user 단일 호출 경로와 같은 프롬프트)
+        
+        {"type": "token", "text"} 이벤트를 흘려보낸 뒤, 마지막에
+        rewrite_for_user와 같은 형태의 결과를 {"type": "done", "result"}로 yield한다.
+        """
+        from .groq_fallback import stream_personalize
+        
+        guide = self._reading_guide(reading_mode)
+        all_interests = (
+            profile.interests_finance + profile.interests_lifestyle +
+            profile.interests_hobby + profile.interests_tech
+        )[:10]  # MAX_INTERESTS
+        primary_job = primary_job_of(profile)
+        original_news_title = original_title or facts.what
+        
+        facts_text, profile_dict = self._build_personalize_input(
+            facts, original_news_title, primary_job, all_interests, reading_mode
+        )
+        
+        async for event in stream_personalize(facts_text, profile_dict):
+            if event["type"] == "done":
+                if event["result"].get("provider") == "stub":
+                    result = self._create_fallback_content(facts, guide, original_news_title, primary_job)
+                else:
+                    result = self._format_personalized(event["result"], original_news_title, primary_job, guide)
+                yield {"type": "done", "result": result}
+            else:
+                yield event
+    
+    async def rewrite_for_personas(self, facts: ExtractedFacts, original_title: str = None,
+                                   personas: Tuple[str, ...] = PERSONAS,
+                                   reading_mode: str = "insight") -> Dict[str, Dict[str, Any]]:
+        """기사 1건을 여러 페르소나(직업) 관점으로 한 번의 호출에 재작성 (팩트 1회 전송)
+        
+        응답이 깨졌거나 일부 페르소나가 빠지면 해당 페르소나만 개별 run_personalize로 폴백한다.
+        반환: {직업: rewrite_for_user와 같은 형태의 결과}
+        """
+        from .groq_fallback import run_personalize
+        
+        guide = self._reading_guide(reading_mode)
+        original_news_title = original_title or facts.what
+        facts_text, _ = self._build_personalize_input(facts, original_news_title, "", [], reading_mode)
+        messages, max_tokens = self.build_persona_messages(facts, original_news_title, personas, reading_mode)
+        answered = []
+        
+        async def _call():
+            if self.provider == "dual":
+                return await self._dual_call(
+                    messages=messages,
+                    schema={"name": "PersonalizedArticleBatch", "schema": REWRITE_BATCH_SCHEMA},
+                    temperature=0.2,
+                    max_tokens=max_tokens,
+                    answered=answered
+                )
+            return await self._call_with_schema(
+                messages=messages,
+                schema={"name": "PersonalizedArticleBatch", "schema": REWRITE_BATCH_SCHEMA},
+                temperature=0.2,
+                max_tokens=max_tokens
+            )
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        try:
+            response = await with_retry(_call, retries=settings.openai_retries, base_delay=1.0)
+            
+            if not getattr(response, "choices", None) or not response.choices:
+                raise RuntimeError("Empty choices")
+            
+            raw_content = getattr(response.choices[0].message, "content", None) or "{}"
+            # dual 모드는 실제로 응답한 제공자 (헤지/폴백으로 OpenAI가 답했을 수 있음)
+            provider = answered[-1] if answered else self.provider
+            model = getattr(response, "model", None) or self.model
+            results = self.parse_persona_results(self.parse_json_content(raw_content), personas,
+                                                 original_news_title, reading_mode, provider, model)
+            
+        except Exception as e:
+            logger.warning("다중 페르소나 재작성 실패, 개별 생성으로 폴백", error=str(e)[:200],
+                           personas=len(personas))
+        
+        missing = [job for job in personas if job not in results]
+        if missing:
+            logger.info("다중 페르소나 응답 누락 개별 생성", missing=missing)
+            fallback = await asyncio.gather(*[
+                run_personalize(facts_text, {"role": job, "interests": [], "reading_mode": reading_mode})
+                for job in missing
+            ])
+            for job, result in zip(missing, fallback):
+                if result.get("provider") == "stub":
+                    results[job] = self._create_fallback_content(facts, guide, original_news_title, job)
+                else:
+                    results[job] = self._format_personalized(result, original_news_title, job, guide)
+        
+        return results
+    
+    @classmethod
+    def build_persona_messages(cls, facts: ExtractedFacts, original_title: str, personas: Tuple[str, ...],
+                               reading_mode: str = "insight") -> Tuple[list, int]:
+        """다중 페르소나 재작성 프롬프트 메시지와 토큰 예산 (실시간 호출/Batch API 공용)"""
+        from .groq_fallback import max_tokens_by_mode, style_by_mode
+        
+        facts_text, _ = cls._build_personalize_input(facts, original_title, "", [], reading_mode)
+        
+        system = f"""너는 전문 기자다. 같은 뉴스를 여러 직업 독자 관점에서 각각 재작성한다.
+기자 말투로 작성: 객관적이고 정확하며 신뢰할 수 있는 톤
+독자별 출력 형식: {style_by_mode(reading_mode)}
+한국어로만 출력. 개인 의견이나 추측 금지. 반드시 JSON만 출력한다."""
+        focus_lines = "\n".join(f"- {job}: {JOB_FOCUS.get(job, '일반적인 관점으로')}" for job in personas)
+        user = f"""아래 기사 전체를 고려해 독자별로 재작성:
+---
+{facts_text}
+---
+
+독자별 관점:
+{focus_lines}
+
+위 {len(personas)}명의 독자 각각에 대해 이 JSON 스키마로만 응답 (persona는 직업명 그대로):
+{{
+  "results": [
+    {{"persona": "{personas[0]}", "content": "재작성한 기사"}}
+  ]
+}}
+"""
+        messages = [{"role": "system", "content": system}, {"role": "user", "content": user}]
+        return messages, max_tokens_by_mode(reading_mode) * len(personas)
+    
+    @classmethod
+    def parse_persona_results(cls, data: Dict[str, Any], personas: Tuple[str, ...], original_title: str,
+                              reading_mode: str, provider: str, model: str) -> Dict[str, Dict[str, Any]]:
+        """다중 페르소나 응답 → {직업: 개인화 결과} (요청하지 않은/빈 페르소나는 제외)"""
+        guide = cls._reading_guide(reading_mode)
+        results: Dict[str, Dict[str, Any]] = {}
+        for item in data.get("results") or []:
+            job = item.get("persona") if isinstance(item, dict) else None
+            content = (item.get("content") or "").strip() if job else ""
+            if job in personas and job not in results and content:
+                results[job] = cls._format_personalized(
+                    {"personalized_article": content, "provider": provider, "model": model},
+                    original_title, job, guide
+                )
+        return results
+    
+    @staticmethod
+    def _reading_guide(reading_mode: str) -> Dict[str, Any]:
+        """읽기 모드별 응답 가이드 (예상 읽기 시간/스타일, reading_budget 표 기준)"""
+        budget = budget_for(reading_mode)
+        return {"time": budget.reading_time, "style": budget.style, "mode": resolve_mode(reading_mode)}
+    
+    @staticmethod
+    def _build_personalize_input(facts: ExtractedFacts, original_title: str, primary_job: str,
+                                 all_interests: list, reading_mode: str = "insight") -> tuple:
+        """run_personalize 입력(팩트 텍스트, 프로필 dict) 생성"""
+        # 팩트 정보를 텍스트로 변환
+        facts_text = f"""
+제목: {original_title}
+내용: {facts.what}
+인물: {', '.join(facts.who[:3])}
+시점: {facts.when}
+배경: {facts.why}
+"""
+        
+        # 프로필 정보를 dict로 변환
+        profile_dict = {
+            "role": primary_job,
+            "interests": all_interests,
+            "reading_mode": reading_mode
+        }
+        return facts_text, profile_dict
+    
+    @staticmethod
+    def _format_personalized(result: Dict[str, Any], original_title: str, primary_job: str,
+                             guide: Dict[str, Any]) -> Dict[str, Any]:
+        """run_personalize 결과를 API 응답 형태로 변환 (degraded: 데드라인으로 축소 생성, truncated: 스트리밍 중단 - 캐시 제외)"""
+        formatted = {
+            "title": original_title,
+            "content": result["personalized_article"],
+            "personalized_article": result["personalized_article"],
+            "key_points": [f"{primary_job} 관점 분석", "AI 기반 맞춤형 재구성", "실시간 뉴스 처리"],
+            "reading_time": guide["time"],
+            "reading_mode": guide.get("mode", "insight"),
+            "disclaimer": f"본 분석은 {primary_job} 관점에서의 참고용 정보입니다.",
+            "provider": result["provider"],
+            "model": result.get("model", "unknown")
         }
+        for flag in ("degraded", "truncated"):
+            if result.get(flag):
+                formatted[flag] = True
+        return formatted
+    
+    def _create_fallback_content(self, facts: ExtractedFacts, guide: Dict[str, Any], original_title: str = None,
+                                 primary_job: str = "일반") -> Dict[str, Any]:
+        """재작성 실패 시 fallback 콘텐츠 생성 (LLM 없이 팩트 기반 직업별 템플릿)"""
+        return render_personalized(facts, primary_job, original_title,
+                                   reading_mode=guide.get("mode", "insight"), reading_time=guide["time"])
     
     async def health_check(self) -> bool:
         """AI 엔진 상태 확인 (최적화: API 호출 없이 설정만 확인)"""
@@ -0,0 +1,337 @@
+"""
+제공자 Batch API 파이프라인 (오프라인 팩트 추출/페르소나 사전 생성)
+지연에 민감하지 않은 backfill 작업을 JSONL 작업 파일로 묶어 /v1/batches로 제출하고,
+주기적으로 폴링해 결과를 extracted_facts와 개인화 캐시에 반영한다.
+실시간 호출 경로(레이트 리미터/동시성 제한)를 거치지 않으므로 interactive 한도를 소모하지 않는다.
+"""
+import json
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from .ai_engine import AIEngine, PERSONAS as ALL_PERSONAS
+
+logger = get_logger("batch_pipeline")
+
+ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# 결과 파일이 확정된 상태 (expired도 완료된 요청분은 output_file_id로 내려옴)
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+FACTS = "facts"
+PERSONAS = "personas"
+
+
+def facts_custom_id(article_id: str) -> str:
+    return f"{FACTS}:{article_id}"
+
+
+def personas_custom_id(article_id: str, reading_mode: str) -> str:
+    return f"{PERSONAS}:{article_id}:{reading_mode}"
+
+
+def parse_custom_id(custom_id: str) -> Tuple[str, str, Optional[str]]:
+    """custom_id → (작업 종류, article_id, reading_mode)"""
+    kind, _, rest = (custom_id or "").partition(":")
+    if kind == PERSONAS:
+        article_id, _, reading_mode = rest.rpartition(":")
+        return kind, article_id, reading_mode or "insight"
+    return kind, rest, None
+
+
+class BatchPipeline:
+    """Batch API 작업 작성/제출/폴링/반영
+
+    client: OpenAI 호환 비동기 클라이언트 (미지정 시 provider의 공유 클라이언트, 로컬 대역 서버 검증 시 주입)
+    """
+
+    def __init__(self, processor, provider: str = None, client=None):
+        self.processor = processor
+        self.provider = provider or settings.llm_batch_provider
+        self._client = client
+        self._stats = {"submitted": 0, "requests": 0, "ingested": 0, "facts": 0, "variants": 0,
+                       "failed_items": 0, "live_fallbacks": 0}
+
+    @property
+    def db(self):
+        return self.processor.db
+
+    @property
+    def client(self):
+        if self._client is None:
+            from .llm_clients import get_groq_client, get_openai_client
+            self._client = get_groq_client() if self.provider == "groq" else get_openai_client()
+        return self._client
+
+    @property
+    def model(self) -> str:
+        return settings.groq_model if self.provider == "groq" else settings.openai_model
+
+    def _job(self, custom_id: str, messages: list, max_tokens: int, temperature: float) -> Dict[str, Any]:
+        """Batch 입력 1줄 (스키마 강제는 response_format json_object로, 파싱은 실시간 경로와 동일)"""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": {"type": "json_object"}
+            }
+        }
+
+    def build_facts_jobs(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """기사별 팩트 추출 작업"""
+        return [
+            self._job(facts_custom_id(article['id']), AIEngine.build_facts_messages(article), 8000, 0.1)
+            for article in articles
+        ]
+
+    async def build_persona_jobs(self, article_ids: List[str], personas: Tuple[str, ...],
+                                 reading_mode: str = "insight") -> List[Dict[str, Any]]:
+        """기사별 다중 페르소나 재작성 작업 (이미 캐시된 페르소나는 제외)"""
+        jobs = []
+        for article_id in article_ids:
+            missing = self.processor.missing_personas(article_id, personas, reading_mode)
+            if not missing:
+                continue
+            try:
+                facts, original_title = await self.processor._load_article_context(article_id)
+            except ValueError:
+                continue
+            messages, max_tokens = AIEngine.build_persona_messages(facts, original_title, missing, reading_mode)
+            jobs.append(self._job(personas_custom_id(article_id, reading_mode), messages, max_tokens, 0.2))
+        return jobs
+
+    @staticmethod
+    def write_jsonl(path: str, jobs: List[Dict[str, Any]]) -> str:
+        """작업 목록을 JSONL 파일로 기록"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for job in jobs:
+                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        return path
+
+    async def submit(self, jobs: List[Dict[str, Any]], kind: str) -> Optional[str]:
+        """JSONL 업로드 후 배치 생성, batch_id 반환 (작업이 없으면 None)"""
+        if not jobs:
+            return None
+        path = os.path.join(settings.llm_batch_dir, f"{kind}-{uuid.uuid4().hex[:12]}.jsonl")
+        self.write_jsonl(path, jobs)
+
+        with open(path, "rb") as f:
+            uploaded = await self.client.files.create(file=(os.path.basename(path), f.read()), purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata={"kind": kind}
+        )
+        self.db.save_llm_batch(batch.id, self.provider, kind, path, len(jobs), status=batch.status)
+        self._stats["submitted"] += 1
+        self._stats["requests"] += len(jobs)
+        logger.info("Batch API 작업 제출", batch_id=batch.id, kind=kind, requests=len(jobs),
+                    provider=self.provider)
+        return batch.id
+
+    async def submit_facts(self, articles: List[Dict[str, Any]]) -> Optional[str]:
+        """팩트 추출 배치 제출 (제출 실패 시 실시간 추출로 폴백)"""
+        try:
+            return await self.submit(self.build_facts_jobs(articles), FACTS)
+        except Exception as e:
+            logger.warning("팩트 배치 제출 실패, 실시간 추출로 폴백", error=str(e)[:200], articles=len(articles))
+            await self._extract_live(articles)
+            return None
+
+    async def submit_personas(self, article_ids: List[str],
+                              segments: Tuple[Tuple[str, str], ...] = None) -> Optional[str]:
+        """페르소나 사전 생성 배치 제출 (segments: (직업, 읽기 모드) 목록, 미지정 시 워밍업 상위 세그먼트)
+
+        읽기 모드별로 기사당 작업 1줄씩, 전체를 배치 1개로 제출한다.
+        """
+        segments = segments or self.processor.warmup_segments()
+        if not segments:
+            return None
+        try:
+            jobs = []
+            for reading_mode, personas in self.processor.personas_by_mode(segments).items():
+                jobs.extend(await self.build_persona_jobs(article_ids, personas, reading_mode))
+            return await self.submit(jobs, PERSONAS)
+        except Exception as e:
+            logger.warning("페르소나 배치 제출 실패 (다음 조회 시 실시간 생성)", error=str(e)[:200])
+            return None
+
+    async def poll(self) -> int:
+        """미완료 배치 상태 확인, 종료된 배치 결과 반영 후 반영한 배치 수 반환"""
+        done = 0
+        for row in self.db.get_open_llm_batches():
+            try:
+                batch = await self.client.batches.retrieve(row['id'])
+            except Exception as e:
+                logger.warning("배치 상태 조회 실패", batch_id=row['id'], error=str(e)[:200])
+                continue
+
+            if batch.status not in TERMINAL_STATUSES:
+                if batch.status != row['status']:
+                    self.db.update_llm_batch(row['id'], batch.status)
+                continue
+
+            output_file_id = getattr(batch, "output_file_id", None)
+            try:
+                text = ""
+                if output_file_id:
+                    text = (await self.client.files.content(output_file_id)).text
+            except Exception as e:
+                logger.warning("배치 결과 다운로드 실패 (다음 폴링에 재시도)", batch_id=row['id'], error=str(e)[:200])
+                continue
+            try:
+                await self.ingest(text, self._input_custom_ids(row['input_path']))
+            except Exception as e:
+                # 다시 반영하면 이미 저장한 팩트를 재저장해 facts_version이 바뀌므로 재시도하지 않음
+                logger.error("배치 결과 반영 중 오류 (완료 처리)", batch_id=row['id'], error=str(e)[:200])
+            self.db.update_llm_batch(row['id'], batch.status, output_file_id, completed=True)
+            self._stats["ingested"] += 1
+            done += 1
+            logger.info("Batch API 작업 반영 완료", batch_id=row['id'], kind=row['kind'], status=batch.status)
+        return done
+
+    async def ingest(self, text: str, expected: List[str] = ()) -> Dict[str, int]:
+        """결과 JSONL 반영 (실패 항목 중 팩트는 실시간 재추출, 페르소나는 다음 조회 시 생성)
+
+        expected: 입력 파일의 custom_id 목록 - 결과에 없는 팩트 작업(배치 실패/만료분)도 재추출 대상
+        응답 본문이 깨진 항목은 항목 단위로 실패 처리하고 나머지는 그대로 반영한다.
+        """
+        counts = {FACTS: 0, PERSONAS: 0, "failed": 0}
+        failed_articles: List[Dict[str, Any]] = []
+        facts_articles: List[str] = []
+        seen = set()
+
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                counts["failed"] += 1
+                continue
+            seen.add(item.get("custom_id"))
+            kind, article_id, reading_mode = parse_custom_id(item.get("custom_id"))
+            raw = self._message_content(item)
+
+            if kind == FACTS:
+                article = self.db.get_article_text(article_id)
+                if not article:
+                    continue
+                try:
+                    if raw is None:
+                        raise ValueError("failed batch item")
+                    facts = AIEngine._facts_from_data(AIEngine.parse_json_content(raw))
+                except Exception as e:
+                    logger.warning("팩트 배치 항목 실패, 실시간 재추출", article_id=article_id, error=str(e)[:100])
+                    counts["failed"] += 1
+                    failed_articles.append(article)
+                    continue
+                self.processor.store_facts(article, facts)
+                facts_articles.append(article_id)
+                counts[FACTS] += 1
+            elif kind == PERSONAS:
+                if raw is None:
+                    counts["failed"] += 1
+                    continue
+                response = (item.get("response") or {}).get("body") or {}
+                article = self.db.get_article_text(article_id) or {}
+                try:
+                    variants = AIEngine.parse_persona_results(
+                        AIEngine.parse_json_content(raw), ALL_PERSONAS,
+                        article.get("title"), reading_mode, self.provider, response.get("model") or self.model
+                    )
+                except Exception as e:
+                    logger.warning("페르소나 배치 항목 파싱 실패 (다음 조회 시 실시간 생성)", article_id=article_id,
+                                   error=str(e)[:100])
+                    counts["failed"] += 1
+                    continue
+                self.processor.store_persona_variants(article_id, variants, reading_mode)
+                counts[PERSONAS] += len(variants)
+
+        for custom_id in expected:
+            kind, article_id, _ = parse_custom_id(custom_id)
+            if kind == FACTS and custom_id not in seen:
+                article = self.db.get_article_text(article_id)
+                if article:
+                    counts["failed"] += 1
+                    failed_articles.append(article)
+
+        if failed_articles:
+            await self._extract_live(failed_articles)
+        if facts_articles:
+            # 팩트가 채워진 기사는 이어서 인기 페르소나 사전 생성도 배치로
+            await self.submit_personas(facts_articles)
+
+        self._stats["facts"] += counts[FACTS]
+        self._stats["variants"] += counts[PERSONAS]
+        self._stats["failed_items"] += counts["failed"]
+        return counts
+
+    def pending_fact_article_ids(self) -> Tuple[str, ...]:
+        """미완료 팩트 배치에 들어 있는 기사 ID (결과 반영 전 중복 추출 방지용)"""
+        ids = []
+        for row in self.db.get_open_llm_batches():
+            if row['kind'] != FACTS:
+                continue
+            for custom_id in self._input_custom_ids(row['input_path']):
+                kind, article_id, _ = parse_custom_id(custom_id)
+                if kind == FACTS:
+                    ids.append(article_id)
+        return tuple(ids)
+
+    @staticmethod
+    def _input_custom_ids(path: Optional[str]) -> List[str]:
+        """제출한 입력 JSONL의 custom_id 목록 (파일이 없으면 빈 목록)"""
+        if not path or not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line)["custom_id"] for line in f if line.strip()]
+
+    @staticmethod
+    def _message_content(item: Dict[str, Any]) -> Optional[str]:
+        """결과 1줄의 응답 본문 (오류/비정상 응답이면 None)"""
+        if item.get("error"):
+            return None
+        response = item.get("response") or {}
+        if response.get("status_code", 200) != 200:
+            return None
+        choices = (response.get("body") or {}).get("choices") or []
+        if not choices:
+            return None
+        return (choices[0].get("message") or {}).get("content") or None
+
+    async def _extract_live(self, articles: List[Dict[str, Any]]) -> None:
+        """배치 실패분 실시간 팩트 추출 (backfill 우선순위)"""
+        from .concurrency import BACKFILL, llm_priority
+        with llm_priority(BACKFILL):
+            for article in articles:
+                try:
+                    facts = await self.processor.ai_engine.extract_facts(article)
+                except Exception as e:
+                    logger.warning("실시간 팩트 추출 실패", article_id=article.get('id'), error=str(e)[:200])
+                    continue
+                self.processor.store_facts(article, facts)
+                self._stats["live_fallbacks"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch API 통계"""
+        try:
+            open_batches = len(self.db.get_open_llm_batches())
+        except Exception:
+            open_batches = None
+        return {
+            "enabled": settings.llm_batch_enabled,
+            "provider": self.provider,
+            "open_batches": open_batches,
+            **self._stats
+        }
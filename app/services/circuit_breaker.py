@@ -0,0 +1,151 @@
+"""
+제공자/모델별 서킷 브레이커 레지스트리
+- closed → (연속 실패 임계치) → open → (쿨다운 경과) → half_open(단일 프로브) → closed/open
+- 폐기(decommissioned) 모델은 SQLite에 기록해 재시작 후에도 건너뜀
+- 최근 지연/성공률 EWMA로 후보 모델 순서를 정렬
+"""
+from dataclasses import dataclass
+from time import monotonic
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger("circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class ModelHealth:
+    """모델 상태"""
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    probe_started_at: float = 0.0
+    ewma_latency: Optional[float] = None
+    ewma_success: float = 1.0
+    decommissioned: bool = False
+
+
+class CircuitBreakerRegistry:
+    """(provider, model) 단위 서킷 브레이커"""
+
+    def __init__(self):
+        self._health: Dict[Tuple[str, str], ModelHealth] = {}
+        self._db = None
+
+    def attach(self, database) -> None:
+        """영속 저장소 연결 및 폐기 모델 복원 (lifespan에서 1회 호출)"""
+        self._db = database
+        try:
+            for provider, model in database.get_decommissioned_models():
+                self._get(provider, model).decommissioned = True
+            logger.info("폐기 모델 목록 복원", count=sum(1 for h in self._health.values() if h.decommissioned))
+        except Exception as e:
+            logger.warning("폐기 모델 목록 복원 실패 (무시)", error=str(e))
+
+    def _get(self, provider: str, model: str) -> ModelHealth:
+        key = (provider, model)
+        if key not in self._health:
+            self._health[key] = ModelHealth()
+        return self._health[key]
+
+    def allow(self, provider: str, model: str) -> bool:
+        """호출 허용 여부 (open → 쿨다운 경과 시 half_open 전환 후 프로브 1건 허용)"""
+        health = self._get(provider, model)
+        if health.decommissioned:
+            return False
+        if health.state == OPEN:
+            if monotonic() - health.opened_at < settings.breaker_cooldown_seconds:
+                return False
+            health.state = HALF_OPEN
+            health.probe_in_flight = False
+        if health.state == HALF_OPEN:
+            # 결과가 기록되지 않은 프로브(취소 등)는 쿨다운 후 재시도 허용
+            if health.probe_in_flight and monotonic() - health.probe_started_at < settings.breaker_cooldown_seconds:
+                return False
+            health.probe_in_flight = True
+            health.probe_started_at = monotonic()
+        return True
+
+    def record_success(self, provider: str, model: str, latency: float) -> None:
+        """성공 기록 (half_open이면 closed 복귀)"""
+        health = self._get(provider, model)
+        alpha = settings.breaker_ewma_alpha
+        health.ewma_latency = latency if health.ewma_latency is None else (
+            alpha * latency + (1 - alpha) * health.ewma_latency
+        )
+        health.ewma_success = alpha + (1 - alpha) * health.ewma_success
+        health.consecutive_failures = 0
+        health.probe_in_flight = False
+        if health.state != CLOSED:
+            logger.info("서킷 복구", provider=provider, model=model)
+        health.state = CLOSED
+
+    def record_failure(self, provider: str, model: str, decommissioned: bool = False,
+                       error: Optional[Exception] = None) -> None:
+        """실패 기록 (임계치 초과 또는 half_open 프로브 실패 시 open)"""
+        health = self._get(provider, model)
+        alpha = settings.breaker_ewma_alpha
+        health.ewma_success = (1 - alpha) * health.ewma_success
+        health.consecutive_failures += 1
+        health.probe_in_flight = False
+
+        if decommissioned and not health.decommissioned:
+            health.decommissioned = True
+            logger.warning("모델 폐기 기록", provider=provider, model=model)
+            if self._db is not None:
+                try:
+                    self._db.mark_model_decommissioned(provider, model, str(error)[:200] if error else "")
+                except Exception as e:
+                    logger.warning("폐기 모델 저장 실패 (무시)", error=str(e))
+            return
+
+        if health.state == HALF_OPEN or health.consecutive_failures >= settings.breaker_failure_threshold:
+            if health.state != OPEN:
+                logger.warning("서킷 오픈", provider=provider, model=model,
+                               failures=health.consecutive_failures)
+            health.state = OPEN
+            health.opened_at = monotonic()
+
+    def is_open(self, provider: str, model: str) -> bool:
+        """현재 호출 불가 상태인지 (상태 전환 없음)"""
+        health = self._get(provider, model)
+        if health.decommissioned:
+            return True
+        return health.state == OPEN and monotonic() - health.opened_at < settings.breaker_cooldown_seconds
+
+    def rank(self, provider: str, models: List[str]) -> List[str]:
+        """후보 모델 정렬: 폐기 제외, 사용 가능 모델을 EWMA 점수(지연/성공률) 순으로, open 모델은 뒤로"""
+        candidates = [m for m in models if not self._get(provider, m).decommissioned]
+        known = [self._get(provider, m).ewma_latency for m in candidates
+                 if self._get(provider, m).ewma_latency is not None]
+        default_latency = sorted(known)[len(known) // 2] if known else 0.0
+
+        def score(model: str) -> float:
+            health = self._get(provider, model)
+            latency = health.ewma_latency if health.ewma_latency is not None else default_latency
+            return latency / max(health.ewma_success, 0.05)
+
+        available = sorted([m for m in candidates if not self.is_open(provider, m)], key=score)
+        return available + [m for m in candidates if self.is_open(provider, m)]
+
+    def stats(self) -> Dict[str, Any]:
+        """모델별 상태"""
+        return {
+            f"{provider}/{model}": {
+                "state": "decommissioned" if health.decommissioned else health.state,
+                "consecutive_failures": health.consecutive_failures,
+                "ewma_latency": round(health.ewma_latency, 3) if health.ewma_latency is not None else None,
+                "ewma_success": round(health.ewma_success, 3)
+            }
+            for (provider, model), health in self._health.items()
+        }
+
+
+# 전역 레지스트리
+breakers = CircuitBreakerRegistry()
@@ -0,0 +1,218 @@
+"""
+적응형(AIMD) 동시성 제한기 + 우선순위 스케줄러 - 제공자별 1개, 모든 LLM 호출 지점이 공유
+- 지연이 정상 범위인 성공 응답마다 한도를 가산 증가 (한도만큼 성공하면 +1)
+- 429/503/타임아웃이면 한도를 곱셈 감소 (동시에 몰린 실패로 연쇄 감소하지 않도록 감소 간격 유지)
+- 우선순위 클래스(interactive > precompute > backfill)별 대기열, 빈 슬롯은 높은 클래스부터 배정
+- 백그라운드 클래스는 한도의 일정 비율까지만 사용 → 나머지는 interactive 전용으로 예약
+- 한도/진행 중/대기열 길이/대기 시간을 클래스별 메트릭으로 노출
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Dict, Optional
+
+from ..core import deadline
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger("concurrency")
+
+# 우선순위 클래스 (앞쪽이 높음)
+INTERACTIVE = "interactive"  # 사용자 요청 개인화
+PRECOMPUTE = "precompute"  # 사전 생성/워밍업
+BACKFILL = "backfill"  # 수집 배치 팩트 추출
+PRIORITIES = (INTERACTIVE, PRECOMPUTE, BACKFILL)
+
+# 현재 작업의 LLM 우선순위 (미지정 시 interactive)
+_llm_priority: ContextVar[str] = ContextVar("llm_priority", default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    """현재 컨텍스트의 LLM 우선순위 클래스"""
+    return _llm_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """구간 내 LLM 호출 우선순위 지정 (하위 태스크에도 전파)"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"알 수 없는 우선순위 클래스: {priority}")
+    token = _llm_priority.set(priority)
+    try:
+        yield
+    finally:
+        _llm_priority.reset(token)
+
+
+def max_share(priority: str) -> float:
+    """클래스별 최대 사용 비율 (interactive는 전체)"""
+    return {
+        PRECOMPUTE: settings.llm_precompute_max_share,
+        BACKFILL: settings.llm_backfill_max_share,
+    }.get(priority, 1.0)
+
+
+def is_overload_error(e: BaseException) -> bool:
+    """제공자 과부하 신호 여부 (429/503, 타임아웃)"""
+    if isinstance(e, asyncio.TimeoutError):
+        return True
+    if getattr(e, "status_code", None) in (429, 503):
+        return True
+    return type(e).__name__ in ("RateLimitError", "APITimeoutError")
+
+
+class AdaptiveLimiter:
+    """AIMD 동시성 제한기 (클래스별 FIFO 대기열, 한도 실시간 조정)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._limit = float(min(max(settings.openai_concurrency_limit, settings.llm_concurrency_min),
+                                settings.llm_concurrency_max))
+        self._inflight = 0
+        self._inflight_by_class: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self._waiters: Dict[str, deque] = {p: deque() for p in PRIORITIES}
+        self._last_decrease = 0.0
+        self._stats = {"increases": 0, "decreases": 0, "overloads": 0}
+        self._class_stats = {p: {"acquired": 0, "queued": 0, "wait_total": 0.0, "wait_max": 0.0}
+                             for p in PRIORITIES}
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def _class_cap(self, priority: str) -> int:
+        return max(1, int(self.limit * max_share(priority)))
+
+    def _can_admit(self, priority: str) -> bool:
+        return self._inflight < self.limit and self._inflight_by_class[priority] < self._class_cap(priority)
+
+    def _grant(self, priority: str) -> None:
+        self._inflight += 1
+        self._inflight_by_class[priority] += 1
+
+    async def acquire(self, priority: Optional[str] = None) -> str:
+        """슬롯 획득 (같거나 높은 클래스 대기자가 있거나 한도 초과 시 대기), 적용된 클래스 반환"""
+        priority = priority or current_priority()
+        start = monotonic()
+        ahead = any(self._waiters[p] for p in PRIORITIES[:PRIORITIES.index(priority) + 1])
+        if not ahead and self._can_admit(priority):
+            self._grant(priority)
+        else:
+            self._class_stats[priority]["queued"] += 1
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[priority].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # 슬롯을 넘겨받은 직후 취소됨 → 반납
+                    self.release(priority)
+                elif waiter in self._waiters[priority]:
+                    self._waiters[priority].remove(waiter)
+                raise
+        waited = monotonic() - start
+        stats = self._class_stats[priority]
+        stats["acquired"] += 1
+        stats["wait_total"] += waited
+        stats["wait_max"] = max(stats["wait_max"], waited)
+        return priority
+
+    def release(self, priority: str = INTERACTIVE) -> None:
+        """슬롯 반납 후 한도 내에서 대기자 깨움"""
+        self._inflight -= 1
+        self._inflight_by_class[priority] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """높은 클래스부터 빈 슬롯 배정"""
+        for priority in PRIORITIES:
+            waiters = self._waiters[priority]
+            while waiters and self._can_admit(priority):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self._grant(priority)
+                    waiter.set_result(None)
+            if self._inflight >= self.limit:
+                return
+
+    def on_success(self, latency: float) -> None:
+        """정상 지연이면 가산 증가"""
+        if latency > settings.llm_concurrency_latency_threshold:
+            return
+        if self._limit < settings.llm_concurrency_max:
+            before = self.limit
+            self._limit = min(settings.llm_concurrency_max, self._limit + 1.0 / self._limit)
+            if self.limit > before:
+                self._stats["increases"] += 1
+                self._wake()
+
+    def on_overload(self) -> None:
+        """과부하 신호면 곱셈 감소 (감소 간격 내 중복 신호는 1회로 취급)"""
+        self._stats["overloads"] += 1
+        now = monotonic()
+        if now - self._last_decrease < settings.llm_concurrency_decrease_interval:
+            return
+        self._last_decrease = now
+        before = self.limit
+        self._limit = max(float(settings.llm_concurrency_min), self._limit * settings.llm_concurrency_backoff)
+        self._stats["decreases"] += 1
+        logger.warning("LLM 동시성 한도 감소", provider=self.name, before=before, after=self.limit)
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[str] = None):
+        """호출 1건 구간 - 결과(지연/과부하 예외)를 한도 조정에 반영 (우선순위 미지정 시 컨텍스트 값)"""
+        priority = await self.acquire(priority)
+        start = monotonic()
+        try:
+            yield
+        except BaseException as e:
+            # 요청 데드라인 소진으로 끊긴 호출은 제공자 과부하 신호가 아님
+            if is_overload_error(e) and not deadline.expired():
+                self.on_overload()
+            raise
+        else:
+            self.on_success(monotonic() - start)
+        finally:
+            self.release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """제한기 통계 (클래스별 진행/대기/대기 시간 포함)"""
+        classes = {}
+        for priority in PRIORITIES:
+            stats = self._class_stats[priority]
+            acquired = stats["acquired"]
+            classes[priority] = {
+                "cap": self._class_cap(priority),
+                "inflight": self._inflight_by_class[priority],
+                "queue_depth": len(self._waiters[priority]),
+                "acquired": acquired,
+                "queued": stats["queued"],
+                "avg_wait_ms": round(stats["wait_total"] / acquired * 1000, 1) if acquired else 0.0,
+                "max_wait_ms": round(stats["wait_max"] * 1000, 1)
+            }
+        return {
+            "limit": self.limit,
+            "inflight": self._inflight,
+            "queue_depth": sum(len(w) for w in self._waiters.values()),
+            **self._stats,
+            "classes": classes
+        }
+
+
+# 제공자별 제한기 레지스트리
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def limiter_for(provider: str) -> AdaptiveLimiter:
+    """제공자별 공유 제한기 ("openai_fallback" 등 파생 이름은 기본 제공자로 정규화)"""
+    key = "groq" if provider.startswith("groq") else "openai"
+    if key not in _limiters:
+        _limiters[key] = AdaptiveLimiter(key)
+    return _limiters[key]
+
+
+def stats() -> Dict[str, Any]:
+    """전체 제공자 제한기 통계"""
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,179 @@
+"""
+테넌트별 가중 공정 큐잉 (Deficit Round Robin)
+개인화 생성(LLM 호출) 슬롯을 테넌트(검증된 API 키, 클라이언트 IP 또는 user_id 접두사) 단위로 배분해,
+한 클라이언트가 여러 user_id로 요청을 쏟아내도 다른 테넌트의 대기 시간이 늘지 않게 한다.
+"""
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any, Deque, Dict, Optional
+
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger("fair_queue")
+
+# 통계를 보관할 최대 테넌트 수 (오래 조용한 테넌트부터 제거)
+_MAX_TRACKED_TENANTS = 1000
+
+_USER_PREFIX_SEP = re.compile(r"[:_\-]")
+
+
+def tenant_key(api_key: Optional[str], user_id: str, client_ip: Optional[str] = None) -> str:
+    """테넌트 식별자 (검증된 API 키 → 클라이언트 IP → user_id 접두사 순)
+
+    api_key/client_ip는 서버가 확인한 값만 넘긴다 (미검증 헤더를 쓰면 헤더를 바꿔 가며 새 큐를 받을 수 있음).
+    """
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:8]
+    if client_ip:
+        return "ip:" + client_ip
+    return "user:" + _USER_PREFIX_SEP.split(user_id or "anonymous", 1)[0]
+
+
+class FairQueue:
+    """가중 DRR 스케줄러 - 동시 슬롯 수를 테넌트 간 가중치 비율로 분배"""
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity or settings.fair_queue_concurrency
+        self._inflight = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {}
+        self._active: Deque[str] = deque()  # 대기자가 있는 테넌트 라운드로빈 순서
+        self._deficit: Dict[str, float] = {}
+        self._tenant_stats: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def weight(tenant: str) -> float:
+        return float(settings.fair_queue_weights.get(tenant, 1))
+
+    def _stats_for(self, tenant: str) -> Dict[str, Any]:
+        stats = self._tenant_stats.get(tenant)
+        if stats is None:
+            stats = {"inflight": 0, "served": 0, "queued": 0, "wait_total": 0.0, "wait_max": 0.0}
+            self._tenant_stats[tenant] = stats
+            if len(self._tenant_stats) > _MAX_TRACKED_TENANTS:
+                for name, old in list(self._tenant_stats.items()):
+                    if not old["inflight"] and name not in self._queues:
+                        del self._tenant_stats[name]
+                        break
+        self._tenant_stats.move_to_end(tenant)
+        return stats
+
+    async def acquire(self, tenant: str) -> None:
+        """슬롯 획득 (대기자가 있으면 DRR 순서에 따라 대기)"""
+        start = monotonic()
+        stats = self._stats_for(tenant)
+        if self._inflight < self.capacity and not self._active:
+            self._inflight += 1
+        else:
+            stats["queued"] += 1
+            waiter = asyncio.get_running_loop().create_future()
+            if tenant not in self._queues:
+                self._queues[tenant] = deque()
+                self._deficit[tenant] = 0.0
+                self._active.append(tenant)
+            self._queues[tenant].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release_slot()
+                else:
+                    self._discard(tenant, waiter)
+                raise
+        waited = monotonic() - start
+        stats["inflight"] += 1
+        stats["served"] += 1
+        stats["wait_total"] += waited
+        stats["wait_max"] = max(stats["wait_max"], waited)
+
+    def release(self, tenant: str) -> None:
+        """슬롯 반납"""
+        self._stats_for(tenant)["inflight"] -= 1
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self._inflight -= 1
+        self._dispatch()
+
+    def _discard(self, tenant: str, waiter: asyncio.Future) -> None:
+        """취소된 대기자 제거 (큐가 비면 테넌트 비활성화)"""
+        queue = self._queues.get(tenant)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+        if queue is not None and not queue:
+            self._deactivate(tenant)
+
+    def _deactivate(self, tenant: str) -> None:
+        self._queues.pop(tenant, None)
+        self._deficit.pop(tenant, None)
+        if tenant in self._active:
+            self._active.remove(tenant)
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 DRR로 배정 (요청 비용 1, 라운드당 quantum × 가중치 적립)
+
+        적립량이 0 이하인 테넌트만 남아 한 바퀴 동안 아무도 배정받지 못하면 멈춘다 (이벤트 루프 점유 방지).
+        """
+        stalled = 0  # 적립도 배정도 없이 건너뛴 연속 테넌트 수
+        while self._inflight < self.capacity and self._active:
+            if stalled >= len(self._active):
+                logger.error("공정 큐 배정 중단: 적립량이 0 이하인 테넌트만 대기 중",
+                             tenants=list(self._active), quantum=settings.fair_queue_quantum)
+                break
+            tenant = self._active[0]
+            queue = self._queues[tenant]
+            if self._deficit[tenant] < 1:
+                credit = settings.fair_queue_quantum * self.weight(tenant)
+                self._deficit[tenant] += max(0.0, credit)
+                if self._deficit[tenant] < 1:
+                    stalled = 0 if credit > 0 else stalled + 1
+                    self._active.rotate(-1)
+                    continue
+            stalled = 0
+            waiter = queue.popleft()
+            if not waiter.done():
+                self._deficit[tenant] -= 1
+                self._inflight += 1
+                waiter.set_result(None)
+            if not queue:
+                self._deactivate(tenant)
+            elif self._deficit[tenant] < 1:
+                self._active.rotate(-1)
+
+    @asynccontextmanager
+    async def slot(self, tenant: str):
+        """개인화 생성 1건 구간"""
+        await self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def stats(self) -> Dict[str, Any]:
+        """전체/테넌트별 대기열 통계"""
+        tenants = {}
+        for tenant, stats in self._tenant_stats.items():
+            served = stats["served"]
+            tenants[tenant] = {
+                "weight": self.weight(tenant),
+                "queue_depth": len(self._queues.get(tenant, ())),
+                "inflight": stats["inflight"],
+                "served": served,
+                "queued": stats["queued"],
+                "avg_wait_ms": round(stats["wait_total"] / served * 1000, 1) if served else 0.0,
+                "max_wait_ms": round(stats["wait_max"] * 1000, 1)
+            }
+        return {
+            "capacity": self.capacity,
+            "inflight": self._inflight,
+            "queue_depth": sum(len(q) for q in self._queues.values()),
+            "tenants": tenants
+        }
+
+
+# 전역 공정 큐 (개인화 생성 경로 공유)
+fair_queue = FairQueue()
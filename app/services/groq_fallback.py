@@ -4,9 +4,16 @@ Groq 모델 자동 폴백 시스템 - 모델 폐기 시 자동 대응
 import os
 import asyncio
 import time
-from groq import AsyncGroq, APIStatusError, APIConnectionError, APITimeoutError, RateLimitError
-from openai import AsyncOpenAI
+from groq import APIStatusError, APIConnectionError, APITimeoutError, RateLimitError
+from ..core import deadline
+from ..core.config import settings
 from ..core.logging import get_logger
+from ..utils.helpers import retry_budget
+from . import rate_limits, reading_budget
+from .circuit_breaker import breakers
+from .concurrency import limiter_for
+from .hedging import HedgePolicy
+from .llm_clients import get_groq_client, get_openai_client
 
 logger = get_logger("groq_fallback")
 
@@ -15,21 +22,17 @@ GROQ_MODEL = os.getenv("GROQ_MODEL", "").strip()
 GROQ_MODEL_CANDIDATES = [m.strip() for m in os.getenv("GROQ_MODEL_CANDIDATES", "").split(",") if m.strip()]
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+# run_personalize 헤지 정책 (Groq 지연 추적)
+_personalize_hedge = HedgePolicy("run_personalize")
+
 def max_tokens_by_mode(mode: str) -> int:
-    """reading_mode별 최적 토큰 수 - 도훈님 최적화"""
-    return {
-        "insight": 800,
-        "brief": 400,
-        "bullet": 300,
-    }.get(mode.lower(), 800)
+    """reading_mode별 최적 토큰 수 (reading_budget 표 기준)"""
+    return reading_budget.budget_for(mode).max_tokens
 
 def style_by_mode(mode: str) -> str:
-    """reading_mode별 출력 스타일 정의"""
-    return {
-        "insight": "5~8문단 심층 기사",
-        "brief": "4~6문장 간결 기사", 
-        "bullet": "핵심 포인트 6~8개",
-    }.get(mode.lower(), "5~8문단 심층 기사")
+    """reading_mode별 출력 스타일과 분량 (reading_budget 표 기준)"""
+    budget = reading_budget.budget_for(mode)
+    return f"{budget.style} ({budget.length_instruction})"
 
 def _is_model_decommissioned(e: Exception) -> bool:
     """모델 폐기/지원 중단 에러 감지"""
@@ -40,31 +43,43 @@ def _is_model_decommissioned(e: Exception) -> bool:
     ])
 
 async def _try_groq(messages, temperature=0.2, max_tokens=900):
-    """Groq 모델 후보들 순회 시도"""
+    """Groq 모델 후보들 순회 시도 (서킷 브레이커 기준 건강한 모델부터)"""
     if not GROQ_MODEL and not GROQ_MODEL_CANDIDATES:
         return None, "no_groq_model_configured"
     
-    client = AsyncGroq(timeout=20)
-    candidates = ([GROQ_MODEL] if GROQ_MODEL else []) + GROQ_MODEL_CANDIDATES
+    client = get_groq_client()
+    candidates = breakers.rank("groq", _groq_candidates())
     
     last_err = None
     for model_name in candidates:
+        if not deadline.can_wait(0):
+            # 남은 시간으로는 다음 후보를 시도할 수 없음 → 폴백 경로로
+            last_err = last_err or deadline.DeadlineExceeded("request deadline exceeded")
+            break
+        if not breakers.allow("groq", model_name):
+            logger.info(f"Groq 모델 서킷 오픈, 건너뜀: {model_name}")
+            continue
         logger.info(f"Groq 모델 시도: {model_name}")
         
-        for attempt in range(3):  # 모델당 3회 재시도
+        retry_budget.record_attempt()
+        for attempt in range(3):  # 모델당 3회 재시도 (전역 재시도 예산 안에서)
             try:
+                await rate_limits.acquire("groq", model_name, messages, max_tokens)
                 start_time = time.time()
-                r = await client.chat.completions.create(
-                    model=model_name,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
+                async with limiter_for("groq").slot():
+                    r = await client.chat.completions.create(
+                        model=model_name,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        timeout=deadline.clamp_timeout(20)
+                    )
                 end_time = time.time()
                 response_time = end_time - start_time
                 
                 txt = (r.choices[0].message.content or "").strip()
                 if txt:
+                    breakers.record_success("groq", model_name, response_time)
                     logger.info(f"Groq 성공: {model_name}, 응답시간: {response_time:.2f}초")
                     return {
                         "provider": "groq",
@@ -73,9 +88,22 @@ async def _try_groq(messages, temperature=0.2, max_tokens=900):
                         "is_fallback": False
                     }, None
                 last_err = ValueError("empty response")
+                breakers.record_failure("groq", model_name)
+                if attempt == 2 or not retry_budget.try_retry("groq"):
+                    break
+                
+            except deadline.DeadlineExceeded as e:
+                return None, e
                 
             except (RateLimitError, APIConnectionError, APITimeoutError) as e:
                 last_err = e
+                if deadline.expired():
+                    return None, e  # 요청 데드라인에 걸린 타임아웃은 모델 실패로 보지 않음
+                breakers.record_failure("groq", model_name)
+                if not breakers.allow("groq", model_name):
+                    break  # 서킷 오픈 → 백오프 없이 다음 후보로
+                if attempt == 2 or not deadline.can_wait(2**attempt) or not retry_budget.try_retry("groq"):
+                    break  # 마지막 시도, 백오프 후 재시도할 시간 부족, 또는 재시도 예산 소진
                 await asyncio.sleep(2**attempt)  # 백오프
                 logger.warning(f"Groq 재시도 {attempt+1}/3: {model_name} - {e}")
                 
@@ -83,7 +111,12 @@ async def _try_groq(messages, temperature=0.2, max_tokens=900):
                 last_err = e
                 if _is_model_decommissioned(e):
                     logger.warning(f"Groq 모델 폐기됨: {model_name} - {e}")
+                    breakers.record_failure("groq", model_name, decommissioned=True, error=e)
                     break  # 이 모델은 포기, 다음 후보로
+                breakers.record_failure("groq", model_name)
+                if (attempt == 2 or not breakers.allow("groq", model_name)
+                        or not deadline.can_wait(2**attempt) or not retry_budget.try_retry("groq")):
+                    break
                 await asyncio.sleep(2**attempt)
                 logger.warning(f"Groq API 에러 재시도 {attempt+1}/3: {model_name} - {e}")
         
@@ -92,10 +125,15 @@ async def _try_groq(messages, temperature=0.2, max_tokens=900):
     
     return None, last_err
 
-async def run_personalize(article_text: str, profile: dict):
-    """완전 방어형 개인화 - 절대 실패하지 않음"""
+def _groq_candidates():
+    """설정된 Groq 후보 모델 (GROQ_MODEL 우선, 중복 제거)"""
+    models = ([GROQ_MODEL] if GROQ_MODEL else []) + GROQ_MODEL_CANDIDATES
+    return list(dict.fromkeys(models))
+
+def _build_personalize_messages(article_text: str, profile: dict):
+    """개인화 프롬프트 메시지와 토큰 예산 생성"""
     role = profile.get("role") or "투자자"
-    mode = (profile.get("reading_mode") or "insight").lower()
+    mode = reading_budget.resolve_mode(profile.get("reading_mode"))
     
     # 기자 말투 + 개인화 프롬프트
     style = style_by_mode(mode)
@@ -107,40 +145,218 @@ async def run_personalize(article_text: str, profile: dict):
 한국어로만 출력. 개인 의견이나 추측 금지."""
     user = f"[직업:{role}]\n아래 기사 전체를 고려해 재작성:\n---\n{article_text}\n---"
     messages = [{"role": "system", "content": sys}, {"role": "user", "content": user}]
+    return messages, max_tokens
 
-    # 1) Groq 우선 (자동 폴백 시스템, 최적화된 토큰 수)
+async def _try_openai(messages, max_tokens, groq_err=None, hedged=False):
+    """OpenAI 호출 (항상 동일 스키마). 헤지 호출이면 빈 응답을 실패로 처리"""
+    oai = get_openai_client()
+    await rate_limits.acquire("openai", OPENAI_MODEL, messages, max_tokens)
+    timeout = deadline.clamp_timeout(20)
+    start_time = time.time()
+    try:
+        async with limiter_for("openai").slot():
+            r = await oai.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                temperature=0.2,
+                max_tokens=max_tokens,  # 최적화된 토큰 수
+                timeout=timeout
+            )
+    except Exception:
+        if not deadline.expired():
+            breakers.record_failure("openai", OPENAI_MODEL)
+        raise
+    breakers.record_success("openai", OPENAI_MODEL, time.time() - start_time)
+    txt = (r.choices[0].message.content or "").strip()
+    if not txt:
+        if hedged:
+            raise ValueError("empty response")
+        txt = f"(폴백 본문; groq 실패: {str(groq_err)[:120]})"
+    
+    result = {
+        "provider": "openai_fallback",
+        "model": OPENAI_MODEL,
+        "personalized_article": txt,
+        "is_fallback": True,
+        "groq_error": str(groq_err)[:200] if groq_err else None
+    }
+    if hedged:
+        result["hedged"] = True
+    return result
+
+async def _groq_or_raise(messages, max_tokens):
+    """헤지용 1차 호출 - Groq 실패를 예외로 변환"""
     groq_result, groq_err = await _try_groq(messages, max_tokens=max_tokens)
     if groq_result:
         return groq_result
+    raise groq_err if isinstance(groq_err, Exception) else RuntimeError(str(groq_err))
+
+def _deadline_profile(profile: dict) -> dict:
+    """요청 데드라인이 촉박하면 더 짧은 출력(brief)으로 낮춰 응답 시간 단축"""
+    if deadline.is_short() and max_tokens_by_mode(profile.get("reading_mode")) > max_tokens_by_mode("brief"):
+        logger.info("데드라인 임박, brief 모드로 축소", remaining=deadline.remaining(),
+                    reading_mode=profile.get("reading_mode"))
+        return {**profile, "reading_mode": "brief"}
+    return profile
+
+def _mark_degraded(result: dict, requested: dict, applied: dict) -> dict:
+    """데드라인 때문에 요청 모드보다 짧게 생성한 결과 표시 (요청 모드 캐시에 저장하지 않도록)"""
+    if applied is not requested and result.get("provider") != "stub":
+        result["degraded"] = True
+    return result
+
+async def run_personalize(article_text: str, profile: dict):
+    """완전 방어형 개인화 - 절대 실패하지 않음 (실제 적용된 모드 기준으로 지연/분량 기록)"""
+    applied = _deadline_profile(profile)
+    start_time = time.time()
+    result = await _run_personalize(article_text, applied)
+    if result.get("provider") != "stub":
+        reading_budget.record(applied.get("reading_mode"), time.time() - start_time,
+                              len(result.get("personalized_article") or ""))
+    return _mark_degraded(result, profile, applied)
+
+async def _run_personalize(article_text: str, profile: dict):
+    """Groq 우선 → OpenAI 폴백 → 스텁 순서로 개인화 실행"""
+    messages, max_tokens = _build_personalize_messages(article_text, profile)
+
+    # 1) Groq 우선 (자동 폴백 시스템, 최적화된 토큰 수)
+    if settings.llm_hedge_enabled and (GROQ_MODEL or GROQ_MODEL_CANDIDATES):
+        # 헤지: Groq가 추적 지연 백분위수 안에 끝나지 않으면 OpenAI 동시 호출
+        hedged_openai = []
+
+        async def _hedge_openai():
+            hedged_openai.append(True)
+            return await _try_openai(messages, max_tokens, hedged=True)
 
-    # 2) OpenAI 폴백 (항상 동일 스키마)
+        try:
+            return await _personalize_hedge.run(lambda: _groq_or_raise(messages, max_tokens), _hedge_openai)
+        except Exception as e:
+            groq_err = e
+            if hedged_openai:
+                # 헤지로 OpenAI까지 이미 실패 → 같은 폴백 호출을 반복하지 않음
+                logger.error("헤지 호출 모두 실패", error=str(e))
+                return _stub_result(article_text, groq_err, e)
+    else:
+        groq_result, groq_err = await _try_groq(messages, max_tokens=max_tokens)
+        if groq_result:
+            return groq_result
+
+    # 2) OpenAI 폴백 (항상 동일 스키마, 데드라인 소진 시 clamp_timeout이 예외 → 스텁)
     logger.info("OpenAI 폴백 실행", groq_error=str(groq_err) if groq_err else None)
     try:
-        oai = AsyncOpenAI(timeout=20)
-        r = await oai.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=messages,
-            temperature=0.2,
-            max_tokens=max_tokens  # 최적화된 토큰 수
-        )
-        txt = (r.choices[0].message.content or "").strip() or f"(폴백 본문; groq 실패: {str(groq_err)[:120]})"
-        
-        return {
-            "provider": "openai_fallback",
-            "model": OPENAI_MODEL,
-            "personalized_article": txt,
-            "is_fallback": True,
-            "groq_error": str(groq_err)[:200] if groq_err else None
-        }
+        return await _try_openai(messages, max_tokens, groq_err=groq_err)
         
     except Exception as openai_err:
         # 마지막 안전장치
         logger.error("OpenAI도 실패", error=str(openai_err))
-        return {
-            "provider": "stub",
-            "model": "none",
-            "personalized_article": f"AI 서비스 일시 중단. 원본: {article_text[:500]}...",
-            "is_fallback": True,
-            "groq_error": str(groq_err)[:200] if groq_err else None,
-            "openai_error": str(openai_err)[:200]
-        }
\ No newline at end of file
+        return _stub_result(article_text, groq_err, openai_err)
+
+def _stub_result(article_text: str, groq_err, openai_err):
+    """모든 제공자 실패 시 스텁 결과"""
+    return {
+        "provider": "stub",
+        "model": "none",
+        "personalized_article": f"AI 서비스 일시 중단. 원본: {article_text[:500]}...",
+        "is_fallback": True,
+        "groq_error": str(groq_err)[:200] if groq_err else None,
+        "openai_error": str(openai_err)[:200]
+    }
+
+async def _stream_completion(client, model_name, messages, temperature, max_tokens):
+    """chat.completions 스트리밍 호출 - 토큰 델타를 순서대로 yield"""
+    stream = await client.chat.completions.create(
+        model=model_name,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=deadline.clamp_timeout(20),
+        stream=True
+    )
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = getattr(chunk.choices[0].delta, "content", None)
+        if delta:
+            yield delta
+
+async def stream_personalize(article_text: str, profile: dict):
+    """스트리밍 개인화 - 토큰 이벤트를 yield하고 마지막에 run_personalize와 동일한 결과를 yield
+    
+    이벤트 형식:
+    - {"type": "token", "text": "..."}
+    - {"type": "done", "result": {...}}  (run_personalize 반환값과 같은 스키마)
+    
+    첫 토큰이 나오기 전 실패는 다음 Groq 후보 → OpenAI 순서로 폴백하고,
+    토큰 전송 이후의 실패는 그때까지의 본문으로 마무리한다.
+    """
+    requested, profile = profile, _deadline_profile(profile)
+    messages, max_tokens = _build_personalize_messages(article_text, profile)
+    started = time.time()
+    
+    attempts = []
+    if GROQ_MODEL or GROQ_MODEL_CANDIDATES:
+        groq_client = get_groq_client()
+        for model_name in breakers.rank("groq", _groq_candidates()):
+            attempts.append(("groq", groq_client, model_name))
+    attempts.append(("openai_fallback", get_openai_client(), OPENAI_MODEL))
+    
+    errors = {}
+    for provider, client, model_name in attempts:
+        breaker_key = "groq" if provider == "groq" else "openai"
+        if provider == "groq" and not breakers.allow(breaker_key, model_name):
+            continue
+        parts = []
+        interrupted = False
+        start_time = time.time()
+        try:
+            await rate_limits.acquire(provider, model_name, messages, max_tokens)
+            async with limiter_for(provider).slot():
+                async for delta in _stream_completion(client, model_name, messages, 0.2, max_tokens):
+                    parts.append(delta)
+                    yield {"type": "token", "text": delta}
+        except Exception as e:
+            errors[provider] = e
+            interrupted = True
+            if not deadline.expired():
+                breakers.record_failure(breaker_key, model_name,
+                                        decommissioned=_is_model_decommissioned(e), error=e)
+            if not parts:
+                logger.warning(f"스트리밍 실패, 다음 후보로: {provider}/{model_name} - {e}")
+                continue
+            logger.warning(f"스트리밍 중단, 부분 본문으로 마무리: {provider}/{model_name} - {e}")
+        
+        txt = "".join(parts).strip()
+        if not txt:
+            errors[provider] = ValueError("empty response")
+            breakers.record_failure(breaker_key, model_name)
+            continue
+        
+        if not interrupted:
+            breakers.record_success(breaker_key, model_name, time.time() - start_time)
+        logger.info(f"스트리밍 성공: {provider}/{model_name}, 응답시간: {time.time() - start_time:.2f}초")
+        result = {
+            "provider": provider,
+            "model": model_name,
+            "personalized_article": txt,
+            "is_fallback": provider != "groq"
+        }
+        if provider != "groq" and errors.get("groq"):
+            result["groq_error"] = str(errors["groq"])[:200]
+        if interrupted:
+            # 생성 도중 끊긴 본문 - 이번 응답에만 쓰고 캐시하지 않음
+            result["truncated"] = True
+            result["is_fallback"] = True
+        reading_budget.record(profile.get("reading_mode"), time.time() - started, len(txt))
+        yield {"type": "done", "result": _mark_degraded(result, requested, profile)}
+        return
+    
+    # 마지막 안전장치 (run_personalize의 stub과 동일)
+    logger.error("스트리밍 개인화 전체 실패", errors={k: str(v)[:100] for k, v in errors.items()})
+    yield {"type": "done", "result": {
+        "provider": "stub",
+        "model": "none",
+        "personalized_article": f"AI 서비스 일시 중단. 원본: {article_text[:500]}...",
+        "is_fallback": True,
+        "groq_error": str(errors["groq"])[:200] if errors.get("groq") else None,
+        "openai_error": str(errors["openai_fallback"])[:200] if errors.get("openai_fallback") else None
+    }}
\ No newline at end of file
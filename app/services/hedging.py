@@ -0,0 +1,109 @@
+"""
+LLM 헤지 요청 (Groq → OpenAI)
+1차 제공자가 추적 중인 지연 백분위수 안에 응답하지 않으면 2차 제공자를 동시에 호출하고,
+먼저 성공한 쪽을 채택한 뒤 나머지는 취소한다. 헤지 비율은 예산으로 제한한다.
+"""
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict
+
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger("hedging")
+
+# 이름별 정책 레지스트리 (메트릭 노출용)
+_policies: Dict[str, "HedgePolicy"] = {}
+
+
+class HedgePolicy:
+    """1차 제공자 지연 추적 + 헤지 예산"""
+
+    def __init__(self, name: str, window: int = 200):
+        self.name = name
+        self._latencies = deque(maxlen=window)
+        # 요청마다 max_ratio만큼 적립, 헤지 1회당 1 소모 (최대 10회분 버스트)
+        self._budget = 0.0
+        self._stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "budget_denied": 0}
+        _policies[name] = self
+
+    def record(self, latency: float) -> None:
+        """1차 제공자 성공 지연 기록"""
+        self._latencies.append(latency)
+
+    def delay(self) -> float:
+        """헤지 발사 시점 (추적 백분위수, 표본 부족 시 기본값)"""
+        if len(self._latencies) < 20:
+            return settings.llm_hedge_default_delay
+        ordered = sorted(self._latencies)
+        idx = min(int(len(ordered) * settings.llm_hedge_percentile), len(ordered) - 1)
+        return max(settings.llm_hedge_min_delay, ordered[idx])
+
+    def _on_request(self) -> None:
+        self._stats["requests"] += 1
+        self._budget = min(10.0, self._budget + settings.llm_hedge_max_ratio)
+
+    def _try_spend(self) -> bool:
+        if self._budget >= 1.0:
+            self._budget -= 1.0
+            return True
+        self._stats["budget_denied"] += 1
+        return False
+
+    async def run(self, primary: Callable[[], Awaitable[Any]],
+                  secondary: Callable[[], Awaitable[Any]]) -> Any:
+        """헤지 실행 - 먼저 성공한 결과 반환
+
+        1차가 헤지 시점 전에 실패하면 그 예외를 그대로 올린다 (호출자의 기존 폴백 경로 사용).
+        둘 다 실패하면 마지막 예외를 올린다.
+        """
+        self._on_request()
+        start = monotonic()
+        primary_task = asyncio.ensure_future(primary())
+        secondary_task = None
+
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self.delay())
+            if done or not self._try_spend():
+                result = await primary_task
+                self.record(monotonic() - start)
+                return result
+
+            self._stats["hedged"] += 1
+            logger.info("헤지 요청 발사", policy=self.name, elapsed=round(monotonic() - start, 2))
+            secondary_task = asyncio.ensure_future(secondary())
+            pending = {primary_task, secondary_task}
+            last_error = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    if task is primary_task:
+                        self.record(monotonic() - start)
+                    else:
+                        self._stats["hedge_wins"] += 1
+                    return task.result()
+            raise last_error
+        finally:
+            # 패자(또는 호출자 취소 시 남은 작업) 정리
+            for task in (primary_task, secondary_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """헤지 통계"""
+        return {
+            **self._stats,
+            "hedge_ratio": round(self._stats["hedged"] / self._stats["requests"], 3) if self._stats["requests"] else 0.0,
+            "current_delay": round(self.delay(), 3),
+            "samples": len(self._latencies)
+        }
+
+
+def stats() -> Dict[str, Any]:
+    """전체 헤지 정책 통계"""
+    return {name: policy.stats() for name, policy in _policies.items()}
@@ -0,0 +1,161 @@
+"""
+공유 LLM 클라이언트 풀 (Groq / OpenAI)
+요청마다 클라이언트를 만들면 커넥션 풀과 TLS 핸드셰이크가 매번 새로 생기므로,
+프로세스 단위로 keep-alive 풀을 공유하고 lifespan에서 예열/종료한다.
+"""
+import asyncio
+import json
+from typing import Dict, Any, Optional
+
+import httpx
+from groq import AsyncGroq
+from openai import AsyncOpenAI
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from . import rate_limits
+
+logger = get_logger("llm_clients")
+
+_groq_client: Optional[AsyncGroq] = None
+_openai_client: Optional[AsyncOpenAI] = None
+
+# 커넥션 재사용 지표 (httpcore trace 이벤트 기반)
+_stats = {"requests": 0, "new_connections": 0, "tls_handshakes": 0, "reused_connections": 0,
+          "handshakes_avoided": 0}
+
+
+def _make_trace(https: bool):
+    """요청 1건의 httpcore trace 콜백 - 새 TCP 연결/TLS 핸드셰이크/기존 연결 재사용 집계
+
+    요청 헤더 전송 전에 connect_tcp가 없었으면 풀의 연결을 재사용한 것이고,
+    HTTPS 요청일 때만 TLS 핸드셰이크를 아낀 것으로 센다.
+    """
+    connected = False
+
+    async def _trace(event_name: str, info: Dict[str, Any]) -> None:
+        nonlocal connected
+        if event_name == "connection.connect_tcp.started":
+            connected = True
+            _stats["new_connections"] += 1
+        elif event_name == "connection.start_tls.started":
+            _stats["tls_handshakes"] += 1
+        elif event_name.endswith(".send_request_headers.started") and not connected:
+            _stats["reused_connections"] += 1
+            if https:
+                _stats["handshakes_avoided"] += 1
+
+    return _trace
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """요청 훅 - trace 확장 주입 및 요청 수 집계"""
+    _stats["requests"] += 1
+    request.extensions["trace"] = _make_trace(request.url.scheme == "https")
+
+
+async def _on_response(response: httpx.Response) -> None:
+    """응답 훅 - x-ratelimit-* 헤더를 제공자 레이트 리미터에 반영"""
+    request = response.request
+    # JSON 본문 요청만 파싱 (files.create 등 multipart 스트리밍 본문은 request.content 접근 시 RequestNotRead)
+    if request.method != "POST" or not isinstance(request.stream, httpx.ByteStream):
+        return
+    try:
+        model = json.loads(request.content or b"{}").get("model")
+    except (ValueError, AttributeError, httpx.RequestNotRead):
+        return
+    if model:
+        provider = "groq" if "groq" in request.url.host else "openai"
+        rate_limits.observe(provider, model, response.status_code, response.headers)
+
+
+def _make_http_client() -> httpx.AsyncClient:
+    """keep-alive 풀 설정이 적용된 httpx 클라이언트"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+            keepalive_expiry=settings.llm_pool_keepalive_expiry
+        ),
+        timeout=httpx.Timeout(float(settings.openai_timeout), connect=10.0),
+        event_hooks={"request": [_on_request], "response": [_on_response]}
+    )
+
+
+# 공유 클라이언트는 SDK 자체 재시도(기본 2회)를 끈다 (max_retries=0).
+# 재시도는 호출 경로의 루프(with_retry, _try_groq 등)가 데드라인/서킷 브레이커/전역 재시도 예산을 보며 수행하므로,
+# SDK가 그 아래에서 몰래 재시도하면 시도 횟수가 곱해지고 예산 집계에서도 빠진다.
+
+
+def get_groq_client() -> AsyncGroq:
+    """공유 Groq 클라이언트 (최초 호출 시 생성, SDK 재시도 없음)"""
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            timeout=float(settings.openai_timeout),
+            max_retries=0,
+            http_client=_make_http_client()
+        )
+    return _groq_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """공유 OpenAI 클라이언트 (최초 호출 시 생성, SDK 재시도 없음)"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=float(settings.openai_timeout),
+            max_retries=0,
+            http_client=_make_http_client()
+        )
+    return _openai_client
+
+
+async def startup() -> None:
+    """클라이언트 생성 및 커넥션 예열 (첫 사용자 요청의 핸드셰이크 비용 제거)"""
+    warmups = []
+    if settings.groq_api_key:
+        warmups.append(("groq", get_groq_client()))
+    if settings.openai_api_key:
+        warmups.append(("openai", get_openai_client()))
+
+    async def _warm(name, client):
+        try:
+            await asyncio.wait_for(client.models.list(), timeout=5.0)
+            return name, True
+        except Exception as e:
+            logger.warning("LLM 클라이언트 예열 실패 (무시)", provider=name, error=str(e)[:100])
+            return name, False
+
+    results = await asyncio.gather(*[_warm(name, client) for name, client in warmups])
+    logger.info("LLM 클라이언트 예열 완료", results=dict(results))
+
+
+async def shutdown() -> None:
+    """커넥션 풀 종료"""
+    global _groq_client, _openai_client
+    for client in (_groq_client, _openai_client):
+        if client is not None:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning("LLM 클라이언트 종료 실패 (무시)", error=str(e)[:100])
+    _groq_client = None
+    _openai_client = None
+    logger.info("LLM 클라이언트 종료 완료")
+
+
+def stats() -> Dict[str, Any]:
+    """커넥션 재사용 통계"""
+    requests = _stats["requests"]
+    return {
+        **_stats,
+        "reuse_ratio": round(_stats["reused_connections"] / requests, 3) if requests else 0.0,
+        "pool": {
+            "max_connections": settings.llm_pool_max_connections,
+            "max_keepalive": settings.llm_pool_max_keepalive,
+            "keepalive_expiry": settings.llm_pool_keepalive_expiry
+        }
+    }
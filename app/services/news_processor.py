@@ -4,22 +4,37 @@
 import asyncio
 import uuid
 import hashlib
-from time import monotonic
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import asdict
-from datetime import datetime
 
 from ..models.database import Database
 from ..models.schemas import UserProfile, ExtractedFacts
-from ..services.ai_engine import AIEngine
+from ..services.ai_engine import AIEngine, PERSONAS, primary_job_of, prompt_segment
+from ..services.batch_pipeline import BatchPipeline
+from ..services.concurrency import BACKFILL, PRECOMPUTE, llm_priority
+from ..services.fair_queue import fair_queue, tenant_key
 from ..services.news_collector import NewsCollector
+from ..services.reading_budget import budget_for, resolve_mode
+from ..services.template_renderer import render_personalized
 from ..core.config import settings
+from ..core import deadline
+from ..core.deadline import deadline_scope
 from ..core.logging import get_logger
 from ..core.security import profile_hash
-# from ..utils.cache import cache_manager  # 캐시 완전 제거
+from ..utils.cache import PersonalizationCache
+from ..utils.helpers import SingleFlight, content_digest
 
 logger = get_logger("news_processor")
 
+# 개인화 캐시 엔트리는 사용자가 아니라 세그먼트(프롬프트 입력이 같은 프로필 묶음) 단위로 보관
+SEGMENT_OWNER_PREFIX = "segment:"
+
+
+def _segment_owner(segment: str) -> str:
+    """세그먼트 캐시 엔트리의 소유자 ID (personalized_content.user_id 자리)"""
+    return SEGMENT_OWNER_PREFIX + segment
+
 
 class DistributedLock:
     """분산 락 (캐시 제거됨)"""
@@ -143,6 +158,22 @@ class NewsProcessor:
         self.db = Database()
         self.collector = NewsCollector()
         self.ai_engine = AIEngine(api_key)
+        self.pc_cache = PersonalizationCache(self.db)
+        # 사용자별 마지막으로 최신 결과를 받은 (세그먼트, 읽기 모드) - 프로필 수정 후 stale 응답용
+        self._last_segments: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        # (article_id, profile_hash) 단위 동시 생성 병합
+        self.personalize_flight = SingleFlight()
+        # 본문 다이제스트 팩트 캐시 누적 통계 (히트 = 절약된 LLM 추출)
+        self.facts_cache_stats = {"hits": 0, "misses": 0}
+        # 응답과 분리된 백그라운드 생성 (키: article_id, segment, facts_version)
+        self._background: Dict[Tuple[str, str, Optional[str]], asyncio.Task] = {}
+        self.revalidate_stats = {"scheduled": 0, "completed": 0, "failed": 0}  # stale-while-revalidate
+        self.progressive_stats = {"scheduled": 0, "completed": 0, "failed": 0}  # 점진적 개인화 insight
+        self.persona_stats = {"batches": 0, "variants": 0}  # 다중 페르소나 일괄 생성
+        self.warmup_stats = {"runs": 0, "articles": 0, "variants": 0}  # 수집 후 페르소나 워밍업
+        # SLA 초과로 템플릿 응답 후 백그라운드에서 마저 생성 중인 작업
+        self._sla_tasks: set = set()
+        self.sla_stats = {"met": 0, "fallback": 0, "completed": 0, "failed": 0}
         
         # 단일 인스턴스 환경에서는 분산락 제거, 로컬락만 사용
         self.use_distributed_lock = settings.environment == "production" and hasattr(settings, 'enable_distributed_locks') and settings.enable_distributed_locks
@@ -154,6 +185,9 @@ class NewsProcessor:
             
         self._local_lock = asyncio.Lock()
         self._current_holder = None
+        
+        # 제공자 Batch API 파이프라인 (llm_batch_enabled일 때 페르소나 사전 생성 담당, 신규 기사 팩트는 실시간 추출)
+        self.batch_pipeline = BatchPipeline(self)
     
     async def process_news_batch(self, force: bool = False) -> bool:
         """뉴스 수집 및 처리 (분산 락 지원)"""
@@ -182,7 +216,10 @@ class NewsProcessor:
         
         try:
             async with self._local_lock:
-                return await self._process_batch_internal(holder)
+                # 수집 배치의 LLM 호출은 backfill 우선순위 (사용자 요청이 먼저 슬롯을 받음)
+                # 요청 핸들러/BackgroundTasks에서 호출돼도 HTTP 요청 데드라인은 적용하지 않음
+                with llm_priority(BACKFILL), deadline_scope(None):
+                    return await self._process_batch_internal(holder)
         finally:
             # 분산 락 해제 (사용하는 경우에만)
             if not force and self._current_holder and self.use_distributed_lock and self.distributed_lock:
@@ -195,59 +232,67 @@ class NewsProcessor:
     async def _process_batch_internal(self, holder: str) -> bool:
         """내부 배치 처리 로직"""
         try:
-            # 1. 뉴스 수집
-            articles = await self.collector.collect_news()
-            if not articles:
+            # 1. 이전 실행에서 저장만 되고 팩트 추출이 중단된 기사 (URL 중복 체크 때문에 다시 수집되지 않음)
+            try:
+                stranded = self.db.get_articles_without_facts(
+                    settings.articles_per_batch, exclude=self.batch_pipeline.pending_fact_article_ids()
+                )
+            except Exception as e:
+                logger.warning("팩트 누락 기사 조회 실패 (다음 실행에 재시도)", error=str(e))
+                stranded = []
+            if stranded:
+                logger.info("팩트 누락 기사 재처리", count=len(stranded))
+            
+            # 뉴스 수집
+            articles = await self.collector.collect_news() or []
+            if not articles and not stranded:
                 logger.warning("수집된 기사가 없습니다")
                 return True
             
             logger.info("뉴스 수집 완료", count=len(articles))
             
-            # 2. 각 기사 처리
-            processed = 0
-            last_heartbeat = monotonic()
+            # 2. 신규 기사 저장 (중복 제외)
+            new_articles = stranded + [
+                article for article in articles[:settings.articles_per_batch]
+                if self._store_article(article)
+            ]
+            
+            # 3. 팩트 추출 (extract_batch_size개씩 묶어 제한된 동시성으로 병렬 실행)
+            size = max(1, settings.extract_batch_size)
+            chunks = [new_articles[i:i + size] for i in range(0, len(new_articles), size)]
+            semaphore = asyncio.Semaphore(max(1, settings.extract_concurrency))
             
-            for idx, article in enumerate(articles[:settings.articles_per_batch]):
-                # 하트비트 업데이트 (주기적으로, 분산락 사용하는 경우에만)
-                now = monotonic()
-                if idx > 0 and (idx % 2 == 0 or now - last_heartbeat > 30):
-                    if self.use_distributed_lock and self.distributed_lock:
-                        if not await self.distributed_lock.update_heartbeat("news_collector", holder):
-                            logger.error("락 하트비트 실패, 처리 중단")
-                            break
-                    last_heartbeat = now
+            run_stats = {"hits": 0, "misses": 0}
+            # 신규 기사는 Batch API 모드에서도 실시간 추출 (목록에 바로 노출되므로 24시간 배치를 기다릴 수 없음)
+            tasks = [
+                asyncio.create_task(self._extract_chunk(chunk, semaphore, run_stats))
+                for chunk in chunks
+            ]
+            
+            # 하트비트 업데이트 (주기적으로, 분산락 사용하는 경우에만)
+            heartbeat_task = None
+            if self.use_distributed_lock and self.distributed_lock:
+                heartbeat_task = asyncio.create_task(self._heartbeat_loop(holder, tasks))
+            
+            try:
+                results = await asyncio.gather(*tasks, return_exceptions=True)
                 
-                try:
-                    # URL 중복 체크
-                    with self.db.get_connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("SELECT 1 FROM original_articles WHERE url = ?", (article['url'],))
-                        if cursor.fetchone():
-                            logger.debug("중복 기사 스킵", url=article['url'][:50])
-                            continue
-                    
-                    # 기사 저장
-                    if not self.db.save_article(article):
-                        logger.debug("기사 저장 스킵 (중복)", article_id=article['id'])
-                        continue
-                    
-                    # 팩트 추출
-                    facts = await self.ai_engine.extract_facts(article)
-                    
-                    # 팩트 저장
-                    self.db.save_facts(article['id'], facts)
-                    
-                    processed += 1
-                    logger.info("기사 처리 완료", 
-                               processed=processed, 
-                               title=article['title'][:30])
-                    
-                except Exception as e:
-                    logger.error("기사 처리 실패", 
-                                error=str(e), 
-                                article_id=article.get('id'))
-                    continue
+                if heartbeat_task and heartbeat_task.done():
+                    # 하트비트가 락을 잃고 종료됨 → 워밍업은 다른 노드에 맡김
+                    logger.warning("분산락 상실, 페르소나 워밍업 생략", holder=holder)
+                else:
+                    # 4. 인기 페르소나 사전 개인화 (각 페르소나의 첫 독자도 캐시 히트, Batch API 모드면 배치 제출)
+                    # 하트비트 확인과 워밍업 작업 등록 사이에 await가 없어, 이후 락을 잃으면 워밍업 작업도 취소됨
+                    await self._warmup_personas([article['id'] for article in new_articles], tasks)
+            finally:
+                if heartbeat_task:
+                    heartbeat_task.cancel()
             
+            processed = sum(r for r in results if isinstance(r, int))
+            logger.info("팩트 캐시 통계", 
+                       hits=run_stats["hits"], 
+                       misses=run_stats["misses"],
+                       llm_extractions_saved=run_stats["hits"])
             logger.info("배치 처리 완료", processed=processed, total=len(articles))
             return True
             
@@ -255,64 +300,521 @@ class NewsProcessor:
             logger.error("배치 처리 실패", error=str(e))
             return False
     
-    async def generate_personalized(self, article_id: str, user_id: str) -> Dict[str, Any]:
-        """개인화 콘텐츠 생성 (캐시 최적화)"""
+    async def _warmup_personas(self, article_ids: list, tasks: list) -> int:
+        """신규 기사별로 사용자 수 상위 세그먼트(직업 × 읽기 모드) 변형을 미리 생성 (backfill 우선순위 컨텍스트에서 호출)
         
-        # 사용자 프로필 조회 (없으면 스텁 생성)
-        profile = await self.db.get_user_profile(user_id)
-        if not profile:
-            # 스텁 프로필 생성 (user_id 기반 개인화)
-            from ..models.schemas import UserProfile
+        tasks: 하트비트 실패 시 함께 취소할 작업 목록 (워밍업 작업을 추가)
+        """
+        segments = self.warmup_segments() if article_ids else ()
+        if not segments:
+            return 0
+        
+        if settings.llm_batch_enabled:
+            await self.batch_pipeline.submit_personas(article_ids, segments)
+            return 0
+        
+        semaphore = asyncio.Semaphore(max(1, settings.warmup_concurrency))
+        by_mode = self.personas_by_mode(segments)
+        
+        async def _warm(article_id: str) -> int:
+            async with semaphore:
+                generated = 0
+                for reading_mode, personas in by_mode.items():
+                    try:
+                        generated += await self.generate_persona_variants(article_id, reading_mode, personas)
+                    except Exception as e:
+                        logger.warning("페르소나 워밍업 실패", error=str(e), article_id=article_id,
+                                       reading_mode=reading_mode)
+                return generated
+        
+        warm_tasks = [asyncio.create_task(_warm(article_id)) for article_id in article_ids]
+        tasks.extend(warm_tasks)
+        results = await asyncio.gather(*warm_tasks, return_exceptions=True)
+        
+        variants = sum(r for r in results if isinstance(r, int))
+        self.warmup_stats["runs"] += 1
+        self.warmup_stats["articles"] += len(article_ids)
+        self.warmup_stats["variants"] += variants
+        logger.info("페르소나 워밍업 완료", segments=[f"{job}/{mode}" for job, mode in segments],
+                    articles=len(article_ids), variants=variants)
+        return variants
+    
+    def warmup_segments(self) -> Tuple[Tuple[str, str], ...]:
+        """워밍업 대상 (직업, 읽기 모드) 세그먼트 - 사용자 수 상위, 페르소나 프롬프트가 있는 직업만
+        
+        프로필 reading_mode는 캐시 키와 같은 이름으로 정규화해 집계한다 (standard → insight).
+        """
+        if settings.warmup_top_personas <= 0:
+            return ()
+        try:
+            ranked = self.db.count_users_by_segment()
+        except Exception as e:
+            logger.warning("페르소나 사용자 수 조회 실패, 워밍업 생략", error=str(e))
+            return ()
+        counts: Dict[Tuple[str, str], int] = {}
+        for job, reading_mode, users in ranked:
+            if job in PERSONAS and users > 0:
+                key = (job, resolve_mode(reading_mode))
+                counts[key] = counts.get(key, 0) + users
+        ordered = sorted(counts, key=counts.get, reverse=True)
+        return tuple(ordered[:settings.warmup_top_personas])
+    
+    @staticmethod
+    def personas_by_mode(segments: Tuple[Tuple[str, str], ...]) -> Dict[str, Tuple[str, ...]]:
+        """세그먼트 목록 → {읽기 모드: 직업들} (모드별 다중 페르소나 호출 1회로 묶기 위함)"""
+        by_mode: Dict[str, Tuple[str, ...]] = {}
+        for job, reading_mode in segments:
+            by_mode[reading_mode] = by_mode.get(reading_mode, ()) + (job,)
+        return by_mode
+    
+    def _store_article(self, article: Dict[str, Any]) -> bool:
+        """신규 기사 저장 (중복/실패 시 False)"""
+        try:
+            # URL 중복 체크
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM original_articles WHERE url = ?", (article['url'],))
+                if cursor.fetchone():
+                    logger.debug("중복 기사 스킵", url=article['url'][:50])
+                    return False
             
-            # user_id 기반으로 다른 스텁 프로필 생성
-            if "investor" in user_id.lower() or "투자자" in user_id:
-                job, interests = "투자자", ["투자", "경제", "증시"]
-            elif "entrepreneur" in user_id.lower() or "사업가" in user_id:
-                job, interests = "사업가", ["창업", "경영", "마케팅"] 
-            elif "worker" in user_id.lower() or "직장인" in user_id:
-                job, interests = "직장인", ["직장생활", "승진", "업무효율"]
-            else:
-                job, interests = "일반", ["뉴스", "시사", "정보"]
+            # 기사 저장
+            if not self.db.save_article(article):
+                logger.debug("기사 저장 스킵 (중복)", article_id=article['id'])
+                return False
+            return True
             
-            profile = UserProfile(
-                user_id=user_id,
-                age=30,
-                gender="other", 
-                location="Seoul",
-                job_categories=[job],
-                interests_finance=interests,
-                interests_lifestyle=["뉴스"],
-                interests_hobby=["독서"],
-                interests_tech=["AI"],
-                work_style="commute",
-                family_status="single",
-                living_situation="alone",
-                reading_mode="insight",
-                created_at=str(datetime.now()),
-                updated_at=str(datetime.now())
+        except Exception as e:
+            logger.error("기사 저장 실패", 
+                        error=str(e), 
+                        article_id=article.get('id'))
+            return False
+    
+    async def _extract_chunk(self, chunk: list, semaphore: asyncio.Semaphore, run_stats: Dict[str, int]) -> int:
+        """기사 묶음 팩트 추출 및 저장 (저장 실패는 기사 단위로 격리), 처리 건수 반환"""
+        digests = {article['id']: content_digest(article['title'], article['content']) for article in chunk}
+        
+        # 본문 다이제스트 캐시 확인 (재발행/신디케이션 기사는 LLM 추출 생략)
+        facts_by_id: Dict[str, ExtractedFacts] = {}
+        for article in chunk:
+            try:
+                cached = self.db.get_facts_by_content_hash(digests[article['id']])
+            except Exception as e:
+                logger.warning("팩트 캐시 조회 실패", error=str(e), article_id=article['id'])
+                cached = None
+            key = "hits" if cached else "misses"
+            run_stats[key] += 1
+            self.facts_cache_stats[key] += 1
+            if cached:
+                facts_by_id[article['id']] = cached
+        
+        pending = [article for article in chunk if article['id'] not in facts_by_id]
+        if pending:
+            async with semaphore:
+                if len(pending) == 1:
+                    facts_list = [await self.ai_engine.extract_facts(pending[0])]
+                else:
+                    facts_list = await self.ai_engine.extract_facts_batch(pending)
+            facts_by_id.update((article['id'], facts) for article, facts in zip(pending, facts_list))
+        
+        processed = 0
+        for article in chunk:
+            facts = facts_by_id[article['id']]
+            try:
+                self.store_facts(article, facts, digests[article['id']])
+                processed += 1
+                logger.info("기사 처리 완료", title=article['title'][:30])
+            except Exception as e:
+                logger.error("기사 처리 실패", 
+                            error=str(e), 
+                            article_id=article.get('id'))
+        return processed
+    
+    def store_facts(self, article: Dict[str, Any], facts: ExtractedFacts, digest: Optional[str] = None) -> None:
+        """추출한 팩트 저장 (추출 실패(제목만 있는 폴백) 결과는 다이제스트 캐시에 올리지 않음)"""
+        if self._is_fallback_facts(facts):
+            content_hash = None
+        else:
+            content_hash = digest or content_digest(article['title'], article['content'])
+        self.db.save_facts(article['id'], facts, content_hash)
+    
+    @staticmethod
+    def _is_fallback_facts(facts: ExtractedFacts) -> bool:
+        """extract_facts 실패 시 반환되는 제목-only 팩트인지"""
+        return not (facts.who or facts.when or facts.where or facts.why or facts.how or
+                    facts.numbers or facts.quotes or facts.verified_facts)
+    
+    async def _heartbeat_loop(self, holder: str, tasks: list) -> None:
+        """배치 처리 중 분산락 하트비트 유지 (실패 시 남은 작업 취소)"""
+        interval = max(1.0, settings.collect_lock_ttl / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not await self.distributed_lock.update_heartbeat("news_collector", holder):
+                logger.error("락 하트비트 실패, 처리 중단")
+                for task in tasks:
+                    task.cancel()
+                return
+    
+    async def generate_personalized(self, article_id: str, user_id: str,
+                                    tenant: Optional[str] = None,
+                                    sla_seconds: Optional[float] = None,
+                                    reading_mode: Optional[str] = None) -> Dict[str, Any]:
+        """개인화 콘텐츠 생성 (캐시 최적화)
+        
+        tenant: 공정 큐잉 단위 (미지정 시 user_id 접두사)
+        sla_seconds: 이 시간 안에 LLM 생성이 끝나지 않으면 템플릿 결과를 먼저 반환 (None이면 완료까지 대기)
+        reading_mode: 미지정 시 프로필의 reading_mode - 모드별로 생성 예산과 캐시가 분리된다
+        """
+        tenant = tenant or tenant_key(None, user_id)
+        profile = await self._resolve_profile(user_id)
+        reading_mode = resolve_mode(reading_mode or profile.reading_mode)
+        return await self._personalize(article_id, user_id, profile, tenant, sla_seconds, reading_mode)
+    
+    async def generate_progressive(self, article_id: str, user_id: str,
+                                   tenant: Optional[str] = None,
+                                   sla_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """점진적 개인화: brief를 동기 생성해 먼저 반환하고 프로필 모드 본문은 백그라운드에서 생성
+        
+        본문이 이미 캐시에 있으면 그대로 반환한다. brief 응답에는 pending=True가 붙고,
+        완성된 본문은 get_personalized_result()(GET /personalize/{article_id})로 조회한다.
+        프로필 모드가 brief보다 짧으면(예산 기준) 점진 단계 없이 바로 생성한다.
+        """
+        tenant = tenant or tenant_key(None, user_id)
+        profile = await self._resolve_profile(user_id)
+        reading_mode = resolve_mode(profile.reading_mode)
+        if budget_for(reading_mode).max_tokens <= budget_for("brief").max_tokens:
+            return await self._personalize(article_id, user_id, profile, tenant, sla_seconds, reading_mode)
+        
+        segment, content_id = self._cache_keys(article_id, profile, reading_mode)
+        facts_version = self._facts_version(article_id)
+        
+        full = self.pc_cache.get(content_id, article_id, _segment_owner(segment), segment, facts_version,
+                                 reading_mode)
+        if full:
+            logger.info("개인화 캐시 히트", cache_id=content_id, user_id=user_id[:10], progressive=True)
+            full['cached'] = True
+            return full
+        
+        # 본문을 먼저 띄워 brief와 병렬로 생성 (brief 응답 후에도 계속)
+        self._schedule_background(article_id, user_id, profile, segment, content_id, facts_version, tenant,
+                                  reading_mode, self.progressive_stats)
+        brief = await self._personalize(article_id, user_id, profile, tenant, sla_seconds, "brief")
+        brief['pending'] = True
+        return brief
+    
+    async def get_personalized_result(self, article_id: str, user_id: str,
+                                      reading_mode: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """캐시에 있는 최신 개인화 결과 조회 (LLM 호출 없음, 모드 미지정 시 프로필 모드)
+        
+        반환: (콘텐츠 또는 None, 백그라운드 생성 진행 중 여부)
+        """
+        profile = await self._resolve_profile(user_id)
+        reading_mode = resolve_mode(reading_mode or profile.reading_mode)
+        segment, content_id = self._cache_keys(article_id, profile, reading_mode)
+        facts_version = self._facts_version(article_id)
+        
+        content = self.pc_cache.get(content_id, article_id, _segment_owner(segment), segment,
+                                    facts_version, reading_mode)
+        if content:
+            content['cached'] = True
+            return content, False
+        return None, (article_id, segment, facts_version) in self._background
+    
+    async def _personalize(self, article_id: str, user_id: str, profile: UserProfile, tenant: str,
+                           sla_seconds: Optional[float], reading_mode: str) -> Dict[str, Any]:
+        """캐시 조회 → stale 응답 → (SLA 내) 생성 순서로 개인화 결과 반환"""
+        segment, content_id = self._cache_keys(article_id, profile, reading_mode)
+        facts_version = self._facts_version(article_id)
+        
+        # 캐시 조회 (L1 LRU → L2 SQLite)
+        cached_content = self.pc_cache.get(content_id, article_id, _segment_owner(segment), segment,
+                                           facts_version, reading_mode)
+        if cached_content:
+            logger.info("개인화 캐시 히트", cache_id=content_id, user_id=user_id[:10])
+            self._remember_segment(user_id, segment, reading_mode)
+            cached_content['cached'] = True
+            return cached_content
+        
+        # 이전 프로필/팩트 버전으로 만든 콘텐츠가 있으면 즉시 응답하고 백그라운드에서 재생성
+        if settings.pc_stale_while_revalidate:
+            stale = self._get_stale(article_id, user_id, segment, reading_mode)
+            if stale:
+                self._schedule_background(article_id, user_id, profile, segment, content_id, facts_version, tenant,
+                                          reading_mode, self.revalidate_stats)
+                logger.info("개인화 stale 응답, 백그라운드 재생성", cache_id=content_id, user_id=user_id[:10])
+                stale['cached'] = True
+                stale['stale'] = True
+                return stale
+        
+        if sla_seconds:
+            personalized = await self._generate_within_sla(
+                article_id, user_id, profile, segment, content_id, facts_version, tenant, sla_seconds, reading_mode
             )
-            logger.info("스텁 프로필 생성", user_id=user_id[:10])
-        
-        # 프로필 해시를 포함한 캐시 키 생성 (reading_mode 제거)
-        profile_data = {
-            "job_categories": profile.job_categories,
-            "interests": (
-                profile.interests_finance + profile.interests_lifestyle +
-                profile.interests_hobby + profile.interests_tech
-            )[:10],  # MAX_INTERESTS
-            "age": profile.age,
-            "updated_at": profile.updated_at
-        }
+        else:
+            personalized = await self._generate_and_cache(
+                article_id, user_id, profile, segment, content_id, facts_version, tenant, reading_mode
+            )
+        if self.pc_cache.is_cacheable(personalized):
+            self._remember_segment(user_id, segment, reading_mode)
+        personalized['cached'] = False
+        return personalized
+    
+    def _remember_segment(self, user_id: str, segment: str, reading_mode: str) -> None:
+        """사용자가 최신 결과를 받은 세그먼트 기록 (L1과 같은 크기 제한의 LRU)"""
+        self._last_segments[user_id] = (segment, reading_mode)
+        self._last_segments.move_to_end(user_id)
+        while len(self._last_segments) > settings.pc_cache_max_entries:
+            self._last_segments.popitem(last=False)
+    
+    def _get_stale(self, article_id: str, user_id: str, segment: str, reading_mode: str) -> Optional[Dict[str, Any]]:
+        """stale 엔트리 조회 - 같은 세그먼트(팩트 재추출)가 없으면 사용자의 이전 세그먼트(프로필 수정)"""
+        stale = self.pc_cache.get_stale(article_id, _segment_owner(segment), reading_mode)
+        previous = self._last_segments.get(user_id)
+        if stale is None and previous and previous != (segment, reading_mode):
+            stale = self.pc_cache.get_stale(article_id, _segment_owner(previous[0]), previous[1])
+        return stale
+    
+    async def _generate_within_sla(self, article_id: str, user_id: str, profile: UserProfile, segment: str,
+                                   content_id: str, facts_version: Optional[str], tenant: str,
+                                   sla_seconds: float, reading_mode: str = "insight") -> Dict[str, Any]:
+        """SLA 안에 끝나면 LLM 결과, 아니면 템플릿 결과 반환 후 LLM 생성은 백그라운드에서 완료해 캐시에 저장
+        
+        SLA 안의 생성은 요청 데드라인(클램프/brief 축소)을 그대로 따르고, SLA를 넘겨 응답과 분리된 뒤에는
+        personalize_background_deadline_seconds 안에서 마무리한다.
+        """
+        with deadline_scope(settings.personalize_background_deadline_seconds) as scope:
+            task = asyncio.create_task(self._generate_and_cache(
+                article_id, user_id, profile, segment, content_id, facts_version, tenant, reading_mode
+            ))
+        left = deadline.remaining()
+        timeout = sla_seconds if left is None else max(0.0, min(sla_seconds, left))
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        if done:
+            self.sla_stats["met"] += 1
+            return task.result()
+        
+        self.sla_stats["fallback"] += 1
+        # 응답과 분리: 요청 데드라인 대신 자체 데드라인 (이미 진행 중인 호출의 타임아웃은 그대로)
+        scope.detach(settings.personalize_background_deadline_seconds)
+        # get_personalized_result가 진행 중(202)으로 보도록 백그라운드 목록에 등록
+        key = (article_id, segment, facts_version)
+        self._background.setdefault(key, task)
+        self._sla_tasks.add(task)
+        task.add_done_callback(lambda t: self._on_sla_task_done(t, key))
+        
+        facts, original_title = await self._load_article_context(article_id)
+        primary_job = primary_job_of(profile)
+        fallback = render_personalized(facts, primary_job, original_title, reading_mode=reading_mode)
+        fallback['pending'] = True
+        logger.info("개인화 SLA 초과, 템플릿 응답 후 백그라운드 생성 계속",
+                    article_id=article_id, user_id=user_id[:10], sla_seconds=sla_seconds)
+        return fallback
+    
+    def _on_sla_task_done(self, task: asyncio.Task, key: Tuple[str, str, Optional[str]]) -> None:
+        """SLA 초과 후 백그라운드 생성 완료 집계"""
+        self._sla_tasks.discard(task)
+        if self._background.get(key) is task:
+            del self._background[key]
+        if task.cancelled() or task.exception() is not None:
+            self.sla_stats["failed"] += 1
+            if not task.cancelled():
+                logger.warning("개인화 백그라운드 생성 실패", error=str(task.exception()))
+        else:
+            self.sla_stats["completed"] += 1
+    
+    async def _generate_and_cache(self, article_id: str, user_id: str, profile: UserProfile, segment: str,
+                                  content_id: str, facts_version: Optional[str], tenant: str,
+                                  reading_mode: str = "insight") -> Dict[str, Any]:
+        """LLM 개인화 생성 후 캐시 저장 (동일 기사/세그먼트/팩트 버전 동시 요청은 병합)"""
+        async def _run():
+            # LLM 생성 슬롯은 테넌트별 공정 큐를 거쳐 배정
+            async with fair_queue.slot(tenant):
+                return await self._generate(article_id, profile, reading_mode)
+        
+        # 동일 기사/세그먼트 동시 요청은 한 번만 생성 (푸시 직후 버스트 대응, 사용자가 달라도 병합)
+        personalized = await self.personalize_flight.do((article_id, segment, facts_version), _run)
+        personalized = dict(personalized)
+        
+        # 캐시 저장 (폴백/스텁 결과는 제외)
+        self.pc_cache.put(content_id, article_id, _segment_owner(segment), segment, personalized,
+                          facts_version, reading_mode)
+        
+        logger.info("개인화 콘텐츠 생성 완료", 
+                   cache_id=content_id, 
+                   user_id=user_id[:10],
+                   reading_mode=reading_mode)
+        return personalized
+    
+    def _schedule_background(self, article_id: str, user_id: str, profile: UserProfile, segment: str,
+                             content_id: str, facts_version: Optional[str], tenant: str,
+                             reading_mode: str, stats: Dict[str, int]) -> None:
+        """응답과 분리된 백그라운드 생성 (stale 재생성, 점진적 insight - 같은 버전은 1회만)"""
+        key = (article_id, segment, facts_version)
+        if key in self._background:
+            return
+        
+        async def _run():
+            # 사용자 요청 데드라인과 분리, 사전 생성 우선순위로 실행
+            with llm_priority(PRECOMPUTE), deadline_scope(None):
+                try:
+                    await self._generate_and_cache(article_id, user_id, profile, segment, content_id,
+                                                   facts_version, tenant, reading_mode)
+                    stats["completed"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.warning("개인화 백그라운드 생성 실패", error=str(e), article_id=article_id,
+                                   reading_mode=reading_mode)
+                finally:
+                    self._background.pop(key, None)
+        
+        stats["scheduled"] += 1
+        self._background[key] = asyncio.create_task(_run())
+    
+    async def generate_persona_variants(self, article_id: str, reading_mode: str = "insight",
+                                        personas: Tuple[str, ...] = PERSONAS) -> int:
+        """고정 페르소나(직업) 변형을 LLM 1회 호출로 생성해 캐시에 채움 (이미 캐시된 페르소나 제외)
+        
+        반환: 새로 생성한 변형 수
+        """
+        personas = self.missing_personas(article_id, personas, reading_mode)
+        if not personas:
+            return 0
+        
+        facts, original_title = await self._load_article_context(article_id)
+        variants = await self.ai_engine.rewrite_for_personas(facts, original_title, personas, reading_mode)
+        self.store_persona_variants(article_id, variants, reading_mode)
+        
+        self.persona_stats["batches"] += 1
+        self.persona_stats["variants"] += len(variants)
+        logger.info("페르소나 변형 일괄 생성 완료", article_id=article_id, personas=list(variants),
+                    reading_mode=reading_mode)
+        return len(variants)
+    
+    def missing_personas(self, article_id: str, personas: Tuple[str, ...] = PERSONAS,
+                         reading_mode: str = "insight") -> Tuple[str, ...]:
+        """현재 팩트 버전으로 캐시되지 않은 페르소나"""
+        facts_version = self._facts_version(article_id)
+        missing = []
+        for job in personas:
+            segment, content_id = self._segment_keys(article_id, job, reading_mode)
+            if not self.pc_cache.get(content_id, article_id, _segment_owner(segment), segment,
+                                     facts_version, reading_mode):
+                missing.append(job)
+        return tuple(missing)
+    
+    def store_persona_variants(self, article_id: str, variants: Dict[str, Dict[str, Any]],
+                               reading_mode: str = "insight") -> None:
+        """페르소나 변형을 해당 직업 세그먼트의 캐시 엔트리로 저장"""
+        facts_version = self._facts_version(article_id)
+        for job, variant in variants.items():
+            segment, content_id = self._segment_keys(article_id, job, reading_mode)
+            self.pc_cache.put(content_id, article_id, _segment_owner(segment), segment, variant,
+                              facts_version, reading_mode)
+    
+    def _facts_version(self, article_id: str) -> Optional[str]:
+        """현재 팩트 버전 (조회 실패 시 None)"""
+        try:
+            return self.db.get_facts_version(article_id)
+        except Exception as e:
+            logger.warning("팩트 버전 조회 실패", error=str(e), article_id=article_id)
+            return None
+    
+    async def stream_personalized(self, article_id: str, user_id: str, tenant: Optional[str] = None):
+        """개인화 콘텐츠 스트리밍 생성
+        
+        캐시 히트면 done 이벤트 하나만, 아니면 token 이벤트들 뒤에 done 이벤트를 yield한다.
+        완성된 본문은 generate_personalized와 동일하게 캐시/로깅된다.
+        """
+        tenant = tenant or tenant_key(None, user_id)
+        profile = await self._resolve_profile(user_id)
+        reading_mode = resolve_mode(profile.reading_mode)
+        segment, content_id = self._cache_keys(article_id, profile, reading_mode)
+        facts_version = self._facts_version(article_id)
+        
+        cached_content = self.pc_cache.get(content_id, article_id, _segment_owner(segment), segment,
+                                           facts_version, reading_mode)
+        if cached_content:
+            logger.info("개인화 캐시 히트", cache_id=content_id, user_id=user_id[:10], stream=True)
+            cached_content['cached'] = True
+            yield {"type": "done", "result": cached_content}
+            return
+        
+        facts, original_title = await self._load_article_context(article_id)
+        
+        async with fair_queue.slot(tenant):
+            async for event in self.ai_engine.stream_rewrite_for_user(facts, profile, original_title, reading_mode):
+                if event["type"] != "done":
+                    yield event
+                    continue
+                
+                personalized = event["result"]
+                self.pc_cache.put(content_id, article_id, _segment_owner(segment), segment, personalized,
+                                  facts_version, reading_mode)
+                
+                logger.info("개인화 콘텐츠 생성 완료", 
+                           cache_id=content_id, 
+                           user_id=user_id[:10],
+                           stream=True)
+                
+                personalized['cached'] = False
+                yield {"type": "done", "result": personalized}
+    
+    async def _resolve_profile(self, user_id: str) -> UserProfile:
+        """사용자 프로필 조회 (없으면 스텁 생성)"""
+        profile = await self.db.get_user_profile(user_id)
+        if profile:
+            return profile
         
-        ph = profile_hash(profile_data)
-        cache_key = f"{article_id}_{user_id}_{ph}"
-        content_id = hashlib.blake2s(cache_key.encode(), digest_size=12).hexdigest()
+        # 스텁 프로필 생성 (user_id 기반 개인화)
+        # user_id 기반으로 다른 스텁 프로필 생성
+        if "investor" in user_id.lower() or "투자자" in user_id:
+            job, interests = "투자자", ["투자", "경제", "증시"]
+        elif "entrepreneur" in user_id.lower() or "사업가" in user_id:
+            job, interests = "사업가", ["창업", "경영", "마케팅"] 
+        elif "worker" in user_id.lower() or "직장인" in user_id:
+            job, interests = "직장인", ["직장생활", "승진", "업무효율"]
+        else:
+            job, interests = "일반", ["뉴스", "시사", "정보"]
         
-        # 캐시 완전 비활성화 (테스트용)
-        cached_content = None
-        # if cached_content:
+        profile = UserProfile(
+            user_id=user_id,
+            age=30,
+            gender="other", 
+            location="Seoul",
+            job_categories=[job],
+            interests_finance=interests,
+            interests_lifestyle=["뉴스"],
+            interests_hobby=["독서"],
+            interests_tech=["AI"],
+            work_style="commute",
+            family_status="single",
+            living_situation="alone",
+            reading_mode="insight",
+            # 스텁은 고정 타임스탬프 사용 (profile_hash가 매 요청 바뀌면 캐시 불가)
+            created_at="",
+            updated_at=""
+        )
+        logger.info("스텁 프로필 생성", user_id=user_id[:10])
+        return profile
+    
+    @classmethod
+    def _cache_keys(cls, article_id: str, profile: UserProfile, reading_mode: str = "insight") -> Tuple[str, str]:
+        """사용자 프로필의 세그먼트 키와 캐시 ID"""
+        return cls._segment_keys(article_id, primary_job_of(profile), reading_mode)
+    
+    @staticmethod
+    def _segment_keys(article_id: str, primary_job: str, reading_mode: str = "insight") -> Tuple[str, str]:
+        """세그먼트 키와 캐시 ID 생성
         
-        # 팩트와 원본 기사 조회
+        세그먼트는 개인화 프롬프트에 실제로 들어가는 필드(prompt_segment)만 해시하므로,
+        프롬프트가 같은 사용자끼리는 캐시와 동시 요청 병합을 공유한다.
+        """
+        segment = profile_hash(prompt_segment(primary_job, reading_mode))
+        content_id = hashlib.blake2s(f"{article_id}_{segment}".encode(), digest_size=12).hexdigest()
+        return segment, content_id
+    
+    async def _load_article_context(self, article_id: str) -> Tuple[ExtractedFacts, str]:
+        """팩트와 원본 기사 제목 조회"""
         facts = await self.db.get_facts(article_id)
         if not facts:
             raise ValueError("팩트를 찾을 수 없습니다")
@@ -325,23 +827,14 @@ class NewsProcessor:
             async with conn.execute('SELECT title FROM original_articles WHERE id = ?', (article_id,)) as cursor:
                 row = await cursor.fetchone()
                 original_title = row['title'] if row else facts.what
+        return facts, original_title
+    
+    async def _generate(self, article_id: str, profile: UserProfile, reading_mode: str = "insight") -> Dict[str, Any]:
+        """팩트/원본 제목 조회 후 LLM 개인화 실행"""
+        facts, original_title = await self._load_article_context(article_id)
         
         # 원본 ai_engine으로 되돌림 (정확한 구현)
-        personalized = await self.ai_engine.rewrite_for_user(facts, profile, original_title)
-        
-        # 캐시 저장 비활성화
-        # self.db.save_personalized_content(content_id, article_id, user_id, ph, personalized)
-        
-        logger.info("개인화 콘텐츠 생성 완료", 
-                   cache_id=content_id, 
-                   user_id=user_id[:10])
-        
-        personalized['cached'] = False
-        
-        # 캐시 저장 완전 비활성화 (테스트용)
-        # self.db.save_personalized_content(content_id, article_id, user_id, ph, personalized)
-        
-        return personalized
+        return await self.ai_engine.rewrite_for_user(facts, profile, original_title, reading_mode)
     
     async def health_check(self) -> Dict[str, bool]:
         """전체 시스템 상태 확인"""
@@ -349,7 +842,7 @@ class NewsProcessor:
             "database": await self.db.health_check(),
             "ai_engine": await self.ai_engine.health_check(),
             "news_collector": await self.collector.health_check(),
-            "cache": True  # 캐시 제거됨
+            "cache": True  # 인프로세스 LRU + SQLite
         }
         
         logger.info("헬스체크 완료", checks=checks)
@@ -0,0 +1,198 @@
+"""
+제공자 측 레이트 리미터 (provider/model별 요청·토큰 분당 한도)
+- 요청/토큰 버킷 2개를 지연 보충 방식으로 유지 (acquire당 O(1), 리스트 재구성 없음)
+- 잔량을 먼저 예약(차감)하고 부족분만큼만 대기 → 도착 순서대로 대기 시간이 늘어나 락 없이 FIFO 공정성 보장
+- 백그라운드 우선순위는 잔량이 예약분(용량 × (1 - 클래스 최대 비율)) 위일 때만 통과 → interactive 몫 보존
+- OpenAI/Groq 응답의 x-ratelimit-* 헤더로 용량/잔량을 동기화, 429의 retry-after 반영
+  (Groq의 요청 헤더는 일 단위(RPD)라 분당 요청 버킷에는 쓰지 않고, 일 한도 소진 시 리셋까지 대기만 반영)
+"""
+import asyncio
+import re
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from .concurrency import current_priority, max_share
+
+logger = get_logger("rate_limits")
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# x-ratelimit-*-requests 헤더가 분당이 아닌 일 단위 한도인 제공자
+_DAILY_REQUEST_HEADERS = ("groq",)
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 값 파싱 ("1s", "6m0s", "20ms", "7.66s") → 초"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(num) * _UNIT_SECONDS[unit] for num, unit in parts)
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """분당 용량 토큰 버킷 (잔량이 음수면 그만큼 선예약된 상태)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.level = self.capacity
+        self._updated = monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float, floor: float = 0.0) -> float:
+        """amount 예약 후 필요한 대기 시간(초) 반환 (잔량이 floor 위로 회복될 때까지)"""
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, (floor - self.level) / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """취소된 예약 반환"""
+        self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+    def sync(self, limit: Optional[int], remaining: Optional[int], reset: Optional[float], now: float) -> None:
+        """응답 헤더 기준 동기화 (제공자 잔량이 더 적으면 그쪽을 신뢰)"""
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is None:
+            return
+        if remaining <= 0 and reset:
+            # 소진 → 리셋 시각까지 대기하도록 잔량을 음수로
+            self.level = min(self.level, -reset * self.rate)
+        else:
+            self.level = min(self.level, float(remaining))
+
+    def pause(self, seconds: float, now: float) -> None:
+        """지정 시간 동안 신규 예약이 대기하도록 설정 (429 retry-after)"""
+        self._refill(now)
+        self.level = min(self.level, -seconds * self.rate)
+
+
+class ProviderRateLimiter:
+    """provider/model 1개에 대한 요청·토큰 한도"""
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self.requests = TokenBucket(settings.rate_limit_per_minute)
+        self.tokens = TokenBucket(settings.llm_tokens_per_minute)
+        self.synced = False
+        self._stats = {"acquired": 0, "waited": 0, "wait_total": 0.0, "rate_limited": 0}
+
+    async def acquire(self, tokens: int, priority: Optional[str] = None) -> None:
+        """요청 1건 + 예상 토큰 예약 후 필요 시 대기"""
+        now = monotonic()
+        reserved = 1.0 - max_share(priority or current_priority())
+        wait = max(self.requests.reserve(1, now, self.requests.capacity * reserved),
+                   self.tokens.reserve(tokens, now, self.tokens.capacity * reserved))
+        self._stats["acquired"] += 1
+        if wait <= 0:
+            return
+        self._stats["waited"] += 1
+        self._stats["wait_total"] += wait
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.requests.refund(1)
+            self.tokens.refund(tokens)
+            raise
+
+    def observe(self, status_code: int, headers) -> None:
+        """응답 헤더 반영"""
+        now = monotonic()
+        if "x-ratelimit-remaining-requests" in headers or "x-ratelimit-remaining-tokens" in headers:
+            self.synced = True
+            remaining_requests = _int_header(headers, "x-ratelimit-remaining-requests")
+            reset_requests = parse_reset(headers.get("x-ratelimit-reset-requests"))
+            if self.provider not in _DAILY_REQUEST_HEADERS:
+                self.requests.sync(_int_header(headers, "x-ratelimit-limit-requests"),
+                                   remaining_requests, reset_requests, now)
+            elif remaining_requests is not None and remaining_requests <= 0 and reset_requests:
+                # 일 한도 소진 → 리셋까지 신규 요청 대기 (용량/보충 속도는 분당 설정값 유지)
+                self.requests.pause(reset_requests, now)
+            self.tokens.sync(_int_header(headers, "x-ratelimit-limit-tokens"),
+                             _int_header(headers, "x-ratelimit-remaining-tokens"),
+                             parse_reset(headers.get("x-ratelimit-reset-tokens")), now)
+        if status_code == 429:
+            self._stats["rate_limited"] += 1
+            retry_after = parse_reset(headers.get("retry-after"))
+            if retry_after:
+                self.requests.pause(retry_after, now)
+                logger.warning("제공자 레이트 리밋 도달", provider=self.provider, model=self.model,
+                               retry_after=retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        """한도 통계"""
+        return {
+            "synced_from_headers": self.synced,
+            "requests_per_minute": int(self.requests.capacity),
+            "tokens_per_minute": int(self.tokens.capacity),
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level, 1),
+            "acquired": self._stats["acquired"],
+            "waited": self._stats["waited"],
+            "rate_limited": self._stats["rate_limited"],
+            "avg_wait_ms": round(self._stats["wait_total"] / self._stats["waited"] * 1000, 1)
+            if self._stats["waited"] else 0.0
+        }
+
+
+# (provider, model) → 리미터
+_limiters: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+
+
+def _normalize(provider: str) -> str:
+    return "groq" if provider.startswith("groq") else "openai"
+
+
+def limiter_for(provider: str, model: str) -> ProviderRateLimiter:
+    """provider/model별 공유 리미터"""
+    key = (_normalize(provider), model)
+    if key not in _limiters:
+        _limiters[key] = ProviderRateLimiter(*key)
+    return _limiters[key]
+
+
+def estimate_tokens(messages: list, max_tokens: int) -> int:
+    """요청 토큰 추정 (프롬프트 글자 수 기반 + 응답 최대 토큰)"""
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 2 + (max_tokens or 0)
+
+
+async def acquire(provider: str, model: str, messages: list, max_tokens: int) -> None:
+    """LLM 호출 전 제공자 한도 예약"""
+    await limiter_for(provider, model).acquire(estimate_tokens(messages, max_tokens))
+
+
+def observe(provider: str, model: str, status_code: int, headers) -> None:
+    """LLM 응답 헤더 반영 (llm_clients 응답 훅에서 호출)"""
+    limiter_for(provider, model).observe(status_code, headers)
+
+
+def stats() -> Dict[str, Any]:
+    """전체 리미터 통계"""
+    return {f"{provider}/{model}": limiter.stats() for (provider, model), limiter in _limiters.items()}
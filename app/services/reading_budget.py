@@ -0,0 +1,118 @@
+"""
+읽기 모드별 생성 예산 (프롬프트 분량 지시 / max_tokens / 스키마 minLength를 한 표에서 결정)
+출력 길이가 LLM 지연의 가장 큰 요인이므로, 모든 생성 경로(run_personalize, 스키마 호출,
+다중 페르소나, 템플릿 폴백)가 같은 표를 보고 분량을 맞춘다. 모드별 지연/분량 지표도 여기서 집계한다.
+"""
+import copy
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from ..models.schemas import REWRITE_SCHEMA
+
+# 본문 1자당 응답 토큰 상한 (한국어 출력 기준 여유 포함, 모든 모드 공통 - 짧은 모드도 문장 중간에 잘리지 않도록)
+TOKENS_PER_CHAR = 1.15
+
+
+@dataclass(frozen=True)
+class ReadingBudget:
+    """읽기 모드 1개의 생성 예산"""
+    style: str  # 출력 형식 지시
+    min_chars: int  # 본문 최소 글자 수 (스키마 minLength)
+    max_chars: int  # 본문 최대 글자 수 (스키마 maxLength)
+    reading_time: str
+    compact: bool = False  # 인용/체크리스트 등 부가 문단 생략 (템플릿 렌더러)
+
+    @property
+    def max_tokens(self) -> int:
+        """응답 토큰 상한 (max_chars × TOKENS_PER_CHAR, 50 단위 올림)"""
+        return math.ceil(self.max_chars * TOKENS_PER_CHAR / 50) * 50
+
+    @property
+    def length_instruction(self) -> str:
+        return f"{self.min_chars}~{self.max_chars}자"
+
+
+# 사용자 프로필 reading_mode(quick/standard/deep/detailed) + 점진적 개인화 1차 응답(brief)
+READING_BUDGETS: Dict[str, ReadingBudget] = {
+    "brief": ReadingBudget("4~6문장 간결 기사", 300, 600, "1분", compact=True),
+    "quick": ReadingBudget("3~4문단 요약 기사", 400, 800, "1분", compact=True),
+    "standard": ReadingBudget("5~8문단 심층 기사", 600, 1000, "2분"),
+    "deep": ReadingBudget("8~10문단 심층 분석 기사", 1200, 1800, "3분"),
+    "detailed": ReadingBudget("10~12문단 상세 해설 기사", 2000, 2800, "4분"),
+}
+
+# 캐시 키/응답에 쓰는 모드 이름 (standard는 기존 이름 insight로 저장)
+_MODE_KEYS = {"standard": "insight"}
+_BUDGET_KEYS = {"insight": "standard"}
+
+# 캐시 키로 쓸 수 있는 모드 이름 (사전 생성 API 검증용)
+READING_MODES = tuple(_MODE_KEYS.get(mode, mode) for mode in READING_BUDGETS)
+
+# 모드별 최근 지연 표본 수
+_WINDOW = 200
+
+
+def resolve_mode(mode: Optional[str]) -> str:
+    """프로필/요청 reading_mode → 캐시 키용 모드 이름 (알 수 없으면 insight)"""
+    mode = (mode or "insight").lower()
+    mode = _MODE_KEYS.get(mode, mode)
+    return mode if mode in READING_MODES else "insight"
+
+
+def budget_for(mode: Optional[str]) -> ReadingBudget:
+    """모드별 생성 예산 (알 수 없으면 standard)"""
+    mode = resolve_mode(mode)
+    return READING_BUDGETS[_BUDGET_KEYS.get(mode, mode)]
+
+
+def rewrite_schema(mode: Optional[str]) -> Dict[str, Any]:
+    """본문 길이 제약을 모드 예산에 맞춘 REWRITE_SCHEMA"""
+    budget = budget_for(mode)
+    schema = copy.deepcopy(REWRITE_SCHEMA)
+    schema["properties"]["content"].update(minLength=budget.min_chars, maxLength=budget.max_chars)
+    return schema
+
+
+_latencies: Dict[str, Deque[float]] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def record(mode: Optional[str], latency: float, chars: int) -> None:
+    """LLM 생성 1건의 지연(초)/본문 글자 수 기록"""
+    mode = resolve_mode(mode)
+    _latencies.setdefault(mode, deque(maxlen=_WINDOW)).append(latency)
+    counters = _stats.setdefault(mode, {"count": 0, "chars_total": 0, "under_min": 0})
+    counters["count"] += 1
+    counters["chars_total"] += chars
+    if chars < budget_for(mode).min_chars:
+        counters["under_min"] += 1
+
+
+def _percentile(ordered: list, q: float) -> float:
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def stats() -> Dict[str, Any]:
+    """모드별 예산과 지연/분량 지표 (분량-지연 트레이드오프 확인용)"""
+    result = {}
+    for mode in READING_MODES:
+        budget = budget_for(mode)
+        entry = {
+            "max_tokens": budget.max_tokens,
+            "target_chars": budget.length_instruction,
+            "count": 0
+        }
+        recorded = _stats.get(mode)
+        if recorded:
+            ordered = sorted(_latencies[mode])
+            entry.update(
+                count=int(recorded["count"]),
+                avg_chars=round(recorded["chars_total"] / recorded["count"]),
+                under_min=int(recorded["under_min"]),
+                p50_ms=round(_percentile(ordered, 0.5) * 1000, 1),
+                p95_ms=round(_percentile(ordered, 0.95) * 1000, 1)
+            )
+        result[mode] = entry
+    return result
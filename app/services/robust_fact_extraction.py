@@ -3,9 +3,11 @@
 """
 import json
 import asyncio
-from openai import AsyncOpenAI
 from ..core.logging import get_logger
-from ..core.config import settings
+from ..utils.helpers import retry_budget
+from . import rate_limits
+from .concurrency import limiter_for
+from .llm_clients import get_openai_client
 
 logger = get_logger("fact_extraction")
 
@@ -20,25 +22,27 @@ async def extract_facts(text: str):
     
     user_prompt = f"다음 기사에서 5W1H를 추출해. 반드시 JSON만 출력:\n{text[:2000]}"
     
-    oai = AsyncOpenAI(
-        api_key=settings.openai_api_key,
-        timeout=20
-    )
+    oai = get_openai_client()
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user_prompt}
+    ]
     
     last_error = None
     
-    # 3회 재시도
+    # 3회 재시도 (전역 재시도 예산 안에서)
+    retry_budget.record_attempt()
     for attempt in range(3):
         try:
-            r = await oai.chat.completions.create(
-                model="gpt-4o-mini",
-                response_format={"type": "json_object"},  # JSON 강제
-                temperature=0,  # 일관된 결과
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": user_prompt}
-                ],
-            )
+            await rate_limits.acquire("openai", "gpt-4o-mini", messages, 0)
+            async with limiter_for("openai").slot():
+                r = await oai.chat.completions.create(
+                    model="gpt-4o-mini",
+                    timeout=20,
+                    response_format={"type": "json_object"},  # JSON 강제
+                    temperature=0,  # 일관된 결과
+                    messages=messages,
+                )
             
             content = r.choices[0].message.content
             data = json.loads(content)
@@ -57,6 +61,8 @@ async def extract_facts(text: str):
             
         except Exception as e:
             last_error = e
+            if attempt == 2 or not retry_budget.try_retry("fact_extraction"):
+                break
             logger.warning(f"팩트 추출 재시도 {attempt+1}/3", error=str(e)[:100])
             await asyncio.sleep(2**attempt)  # 백오프
     
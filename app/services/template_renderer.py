@@ -0,0 +1,165 @@
+"""
+로컬 템플릿 기반 개인화 렌더러 (LLM 없이 ExtractedFacts만으로 직업별 기사 조립)
+LLM이 느리거나 장애일 때, 데드라인을 놓쳤을 때 오류 문구 대신 쓸 수 있는 결과를 수 ms 안에 만든다.
+"""
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from ..models.schemas import ExtractedFacts
+from ..core.logging import get_logger
+from .reading_budget import budget_for
+
+logger = get_logger("template_renderer")
+
+PROVIDER = "template"
+
+# 직업별 관점 템플릿 (앞 문단은 공통 5W1H, 관점 문단만 직업별로 다름)
+JOB_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "투자자": {
+        "angle": "투자자 입장에서는 이번 소식이 관련 종목과 섹터의 가격, 자금 흐름에 어떤 영향을 줄지가 관심사다.",
+        "numbers_lead": "시장이 주목할 수치는 다음과 같다.",
+        "checklist": [
+            "관련 종목·섹터의 단기 변동성 점검",
+            "발표 수치와 시장 기대치 비교",
+            "후속 발표 일정과 정책 방향 확인",
+        ],
+        "closing": "단기 재료인지 추세 변화의 신호인지는 후속 지표를 통해 확인할 필요가 있다.",
+    },
+    "사업가": {
+        "angle": "사업가 입장에서는 이번 소식이 시장 환경과 비용 구조, 새로운 사업 기회에 어떤 변화를 가져올지가 핵심이다.",
+        "numbers_lead": "사업 계획에 참고할 수치는 다음과 같다.",
+        "checklist": [
+            "원가·자금 조달 여건 변화 점검",
+            "고객 수요와 경쟁 환경 영향 검토",
+            "관련 규제·지원 제도 변동 확인",
+        ],
+        "closing": "변화가 본격화되기 전에 사업 계획과 리스크 대응 방안을 점검해 둘 만하다.",
+    },
+    "직장인": {
+        "angle": "직장인 입장에서는 이번 소식이 일자리와 업무 환경, 가계 살림에 미칠 영향이 관심사다.",
+        "numbers_lead": "생활과 업무에 참고할 수치는 다음과 같다.",
+        "checklist": [
+            "소속 업종·회사에 미칠 영향 확인",
+            "대출·저축 등 가계 재무 영향 점검",
+            "업무 방식·제도 변화 가능성 확인",
+        ],
+        "closing": "당장 체감되지 않더라도 업종과 가계에 미칠 파급 효과를 지켜볼 필요가 있다.",
+    },
+}
+
+DEFAULT_TEMPLATE = {
+    "angle": "이번 소식의 배경과 의미를 정리하면 다음과 같다.",
+    "numbers_lead": "주요 수치는 다음과 같다.",
+    "checklist": ["사건의 배경 확인", "주요 수치 확인", "후속 발표 확인"],
+    "closing": "추가 발표와 후속 보도를 통해 구체적인 영향을 확인할 필요가 있다.",
+}
+
+
+def _has_batchim(word: str) -> bool:
+    """마지막 글자 받침 여부 (한글이 아니면 받침 없음으로 취급)"""
+    if not word:
+        return False
+    code = ord(word[-1]) - 0xAC00
+    return 0 <= code <= 11171 and code % 28 != 0
+
+
+def _topic(word: str) -> str:
+    """은/는 조사 부착"""
+    return word + ("은" if _has_batchim(word) else "는")
+
+
+def _subject(word: str) -> str:
+    """이/가 조사 부착"""
+    return word + ("이" if _has_batchim(word) else "가")
+
+
+def _object(word: str) -> str:
+    """을/를 조사 부착"""
+    return word + ("을" if _has_batchim(word) else "를")
+
+
+def _is_sentence(text: str) -> bool:
+    return text.endswith((".", "다"))
+
+
+def _clean(value: Optional[str]) -> str:
+    value = (value or "").strip()
+    return "" if value in ("정보 없음", "None", "null") else value
+
+
+def _sentence(text: str) -> str:
+    text = text.strip()
+    return text if not text or text.endswith((".", "!", "?")) else text + "."
+
+
+def render_personalized(facts: ExtractedFacts, primary_job: str, original_title: str = None,
+                        reading_mode: str = "insight", reading_time: str = None) -> Dict[str, Any]:
+    """ExtractedFacts → 직업별 개인화 기사 (rewrite_for_user 결과와 같은 형태)
+
+    짧은 모드(brief/quick)는 인용/체크리스트 문단을 생략한다 (reading_budget.compact).
+    """
+    start = perf_counter()
+    budget = budget_for(reading_mode)
+    template = JOB_TEMPLATES.get(primary_job, DEFAULT_TEMPLATE)
+    title = original_title or facts.what or "뉴스"
+    who, what, when, where = ", ".join(facts.who[:3]), _clean(facts.what), _clean(facts.when), _clean(facts.where)
+    why, how = _clean(facts.why), _clean(facts.how)
+
+    # 1) 리드: 5W1H
+    lead_parts = []
+    if when or where:
+        lead_parts.append(" ".join(p for p in (when, where) if p) + ",")
+    what = what or title
+    if _is_sentence(what):
+        # 완결된 문장이면 이미 주어를 포함하므로 그대로 사용
+        lead = _sentence(" ".join(lead_parts + [what]))
+    else:
+        lead = _sentence(" ".join(lead_parts + [f"{what} 소식이 전해졌다"]))
+        if who:
+            lead += f" 관련 주체는 {who}{'이다' if _has_batchim(who) else '다'}."
+    paragraphs: List[str] = [lead]
+
+    context_parts = []
+    if why:
+        context_parts.append(why if _is_sentence(why) else f"이번 사안의 배경에는 {_subject(why)} 있다")
+    if how:
+        context_parts.append(how if _is_sentence(how) else f"{_object(how)} 통해 이뤄졌다")
+    context = " ".join(_sentence(p) for p in context_parts)
+    if context:
+        paragraphs.append(context)
+
+    # 2) 수치
+    numbers = list(facts.numbers.items())[:5]
+    if numbers:
+        paragraphs.append(template["numbers_lead"] + " " +
+                          ", ".join(f"{name} {value}" for name, value in numbers) + ".")
+
+    # 3) 인용
+    if not budget.compact:
+        for quote in facts.quotes[:2]:
+            speaker, content = quote.get("speaker", ""), quote.get("content", "")
+            if speaker and content:
+                paragraphs.append(f"{_topic(speaker)} \"{content}\"라고 말했다.")
+
+    # 4) 직업별 관점
+    paragraphs.append(template["angle"])
+    if not budget.compact:
+        paragraphs.append("점검할 부분은 " + ", ".join(template["checklist"]) + " 등이다.")
+    paragraphs.append(template["closing"])
+
+    content = "\n\n".join(paragraphs)
+    key_points = (facts.verified_facts[:2] + template["checklist"])[:3]
+
+    logger.debug("템플릿 개인화 렌더링", job=primary_job, ms=round((perf_counter() - start) * 1000, 3))
+    return {
+        "title": title,
+        "content": content,
+        "personalized_article": content,
+        "key_points": key_points,
+        "reading_time": reading_time or budget.reading_time,
+        "reading_mode": reading_mode,
+        "disclaimer": f"본 분석은 {primary_job} 관점에서의 참고용 정보입니다.",
+        "provider": PROVIDER,
+        "model": "local",
+        "is_fallback": True
+    }
@@ -0,0 +1,125 @@
+"""
+개인화 콘텐츠 2단계 캐시 (인프로세스 LRU + SQLite personalized_content)
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Any, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger("cache")
+
+
+class PersonalizationCache:
+    """개인화 콘텐츠 캐시
+
+    L1: (article_id, user_id, reading_mode) 키의 인프로세스 LRU (크기 + TTL 만료)
+    L2: personalized_content 테이블 (content_id = article/user/profile_hash 해시)
+
+    user_id/profile_hash 자리에는 호출 측 캐시 단위(개인화는 세그먼트 소유자/세그먼트 키)가 들어간다.
+    엔트리는 생성 당시의 profile_hash와 팩트 버전을 함께 보관하므로, 키가 바뀌거나
+    팩트가 재추출되면 get()에서는 미스가 된다.
+    이런 오래된 엔트리는 get_stale()로 꺼내 stale-while-revalidate 응답에 쓸 수 있다.
+    """
+
+    def __init__(self, database, max_entries: int = None, ttl_seconds: int = None):
+        self.db = database
+        self.max_entries = max_entries or settings.pc_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.pc_cache_ttl_seconds
+        # (article_id, user_id, reading_mode) -> (stored_at, profile_hash, facts_version, content)
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, str, Optional[str], Dict[str, Any]]]" = OrderedDict()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "invalidations": 0, "evictions": 0,
+                       "stale_hits": 0}
+
+    def get(self, content_id: str, article_id: str, user_id: str, profile_hash: str,
+            facts_version: Optional[str] = None, reading_mode: str = "insight") -> Optional[Dict[str, Any]]:
+        """캐시 조회 (L1 → L2 순서, L2 히트는 L1으로 승격)"""
+        key = (article_id, user_id, reading_mode)
+        entry = self._entries.get(key)
+        if entry:
+            stored_at, ph, fv, content = entry
+            if monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._stats["evictions"] += 1
+            elif ph != profile_hash or fv != facts_version:
+                # 프로필 변경/팩트 재추출 → 최신 아님 (stale 응답용으로 L1에는 남겨둠)
+                self._stats["invalidations"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats["l1_hits"] += 1
+                return dict(content)
+
+        try:
+            content = self.db.get_personalized_content(content_id)
+        except Exception as e:
+            logger.warning("L2 캐시 조회 실패", error=str(e), content_id=content_id)
+            content = None
+
+        if content and content.get("facts_version") == facts_version:
+            self._stats["l2_hits"] += 1
+            self._store(key, profile_hash, facts_version, content)
+            return dict(content)
+
+        self._stats["misses"] += 1
+        return None
+
+    def get_stale(self, article_id: str, user_id: str, reading_mode: str = "insight") -> Optional[Dict[str, Any]]:
+        """버전과 무관한 가장 최근 엔트리 (get() 미스 직후 stale-while-revalidate용)"""
+        entry = self._entries.get((article_id, user_id, reading_mode))
+        content = entry[3] if entry else None
+        if content is None:
+            try:
+                content = self.db.get_latest_personalized_content(article_id, user_id, reading_mode)
+            except Exception as e:
+                logger.warning("stale 캐시 조회 실패", error=str(e), article_id=article_id)
+                content = None
+        if content:
+            self._stats["stale_hits"] += 1
+            return dict(content)
+        return None
+
+    def put(self, content_id: str, article_id: str, user_id: str, profile_hash: str,
+            personalized: Dict[str, Any], facts_version: Optional[str] = None,
+            reading_mode: str = "insight") -> None:
+        """캐시 저장 (L1 + L2)"""
+        if not self.is_cacheable(personalized):
+            return
+
+        self._store((article_id, user_id, reading_mode), profile_hash, facts_version, personalized)
+        try:
+            self.db.save_personalized_content(content_id, article_id, user_id, profile_hash, personalized,
+                                              facts_version=facts_version, reading_mode=reading_mode)
+        except Exception as e:
+            logger.warning("L2 캐시 저장 실패", error=str(e), content_id=content_id)
+
+    @staticmethod
+    def is_cacheable(personalized: Dict[str, Any]) -> bool:
+        """폴백/스텁/템플릿(장애 시 대체) 결과, 데드라인으로 축소 생성한(degraded) 결과,
+        스트리밍 도중 끊긴(truncated) 결과는 캐시하지 않음"""
+        provider = personalized.get("provider")
+        if not provider or provider in ("stub", "template"):
+            return False
+        return not (personalized.get("degraded") or personalized.get("truncated"))
+
+    def _store(self, key: Tuple[str, str, str], profile_hash: str, facts_version: Optional[str],
+               content: Dict[str, Any]) -> None:
+        """L1 저장 (LRU 크기 초과 시 가장 오래된 엔트리 제거)"""
+        content = {k: v for k, v in content.items() if k not in ("cached", "stale", "pending")}
+        self._entries[key] = (monotonic(), profile_hash, facts_version, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        hits = self._stats["l1_hits"] + self._stats["l2_hits"]
+        total = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": round(hits / total, 3) if total else 0.0
+        }
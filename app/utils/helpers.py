@@ -7,11 +7,13 @@ import hashlib
 import asyncio
 import random
 from html import unescape
-from typing import List, Dict, Any
+from time import monotonic
+from typing import List, Dict, Any, Hashable, Callable, Awaitable
 from datetime import datetime
 from email.utils import formatdate
 from zoneinfo import ZoneInfo
 
+from ..core import deadline
 from ..core.config import settings
 from ..core.logging import get_logger
 
@@ -62,14 +64,20 @@ def should_retry_openai(e: Exception) -> bool:
 
 
 async def with_retry(coro_fn, retries: int = 3, base_delay: float = 0.5, timeout: float = None):
-    """지수 백오프와 함께 재시도"""
+    """지수 백오프와 함께 재시도 (요청 데드라인이 있으면 시도/대기를 그 안으로 제한)"""
     if timeout is None:
         timeout = settings.openai_timeout + 5
     
     last_exception = None
+    retry_budget.record_attempt()
+    retries = max(1, retries)  # 최소 1회는 시도 (0이면 last_exception 없이 raise None)
     for i in range(retries):
         try:
-            return await asyncio.wait_for(coro_fn(), timeout=timeout)
+            # 데드라인 확인을 코루틴 생성보다 먼저 (소진 시 await되지 않은 코루틴이 남지 않도록)
+            attempt_timeout = deadline.clamp_timeout(timeout)
+            return await asyncio.wait_for(coro_fn(), timeout=attempt_timeout)
+        except deadline.DeadlineExceeded:
+            raise
         except Exception as e:
             last_exception = e
             # 재시도 불가능한 에러거나 마지막 시도면 중단
@@ -79,6 +87,11 @@ async def with_retry(coro_fn, retries: int = 3, base_delay: float = 0.5, timeout
             # 지수 백오프 + 랜덤 지터
             jitter = random.uniform(0.5, 1.5)
             delay = base_delay * (2 ** i) * jitter
+            if not deadline.can_wait(delay):
+                logger.warning("데드라인 부족으로 재시도 중단", attempt=i+1, remaining=deadline.remaining())
+                break
+            if not retry_budget.try_retry("with_retry"):
+                break
             await asyncio.sleep(delay)
             
             logger.warning("재시도 중", attempt=i+1, delay=delay, error=str(e)[:100])
@@ -149,6 +162,14 @@ def generate_article_id(url: str, published: str = None) -> str:
     return hashlib.blake2s(id_source.encode(), digest_size=12).hexdigest()
 
 
+def content_digest(title: str, content: str) -> str:
+    """정규화된 제목+본문 다이제스트 (재발행/신디케이션 기사 동일성 판별용)"""
+    text = f"{title or ''}\n{content or ''}"
+    # HTML 제거, 공백/대소문자 정규화
+    text = clean_html_summary(text, limit=len(text)).lower()
+    return hashlib.blake2s(text.encode(), digest_size=16).hexdigest()
+
+
 def extract_numbers_from_text(text: str) -> Dict[str, str]:
     """텍스트에서 수치 정보 추출"""
     numbers = {}
@@ -170,32 +191,93 @@ def extract_numbers_from_text(text: str) -> Dict[str, str]:
     return numbers
 
 
-class RateLimiter:
-    """비동기 레이트 리미터"""
+class SingleFlight:
+    """동일 키의 동시 요청 병합 (첫 호출자만 실행, 나머지는 같은 결과를 대기)"""
     
-    def __init__(self, max_calls: int, time_window: int):
-        self.max_calls = max_calls
-        self.time_window = time_window
-        self.calls = []
-        self._lock = asyncio.Lock()
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
     
-    async def acquire(self):
-        """레이트 리미트 확인 및 획득"""
-        async with self._lock:
-            now = asyncio.get_event_loop().time()
-            
-            # 시간 윈도우 밖의 호출 제거
-            self.calls = [call_time for call_time in self.calls 
-                         if now - call_time < self.time_window]
-            
-            # 최대 호출 수 확인
-            if len(self.calls) >= self.max_calls:
-                # 대기 시간 계산
-                wait_time = self.time_window - (now - self.calls[0])
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire()  # 재귀 호출
-            
-            # 호출 시간 기록
-            self.calls.append(now)
-            return True
\ No newline at end of file
+    async def do(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """키별로 coro_fn을 한 번만 실행하고 결과(또는 예외)를 공유"""
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats["leaders"] += 1
+            # 태스크로 분리: 첫 호출자가 취소돼도 대기 중인 호출자는 결과를 받음
+            task = asyncio.ensure_future(coro_fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._done(k, t))
+        else:
+            self._stats["coalesced"] += 1
+        
+        return await asyncio.shield(task)
+    
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        """완료된 태스크 정리"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 대기자가 없어도 'never retrieved' 경고 방지
+    
+    def stats(self) -> Dict[str, int]:
+        """병합 통계"""
+        return {**self._stats, "inflight": len(self._inflight)}
+
+
+class RetryBudget:
+    """전역 재시도 예산 (토큰 버킷)
+    
+    첫 시도마다 ratio만큼 적립하고 재시도 1회당 1을 소모한다. 제공자 장애 시 계층별
+    재시도가 서로 곱해져 부하가 폭증하지 않도록 재시도를 첫 시도 트래픽의 일정 비율로 제한한다.
+    트래픽이 적을 때도 재시도가 가능하도록 초당 min_per_second만큼 기본 적립한다.
+    """
+    
+    def __init__(self, ratio: float = None, min_per_second: float = None, max_balance: float = None):
+        self.ratio = settings.retry_budget_ratio if ratio is None else ratio
+        self.min_per_second = settings.retry_budget_min_per_second if min_per_second is None else min_per_second
+        self.max_balance = settings.retry_budget_max_balance if max_balance is None else max_balance
+        self._balance = self.max_balance
+        self._updated = monotonic()
+        self._exhausted = False
+        self._stats = {"first_attempts": 0, "retries": 0, "denied": 0}
+    
+    def _refill(self) -> None:
+        now = monotonic()
+        self._balance = min(self.max_balance, self._balance + (now - self._updated) * self.min_per_second)
+        self._updated = now
+    
+    def record_attempt(self) -> None:
+        """첫 시도 기록 (예산 적립)"""
+        self._refill()
+        self._stats["first_attempts"] += 1
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+    
+    def try_retry(self, source: str = "") -> bool:
+        """재시도 1회 허용 여부 (허용 시 예산 차감)"""
+        self._refill()
+        if self._balance >= 1.0:
+            self._balance -= 1.0
+            self._stats["retries"] += 1
+            self._exhausted = False
+            return True
+        self._stats["denied"] += 1
+        if not self._exhausted:
+            self._exhausted = True
+            logger.warning("재시도 예산 소진, 재시도 생략", source=source, balance=round(self._balance, 2))
+        return False
+    
+    def stats(self) -> Dict[str, Any]:
+        """예산 통계"""
+        self._refill()
+        first = self._stats["first_attempts"]
+        return {
+            **self._stats,
+            "balance": round(self._balance, 2),
+            "exhausted": self._balance < 1.0,
+            "retry_ratio": round(self._stats["retries"] / first, 3) if first else 0.0,
+            "max_ratio": self.ratio
+        }
+
+
+# 전역 재시도 예산 (with_retry, Groq 재시도 루프, robust_fact_extraction 공유)
+retry_budget = RetryBudget()
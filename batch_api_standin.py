@@ -0,0 +1,206 @@
+"""
+Batch API 파이프라인 종단 검증 (로컬 대역 서버)
+OpenAI 호환 /v1/files, /v1/batches, /v1/chat/completions를 흉내 내는 대역 서버를 띄우고
+수집 기사 팩트 추출 배치 제출 → 폴링/반영 → 페르소나 배치 자동 제출 → 폴링/반영까지 실행한다.
+(API 키 불필요, 임시 디렉터리의 SQLite DB 사용)
+"""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import uuid
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 테스트 설정
+ARTICLE_COUNT = 4
+FAIL_ARTICLE_INDEX = 1  # 이 기사의 배치 결과는 오류로 응답 → 실시간 재추출 경로 검증
+TRUNCATED_ARTICLE_INDEX = 2  # 이 기사의 배치 결과는 잘린 JSON → 항목 단위 실패 후 실시간 재추출 검증
+LIVE_ARTICLE_INDEXES = (FAIL_ARTICLE_INDEX, TRUNCATED_ARTICLE_INDEX)
+# 워밍업 대상 세그먼트 선정용 사용자 (직업, 프로필 reading_mode)
+USERS = [("투자자", "standard"), ("투자자", "standard"), ("직장인", "deep")]
+
+_files = {}
+_batches = {}
+
+
+def fake_completion(body: dict) -> str:
+    """요청 프롬프트에 맞는 가짜 JSON 응답 (팩트 추출 / 다중 페르소나)"""
+    prompt = body["messages"][-1]["content"]
+    if "독자별 관점" in prompt:
+        personas = [line[2:].split(":", 1)[0] for line in prompt.splitlines() if line.startswith("- ") and ":" in line]
+        return json.dumps({"results": [{"persona": job, "content": f"{job} 관점으로 재작성한 기사"} for job in personas]},
+                          ensure_ascii=False)
+    title = prompt.split("기사 제목:", 1)[-1].split("\n", 1)[0].strip()
+    return json.dumps({
+        "who": ["한국은행"], "what": title, "when": "2025년 10월", "where": "서울",
+        "why": "내수 부진", "how": "금융통화위원회 의결", "numbers": {"기준금리": "3.00%"},
+        "quotes": [], "verified_facts": [title]
+    }, ensure_ascii=False)
+
+
+def completion_body(body: dict) -> dict:
+    return {
+        "id": "chatcmpl-" + uuid.uuid4().hex[:8], "object": "chat.completion", "created": 0, "model": body["model"],
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": fake_completion(body)}}]
+    }
+
+
+def run_batch(batch: dict) -> None:
+    """입력 JSONL 처리 → 결과 파일 생성 (FAIL_ARTICLE_INDEX 기사는 오류 응답, TRUNCATED_ARTICLE_INDEX 기사는 잘린 JSON)"""
+    lines = []
+    for line in _files[batch["input_file_id"]]["content"].decode().splitlines():
+        job = json.loads(line)
+        if job["custom_id"] == f"facts:standin_{FAIL_ARTICLE_INDEX}":
+            lines.append({"id": "req", "custom_id": job["custom_id"], "response": None,
+                          "error": {"code": "server_error", "message": "stand-in failure"}})
+        else:
+            body = completion_body(job["body"])
+            if job["custom_id"] == f"facts:standin_{TRUNCATED_ARTICLE_INDEX}":
+                message = body["choices"][0]["message"]
+                message["content"] = message["content"][:40]
+            lines.append({"id": "req", "custom_id": job["custom_id"], "error": None,
+                          "response": {"status_code": 200, "body": body}})
+    output_id = "file-" + uuid.uuid4().hex[:8]
+    _files[output_id] = {"content": "\n".join(json.dumps(l, ensure_ascii=False) for l in lines).encode(),
+                         "filename": "output.jsonl", "purpose": "batch_output"}
+    batch.update(status="completed", output_file_id=output_id,
+                 request_counts={"total": len(lines), "completed": len(lines), "failed": 0})
+
+
+def file_object(file_id: str) -> dict:
+    info = _files[file_id]
+    return {"id": file_id, "object": "file", "bytes": len(info["content"]), "created_at": 0,
+            "filename": info["filename"], "purpose": info["purpose"], "status": "processed"}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """OpenAI 호환 Batch API 대역"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, payload, status: int = 200, raw: bytes = None):
+        data = raw if raw is not None else json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream" if raw is not None else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/v1/files":
+            message = BytesParser(policy=policy.default).parsebytes(
+                b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body)
+            fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+            file_id = "file-" + uuid.uuid4().hex[:8]
+            _files[file_id] = {"content": fields["file"].get_payload(decode=True),
+                               "filename": fields["file"].get_filename(),
+                               "purpose": fields["purpose"].get_content().strip()}
+            return self._send(file_object(file_id))
+        if self.path == "/v1/batches":
+            request = json.loads(body)
+            batch_id = "batch_" + uuid.uuid4().hex[:8]
+            _batches[batch_id] = {"id": batch_id, "object": "batch", "endpoint": request["endpoint"],
+                                  "input_file_id": request["input_file_id"],
+                                  "completion_window": request["completion_window"], "created_at": 0,
+                                  "status": "validating", "output_file_id": None,
+                                  "metadata": request.get("metadata")}
+            return self._send(_batches[batch_id])
+        if self.path == "/v1/chat/completions":
+            return self._send(completion_body(json.loads(body)))
+        self._send({"error": {"message": "not found"}}, 404)
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts[:2] == ["v1", "batches"] and parts[2] in _batches:
+            batch = _batches[parts[2]]
+            if batch["status"] == "validating":
+                # 첫 조회는 진행 중, 다음 조회에서 완료
+                batch["status"] = "in_progress"
+            elif batch["status"] == "in_progress":
+                run_batch(batch)
+            return self._send(batch)
+        if parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[2] in _files:
+            return self._send(None, raw=_files[parts[2]]["content"])
+        self._send({"error": {"message": "not found"}}, 404)
+
+
+async def main(base_url: str):
+    from app.models.schemas import UserProfile
+    from app.services import llm_clients
+    from app.services.news_processor import NewsProcessor
+
+    processor = NewsProcessor(os.environ["OPENAI_API_KEY"])
+    pipeline = processor.batch_pipeline
+    # 운영과 같은 공유 클라이언트(응답 훅 포함)로 업로드/폴링해야 multipart 업로드 회귀를 잡을 수 있음
+    assert pipeline.client is llm_clients.get_openai_client()
+
+    articles = [
+        {"id": f"standin_{i}", "title": f"기준금리 인하 발표 {i}", "content": "한국은행이 기준금리를 인하했다. " * 10,
+         "source": "standin", "url": f"https://example.com/{i}", "published": "2025-10-01"}
+        for i in range(ARTICLE_COUNT)
+    ]
+    for article in articles:
+        processor.db.save_article(article)
+    for i, (job, reading_mode) in enumerate(USERS):
+        processor.db.save_user_profile(UserProfile(
+            user_id=f"standin_user_{i}", age=35, gender="other", location="Seoul", job_categories=[job],
+            interests_finance=[], interests_lifestyle=[], interests_hobby=[], interests_tech=[],
+            work_style="commute", family_status="single", living_situation="alone", reading_mode=reading_mode
+        ))
+
+    print(f"대역 서버: {base_url}")
+    batch_id = await pipeline.submit_facts(articles)
+    print(f"1) 팩트 배치 제출: {batch_id}")
+    # submit_facts는 제출 실패 시 실시간 추출로 조용히 폴백하므로 제출 여부를 직접 확인
+    assert batch_id, "팩트 배치 제출 실패 (실시간 추출로 폴백됨, 로그 확인)"
+    assert pipeline.stats()["live_fallbacks"] == 0
+    assert os.path.exists(processor.db.get_open_llm_batches()[0]["input_path"])
+
+    rounds = 0
+    while processor.db.get_open_llm_batches():
+        rounds += 1
+        done = await pipeline.poll()
+        print(f"2) 폴링 {rounds}회차: 반영 {done}건, 미완료 {len(processor.db.get_open_llm_batches())}건")
+        assert rounds < 10, "배치가 종료되지 않음"
+
+    for article in articles:
+        facts = await processor.db.get_facts(article["id"])
+        assert facts and facts.what == article["title"], article["id"]
+    print(f"3) extracted_facts 반영 확인: {ARTICLE_COUNT}건 (실시간 재추출 {pipeline.stats()['live_fallbacks']}건)")
+
+    live_ids = {f"standin_{i}" for i in LIVE_ARTICLE_INDEXES}
+    segments = processor.warmup_segments()
+    assert set(segments) == {("투자자", "insight"), ("직장인", "deep")}, segments
+    for article in articles:
+        for reading_mode, personas in processor.personas_by_mode(segments).items():
+            missing = processor.missing_personas(article["id"], personas, reading_mode)
+            assert not missing or article["id"] in live_ids, (article["id"], missing)
+    print(f"4) 세그먼트(직업/읽기 모드) 캐시 반영 확인: {segments}")
+
+    stats = pipeline.stats()
+    print(f"통계: {json.dumps(stats, ensure_ascii=False)}")
+    assert stats["submitted"] == 2 and stats["live_fallbacks"] == len(LIVE_ARTICLE_INDEXES)
+    assert stats["ingested"] == 2 and not processor.db.get_open_llm_batches()
+    print("Batch API 파이프라인 종단 검증 통과")
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    workdir = tempfile.mkdtemp(prefix="batch_standin_")
+    os.chdir(workdir)  # Database() 기본 경로(kkalkalnews.db)를 임시 디렉터리로
+    # 공유 OpenAI 클라이언트(배치/실시간 재추출 모두)가 대역 서버를 향하도록 설정
+    os.environ.update(OPENAI_BASE_URL=base_url, OPENAI_API_KEY="standin-key", AI_PROVIDER="openai",
+                      LLM_BATCH_ENABLED="true", LLM_BATCH_DIR=os.path.join(workdir, "batch_jobs"))
+    try:
+        asyncio.run(main(base_url))
+    finally:
+        server.shutdown()
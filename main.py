@@ -12,9 +12,11 @@ from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.models.database import Database
 from app.services.news_processor import NewsProcessor
+from app.services import llm_clients
+from app.services.circuit_breaker import breakers
 from app.api.dependencies import set_news_processor, set_database, set_mongo_database
 from app.api.routes import news, users, system, dashboard
-from app.middleware import RateLimitMiddleware, RequestLoggingMiddleware
+from app.middleware import RateLimitMiddleware, RequestLoggingMiddleware, DeadlineMiddleware
 # from app.utils.cache import cache_manager  # 캐시 완전 제거
 
 # 로깅 초기화
@@ -67,6 +69,12 @@ async def lifespan(app: FastAPI):
     processor = NewsProcessor(settings.openai_api_key)
     set_news_processor(processor)
     
+    # 폐기 모델 목록 복원 (재시작 후에도 폐기 모델 건너뜀)
+    breakers.attach(processor.db)
+    
+    # 공유 LLM 클라이언트 커넥션 예열
+    await llm_clients.startup()
+    
     # 서비스 시작 시 기존 락 정리 (분산락 사용하는 경우에만)
     try:
         if processor.use_distributed_lock and processor.distributed_lock:
@@ -85,6 +93,9 @@ async def lifespan(app: FastAPI):
     # 백그라운드 작업 시작
     cleanup_task = asyncio.create_task(periodic_cleanup())
     initial_collection_task = asyncio.create_task(initial_news_collection())
+    background_tasks = [cleanup_task, initial_collection_task]
+    if settings.llm_batch_enabled:
+        background_tasks.append(asyncio.create_task(periodic_batch_poll()))
     
     logger.info("서비스 준비 완료",
                features={
@@ -100,18 +111,21 @@ async def lifespan(app: FastAPI):
     logger.info("애플리케이션 종료 중...")
     
     # 백그라운드 작업 취소
-    cleanup_task.cancel()
-    initial_collection_task.cancel()
+    for task in background_tasks:
+        task.cancel()
     
     # 진행 중인 작업들 정리
     try:
         await asyncio.wait_for(
-            asyncio.gather(cleanup_task, initial_collection_task, return_exceptions=True),
+            asyncio.gather(*background_tasks, return_exceptions=True),
             timeout=5.0
         )
     except asyncio.TimeoutError:
         logger.warning("백그라운드 작업 정리 타임아웃")
     
+    # LLM 커넥션 풀 종료
+    await llm_clients.shutdown()
+    
     logger.info("애플리케이션 종료 완료")
 
 
@@ -125,6 +139,18 @@ async def initial_news_collection():
         logger.error("초기 뉴스 수집 실패", error=str(e))
 
 
+async def periodic_batch_poll():
+    """주기적 Batch API 결과 폴링/반영"""
+    while True:
+        try:
+            await asyncio.sleep(settings.llm_batch_poll_interval)
+            await processor.batch_pipeline.poll()
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error("Batch API 폴링 실패", error=str(e))
+
+
 async def periodic_cleanup():
     """주기적 데이터 정리"""
     while True:
@@ -161,7 +187,7 @@ if settings.cors_origins_list == ["*"]:
         allow_origins=["*"],
         allow_credentials=False,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "If-None-Match", "If-Modified-Since"],
+        allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "X-Request-Timeout", "If-None-Match", "If-Modified-Since"],
         expose_headers=["X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining", "ETag", "Last-Modified", "Cache-Control"]
     )
 else:
@@ -170,12 +196,13 @@ else:
         allow_origins=settings.cors_origins_list,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "If-None-Match", "If-Modified-Since"],
+        allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "X-Request-Timeout", "If-None-Match", "If-Modified-Since"],
         expose_headers=["X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining", "ETag", "Last-Modified", "Cache-Control"],
         max_age=3600
     )
 
 # 미들웨어 추가 (순서 중요)
+app.add_middleware(DeadlineMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(RateLimitMiddleware, 
                   capacity=60, 
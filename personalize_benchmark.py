@@ -0,0 +1,93 @@
+"""
+개인화 호출 방식 벤치마크
+레거시 2회 호출(스키마 호출 + run_personalize) vs 단일 호출의 p50/p95 비교
+(실제 API 키 필요: OPENAI_API_KEY, GROQ_API_KEY, GROQ_MODEL)
+"""
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.models.schemas import ExtractedFacts, UserProfile
+from app.services.ai_engine import AIEngine
+
+# 테스트 설정
+TEST_CYCLES = 10  # 모드별 반복 횟수
+ROLES = ["투자자", "사업가", "직장인"]
+
+SAMPLE_FACTS = ExtractedFacts(
+    who=["한국은행", "이창용 총재"],
+    what="한국은행이 기준금리를 0.25%포인트 인하했다",
+    when="2025년 10월",
+    where="서울",
+    why="내수 부진과 물가 안정세",
+    how="금융통화위원회 의결",
+    numbers={"기준금리": "3.00%", "인하폭": "0.25%p"},
+    quotes=[{"speaker": "이창용 총재", "content": "추가 인하 여부는 데이터에 달려 있다"}],
+    verified_facts=["기준금리 3.00%로 인하", "만장일치 결정"]
+)
+
+
+def make_profile(role: str, idx: int) -> UserProfile:
+    """벤치마크용 프로필"""
+    return UserProfile(
+        user_id=f"bench_{role}_{idx}",
+        age=35,
+        gender="other",
+        location="Seoul",
+        job_categories=[role],
+        interests_finance=["투자", "경제"],
+        interests_lifestyle=[],
+        interests_hobby=[],
+        interests_tech=[],
+        work_style="commute",
+        family_status="single",
+        living_situation="alone"
+    )
+
+
+async def run_mode(engine: AIEngine, single_call: bool) -> list:
+    """지정 모드로 TEST_CYCLES x ROLES 회 실행, 응답시간(ms) 목록 반환"""
+    settings.personalize_single_call = single_call
+    times = []
+    for cycle in range(TEST_CYCLES):
+        for role in ROLES:
+            start = time.perf_counter()
+            result = await engine.rewrite_for_user(SAMPLE_FACTS, make_profile(role, cycle), SAMPLE_FACTS.what)
+            elapsed = (time.perf_counter() - start) * 1000
+            times.append(elapsed)
+            print(f"  {'single' if single_call else 'legacy'} | {role} | {elapsed:.0f}ms | {result.get('provider', 'fallback')}")
+    return times
+
+
+def percentile(values: list, pct: float) -> float:
+    """단순 백분위수"""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def main():
+    print("🚀 개인화 호출 방식 벤치마크")
+    print(f"📊 모드별 {TEST_CYCLES}회 x {len(ROLES)}개 역할")
+    print("-" * 60)
+
+    engine = AIEngine(settings.openai_api_key)
+    results = {
+        "legacy (2 calls)": await run_mode(engine, single_call=False),
+        "single (1 call)": await run_mode(engine, single_call=True),
+    }
+
+    print()
+    print("=" * 60)
+    for name, times in results.items():
+        print(f"⚡ {name}: p50={statistics.median(times):.0f}ms  p95={percentile(times, 0.95):.0f}ms  "
+              f"avg={statistics.mean(times):.0f}ms")
+
+    legacy, single = results["legacy (2 calls)"], results["single (1 call)"]
+    for label, pct in (("p50", 0.5), ("p95", 0.95)):
+        before, after = percentile(legacy, pct), percentile(single, pct)
+        print(f"📉 {label} 감소: {before:.0f}ms → {after:.0f}ms ({(1 - after / before) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())